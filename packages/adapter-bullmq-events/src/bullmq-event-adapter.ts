@@ -60,6 +60,10 @@ export class BullMQEventAdapter implements EventAdapter {
     await this._queueManager.enqueueToAll(event, subscribers)
   }
 
+  async emitMany<TData>(events: Event<TData>[]): Promise<void> {
+    await this._queueManager.enqueueManyToAll(events, (topic) => this._workerManager.getSubscribers(topic))
+  }
+
   async subscribe<TData>(
     topic: string,
     stepName: string,
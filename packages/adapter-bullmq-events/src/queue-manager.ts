@@ -6,6 +6,8 @@ import { MILLISECONDS_PER_SECOND } from './constants'
 import { QueueCreationError } from './errors'
 import type { SubscriberInfo } from './worker-manager'
 
+type BulkJob = Parameters<Queue['addBulk']>[0][number]
+
 export class QueueManager {
   private readonly queues: Map<string, Queue> = new Map()
   private readonly connection: Redis
@@ -46,35 +48,68 @@ export class QueueManager {
     const promises = subscribers.map((subscriber) => {
       const queueName = this.getQueueName(subscriber.topic, subscriber.stepName)
       const queue = this.getQueue(queueName)
-      const jobId = event.messageGroupId ? `${queueName}.${event.messageGroupId}` : undefined
-
-      const jobData = {
-        topic: event.topic,
-        data: event.data,
-        traceId: event.traceId,
-        flows: event.flows,
-        messageGroupId: event.messageGroupId,
-      }
+      const { name, data, opts } = this.buildJob(queueName, event, subscriber)
+
+      return queue.add(name, data, opts).then(() => undefined)
+    })
 
-      const maxRetries = subscriber.queueConfig?.maxRetries
-      const attempts = maxRetries != null ? maxRetries + 1 : this.config.defaultJobOptions.attempts
-      const delay = subscriber.queueConfig?.delaySeconds
-        ? subscriber.queueConfig.delaySeconds * MILLISECONDS_PER_SECOND
-        : undefined
-
-      const jobOptions = {
-        jobId,
-        attempts,
-        backoff: this.config.defaultJobOptions.backoff,
-        delay,
+    await Promise.all(promises)
+  }
+
+  /**
+   * Adds the jobs of a batch of events with one addBulk call per queue
+   */
+  async enqueueManyToAll<TData>(
+    events: Event<TData>[],
+    getSubscribers: (topic: string) => SubscriberInfo[],
+  ): Promise<void> {
+    const jobsByQueue = new Map<string, BulkJob[]>()
+
+    for (const event of events) {
+      for (const subscriber of getSubscribers(event.topic)) {
+        const queueName = this.getQueueName(subscriber.topic, subscriber.stepName)
+        const jobs = jobsByQueue.get(queueName) ?? []
+
+        jobs.push(this.buildJob(queueName, event, subscriber))
+        jobsByQueue.set(queueName, jobs)
       }
+    }
 
-      return queue.add(event.topic, jobData, jobOptions).then(() => undefined)
+    const promises = Array.from(jobsByQueue.entries()).map(([queueName, jobs]) => {
+      const queue = this.getQueue(queueName)
+      return queue.addBulk(jobs).then(() => undefined)
     })
 
     await Promise.all(promises)
   }
 
+  private buildJob<TData>(queueName: string, event: Event<TData>, subscriber: SubscriberInfo): BulkJob {
+    const jobId = event.messageGroupId ? `${queueName}.${event.messageGroupId}` : undefined
+
+    const jobData = {
+      topic: event.topic,
+      data: event.data,
+      traceId: event.traceId,
+      flows: event.flows,
+      messageGroupId: event.messageGroupId,
+    }
+
+    const maxRetries = subscriber.queueConfig?.maxRetries
+    const attempts = maxRetries != null ? maxRetries + 1 : this.config.defaultJobOptions.attempts
+    const delay = subscriber.queueConfig?.delaySeconds
+      ? subscriber.queueConfig.delaySeconds * MILLISECONDS_PER_SECOND
+      : undefined
+
+    const jobOptions = {
+      jobId,
+      attempts,
+      backoff: this.config.defaultJobOptions.backoff,
+      delay,
+    }
+
+    return { name: event.topic, data: jobData, opts: jobOptions }
+  }
+
   async closeQueue(queueName: string): Promise<void> {
     const queue = this.queues.get(queueName)
     if (queue) {
@@ -101,9 +101,7 @@ export class RabbitMQEventAdapter implements EventAdapter {
     }, this.config.reconnectDelay)
   }
 
-  async emit<TData>(event: Event<TData>): Promise<void> {
-    const channel = await this.ensureConnection()
-
+  private publish<TData>(channel: Channel, event: Event<TData>): boolean {
     const message = {
       topic: event.topic,
       data: event.data,
@@ -115,17 +113,61 @@ export class RabbitMQEventAdapter implements EventAdapter {
 
     const content = Buffer.from(JSON.stringify(message))
 
-    const published = channel.publish(this.config.exchangeName, event.topic, content, {
+    return channel.publish(this.config.exchangeName, event.topic, content, {
       persistent: this.config.durable,
       contentType: 'application/json',
       timestamp: Date.now(),
     })
+  }
+
+  async emit<TData>(event: Event<TData>): Promise<void> {
+    const channel = await this.ensureConnection()
 
-    if (!published) {
+    if (!this.publish(channel, event)) {
       throw new Error(`Failed to publish message to RabbitMQ for topic: ${event.topic}`)
     }
   }
 
+  async emitMany<TData>(events: Event<TData>[]): Promise<void> {
+    const channel: Channel = await this.ensureConnection()
+
+    for (const event of events) {
+      // publish returns false once the write buffer of the channel is full, the message is still queued
+      if (!this.publish(channel, event)) {
+        await this.waitForDrain(channel)
+      }
+    }
+  }
+
+  /**
+   * Waits until the channel can take more messages, fails when it closes or errors before that
+   */
+  private waitForDrain(channel: Channel): Promise<void> {
+    return new Promise((resolve, reject) => {
+      const cleanup = () => {
+        channel.off('drain', onDrain)
+        channel.off('close', onClose)
+        channel.off('error', onError)
+      }
+      const onDrain = () => {
+        cleanup()
+        resolve()
+      }
+      const onClose = () => {
+        cleanup()
+        reject(new Error('RabbitMQ channel closed while waiting to publish'))
+      }
+      const onError = (error: Error) => {
+        cleanup()
+        reject(error)
+      }
+
+      channel.once('drain', onDrain)
+      channel.once('close', onClose)
+      channel.once('error', onError)
+    })
+  }
+
   async subscribe<TData>(
     topic: string,
     stepName: string,
@@ -135,10 +177,12 @@ export class RabbitMQEventAdapter implements EventAdapter {
     const channel = await this.ensureConnection()
     const queueName = `motia.${topic}.${stepName}`
 
+    // standard queues with a concurrency (batched steps) get as many unacknowledged messages at once
+    const concurrency = options?.type === 'standard' ? (options.concurrency ?? 0) : 0
     const subscribeOptions: RabbitMQSubscribeOptions = {
       durable: this.config.durable,
       exclusive: false,
-      prefetch: this.config.prefetch,
+      prefetch: this.config.prefetch ? Math.max(this.config.prefetch, concurrency) : this.config.prefetch,
     }
 
     const queueArgs: any = {}
@@ -0,0 +1,142 @@
+/**
+ * Benchmarks the throughput of the Python event steps of the playground flows, hosted by Node (one
+ * python-runner.py process per handler, state and emits over RPC) against the embedded Python host
+ * (motia_host.py, every handler in one process).
+ *
+ * Only the Python steps run: events emitted to TypeScript steps are dropped by both hosts. The default_python
+ * flow starts at python-notification because the order step calls the external pet store API.
+ *
+ * Usage: pnpm tsx benchmarks/python-host.bench.ts [events]
+ *   PYTHON=python3 pnpm tsx benchmarks/python-host.bench.ts 200
+ */
+import { spawn } from 'child_process'
+import fs from 'fs'
+import path from 'path'
+import { fileURLToPath } from 'url'
+import { InMemoryQueueEventAdapter } from '../src/adapters/defaults/event/in-memory-queue-event-adapter'
+import { MemoryStateAdapter } from '../src/adapters/defaults/state/memory-state-adapter'
+import { callStepFile } from '../src/call-step-file'
+import { getQueueConfigWithDefaults } from '../src/infrastructure-validator/defaults'
+import { getStepConfig } from '../src/get-step-config'
+import { Logger } from '../src/logger'
+import type { Motia } from '../src/motia'
+import { NoTracer } from '../src/observability/no-tracer'
+import { NoPrinter } from '../src/printer'
+import type { EventConfig, Step } from '../src/types'
+
+process.env.LOG_LEVEL = 'error'
+
+const __dirname = path.dirname(fileURLToPath(import.meta.url))
+const playgroundDir = path.join(__dirname, '..', '..', '..', 'playground')
+const hostScript = path.join(__dirname, '..', 'src', 'python', 'motia_host.py')
+const python = process.env.PYTHON ?? 'python'
+const events = Number(process.argv[2] ?? 100)
+
+const flows = [
+  { name: 'parallelMergeState', topic: 'pms.start', data: { message: 'hello' } },
+  {
+    name: 'default_python',
+    topic: 'python-notification',
+    data: { email: 'john@example.com', template_id: 'new-order', template_data: { status: 'placed' } },
+  },
+]
+
+const waitForIdle = async (eventAdapter: InMemoryQueueEventAdapter) => {
+  const isIdle = () =>
+    Object.values(eventAdapter.getAllMetrics()).every(
+      (metrics) => metrics.queueDepth === 0 && metrics.processingCount === 0,
+    )
+
+  while (!isIdle()) {
+    await new Promise((resolve) => setTimeout(resolve, 5))
+  }
+}
+
+const runNodeHost = async (flowDir: string, topic: string, data: unknown): Promise<number> => {
+  const eventAdapter = new InMemoryQueueEventAdapter()
+  const printer = new NoPrinter()
+  const motia = {
+    eventAdapter,
+    state: new MemoryStateAdapter(),
+    printer,
+    lockedData: { baseDir: playgroundDir, getStreams: () => ({}) },
+  } as unknown as Motia
+
+  const files = fs.readdirSync(flowDir).filter((file) => file.endsWith('_step.py'))
+
+  for (const filePath of files.map((file) => path.join(flowDir, file))) {
+    // steps with missing dependencies are skipped by the embedded host as well
+    const config = (await getStepConfig(filePath, playgroundDir).catch(() => null)) as EventConfig | null
+
+    if (config?.type !== 'event') {
+      continue
+    }
+
+    const step: Step<EventConfig> = { filePath, version: '', config }
+
+    for (const subscribe of config.subscribes) {
+      await eventAdapter.subscribe(
+        subscribe,
+        config.name,
+        async (event) => {
+          const logger = new Logger()
+          await callStepFile({ step, data: event.data, traceId: event.traceId, logger, tracer: new NoTracer() }, motia)
+        },
+        getQueueConfigWithDefaults(config.infrastructure),
+      )
+    }
+  }
+
+  const start = performance.now()
+
+  for (let i = 0; i < events; i++) {
+    const traceId = `trace-${i}`
+    await eventAdapter.emit({ topic, data, traceId, flows: [], logger: new Logger(), tracer: new NoTracer() })
+  }
+
+  await waitForIdle(eventAdapter)
+
+  return performance.now() - start
+}
+
+const runPythonHost = (topic: string, data: unknown): Promise<number> => {
+  return new Promise((resolve, reject) => {
+    const child = spawn(python, [hostScript, playgroundDir, '--stdin', '--quiet'])
+    let stderr = ''
+
+    child.stderr.on('data', (chunk) => {
+      stderr += chunk.toString()
+    })
+    child.on('error', reject)
+    child.on('close', (code) => {
+      const summary = stderr.trim().split('\n').pop() ?? ''
+
+      if (code !== 0) {
+        return reject(new Error(stderr))
+      }
+
+      resolve(JSON.parse(summary).elapsedMs)
+    })
+
+    child.stdin.end(Array.from({ length: events }, () => JSON.stringify({ topic, data })).join('\n'))
+  })
+}
+
+const results = []
+
+for (const flow of flows) {
+  const nodeTime = await runNodeHost(path.join(playgroundDir, 'src', flow.name), flow.topic, flow.data)
+  const pythonTime = await runPythonHost(flow.topic, flow.data)
+
+  results.push({
+    flow: flow.name,
+    events,
+    'Node host (ms)': nodeTime.toFixed(0),
+    'Node host (events/s)': ((events / nodeTime) * 1000).toFixed(0),
+    'Python host (ms)': pythonTime.toFixed(0),
+    'Python host (events/s)': ((events / pythonTime) * 1000).toFixed(0),
+  })
+}
+
+console.table(results)
+process.exit(0)
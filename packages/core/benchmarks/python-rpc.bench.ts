@@ -0,0 +1,74 @@
+/**
+ * Benchmarks the RPC round-trip of python-runner.py and the throughput of concurrent state operations,
+ * under the default asyncio loop and under uvloop (MOTIA_PYTHON_UVLOOP=true).
+ *
+ * The step awaits state.get sequentially to measure the round-trip, then runs state.set concurrently. uvloop has
+ * to be installed in the Python environment, otherwise the runner falls back to asyncio and the table says so.
+ *
+ * Usage: pnpm tsx benchmarks/python-rpc.bench.ts [iterations]
+ */
+import path from 'path'
+import { fileURLToPath } from 'url'
+import { MemoryStateAdapter } from '../src/adapters/defaults/state/memory-state-adapter'
+import { getLanguageBasedRunner } from '../src/language-runner'
+import { Logger } from '../src/logger'
+import { ProcessManager } from '../src/process-communication/process-manager'
+
+process.env.LOG_LEVEL = 'error'
+
+const __dirname = path.dirname(fileURLToPath(import.meta.url))
+const stepPath = path.join(__dirname, 'steps', 'rpc_bench_step.py')
+const iterations = Number(process.argv[2] ?? 20000)
+
+type BenchResult = { loop: string; roundTripUs: number; stateOpsPerSecond: number }
+type StateInput = { traceId: string; key: string; value: unknown }
+
+const runBenchmark = async (uvloop: boolean): Promise<BenchResult> => {
+  process.env.MOTIA_PYTHON_UVLOOP = String(uvloop)
+
+  const { runner, command, args } = getLanguageBasedRunner(stepPath)
+  const state = new MemoryStateAdapter()
+  const processManager = new ProcessManager({
+    command,
+    args: [...args, runner, stepPath, JSON.stringify({ data: { iterations }, traceId: 'bench', flows: [] })],
+    logger: new Logger(),
+    context: 'Benchmark',
+    projectRoot: __dirname,
+  })
+
+  await processManager.spawn()
+
+  return new Promise((resolve, reject) => {
+    let result: BenchResult
+
+    processManager.handler<StateInput, unknown>('state.get', async (input) => state.get(input.traceId, input.key))
+    processManager.handler<StateInput, unknown>('state.set', async (input) =>
+      state.set(input.traceId, input.key, input.value),
+    )
+    processManager.handler<BenchResult, void>('result', async (input) => {
+      result = input
+    })
+    processManager.handler<Error | undefined>('close', async (error) => {
+      processManager.kill()
+      processManager.close()
+      return error ? reject(error) : resolve(result)
+    })
+  })
+}
+
+const results = []
+
+for (const uvloop of [false, true]) {
+  const { loop, roundTripUs, stateOpsPerSecond } = await runBenchmark(uvloop)
+
+  results.push({
+    MOTIA_PYTHON_UVLOOP: uvloop,
+    loop,
+    iterations,
+    'RPC round-trip (µs)': roundTripUs.toFixed(1),
+    'state ops/s': stateOpsPerSecond.toFixed(0),
+  })
+}
+
+console.table(results)
+process.exit(0)
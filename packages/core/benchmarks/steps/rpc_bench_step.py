@@ -0,0 +1,30 @@
+import asyncio
+import time
+
+config = {
+    "type": "event",
+    "name": "RpcBench",
+    "subscribes": ["rpc-bench"],
+    "emits": [],
+    "flows": ["benchmarks"],
+}
+
+async def handler(input, context):
+    iterations = input["iterations"]
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await context.state.get(context.trace_id, "key")
+    round_trip = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await asyncio.gather(*(context.state.set(context.trace_id, f"key-{i}", {"value": i}) for i in range(iterations)))
+    concurrent = time.perf_counter() - start
+
+    loop = type(asyncio.get_running_loop())
+
+    return {
+        "loop": f"{loop.__module__}.{loop.__name__}",
+        "roundTripUs": round_trip / iterations * 1e6,
+        "stateOpsPerSecond": iterations / concurrent,
+    }
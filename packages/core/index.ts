@@ -15,7 +15,13 @@ export type {
   CronLockInfo,
 } from './src/adapters/interfaces/cron-adapter.interface'
 export type { EventAdapter, SubscriptionHandle } from './src/adapters/interfaces/event-adapter.interface'
-export type { Metric, ObservabilityAdapter, Tracer } from './src/adapters/interfaces/observability-adapter.interface'
+export type {
+  CpuOperationInput,
+  Metric,
+  ObservabilityAdapter,
+  SpanInput,
+  Tracer,
+} from './src/adapters/interfaces/observability-adapter.interface'
 export type {
   StateAdapter,
   StateFilter,
@@ -33,6 +39,7 @@ export {
 } from './src/analytics/utils'
 export { config, config as defineConfig } from './src/config'
 export { type CronManager, setupCronHandlers } from './src/cron-handler'
+export { type BatchFailures, EventBatcher, type EventBatchMetrics } from './src/event-batcher'
 export { getStepConfig, getStreamConfig, invalidate } from './src/get-step-config'
 export { isApiStep, isCronStep, isEventStep, isNoopStep } from './src/guards'
 export {
@@ -51,10 +58,43 @@ export {
   type UnregisterMotiaPluginApi,
 } from './src/motia'
 export { NoTracer } from './src/observability/no-tracer'
+export {
+  getRuntimeMetrics,
+  type MetricSeries,
+  type MetricSnapshot,
+  type PythonRunnerMetrics,
+  type RuntimeMetricName,
+  RuntimeMetrics,
+} from './src/observability/runtime-metrics'
 export { NoPrinter, Printer } from './src/printer'
+export {
+  type AdmissionMetrics,
+  getPythonAdmission,
+  PythonAdmission,
+} from './src/process-communication/python-admission'
+export {
+  getPythonWorkerPool,
+  type PythonWorkerMetrics,
+  PythonWorkerPool,
+  type WorkerRecycleReason,
+} from './src/process-communication/python-worker-pool'
+export {
+  getRpcRecordingDir,
+  readRpcRecording,
+  type RpcRecordedMessage,
+  RpcRecorder,
+  type RpcRecording,
+} from './src/process-communication/rpc-recording'
+export {
+  type RpcReplayDifference,
+  type RpcReplayOptions,
+  type RpcReplayReport,
+  replayRpcRecording,
+} from './src/process-communication/rpc-replay'
 export { QueueManager, type QueueMetrics } from './src/queue-manager'
 export { createServer, type MotiaServer } from './src/server'
 export { createStateAdapter } from './src/state/create-state-adapter'
+export { getStepCache, StepCache, type StepCacheMetrics } from './src/step-cache'
 export { createStepHandlers, type MotiaEventManager } from './src/step-handlers'
 export type { CronConfig } from './src/types'
 export * from './src/types'
@@ -0,0 +1,51 @@
+import { PassThrough } from 'stream'
+import { BinaryFrameReader, decodeBinary } from '../process-communication/binary-frames'
+
+const frame = (id: number, data: Buffer) => {
+  const header = Buffer.alloc(8)
+  header.writeUInt32BE(id, 0)
+  header.writeUInt32BE(data.length, 4)
+  return Buffer.concat([header, data])
+}
+
+describe('BinaryFrameReader', () => {
+  it('should decode the frames referenced by a message', async () => {
+    const stream = new PassThrough()
+    const reader = new BinaryFrameReader(stream)
+    const matrix = Buffer.from(new Float32Array([1, 2, 3, 4]).buffer)
+
+    stream.write(Buffer.concat([frame(0, Buffer.from('hello')), frame(1, matrix)]))
+
+    await expect(
+      reader.decode({
+        args: { body: { $binary: 0 }, matrix: { $binary: 1, dtype: '<f4', shape: [2, 2] } },
+        frames: [0, 1],
+      }),
+    ).resolves.toEqual(
+      expect.objectContaining({
+        args: { body: Buffer.from('hello'), matrix: { dtype: '<f4', shape: [2, 2], data: matrix } },
+      }),
+    )
+  })
+
+  it('should wait for frames split across chunks', async () => {
+    const stream = new PassThrough()
+    const reader = new BinaryFrameReader(stream)
+    const data = Buffer.alloc(1024, 7)
+    const bytes = frame(3, data)
+
+    const decoded = reader.decode({ args: [{ $binary: 3 }], frames: [3] })
+
+    stream.write(bytes.subarray(0, 5))
+    stream.write(bytes.subarray(5, 100))
+    stream.write(bytes.subarray(100))
+
+    await expect(decoded).resolves.toEqual(expect.objectContaining({ args: [data] }))
+  })
+
+  it('should decode base64 values embedded in the message', () => {
+    expect(decodeBinary({ data: { $binary: Buffer.from('abc').toString('base64') } })).toEqual({
+      data: Buffer.from('abc'),
+    })
+  })
+})
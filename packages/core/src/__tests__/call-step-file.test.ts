@@ -1,6 +1,8 @@
 import { jest } from '@jest/globals'
 import { randomUUID } from 'crypto'
 import express from 'express'
+import fs from 'fs'
+import os from 'os'
 import path from 'path'
 import { fileURLToPath } from 'url'
 import { MemoryStreamAdapterManager } from '../adapters/defaults'
@@ -12,8 +14,11 @@ import { Logger } from '../logger'
 import type { Motia } from '../motia'
 import { NoTracer } from '../observability/no-tracer'
 import { NoPrinter } from '../printer'
+import { readRpcRecording } from '../process-communication/rpc-recording'
+import { replayRpcRecording } from '../process-communication/rpc-replay'
+import { getStepCache } from '../step-cache'
 import type { InfrastructureConfig } from '../types'
-import { createCronStep, createEventStep } from './fixtures/step-fixtures'
+import { createApiStep, createCronStep, createEventStep } from './fixtures/step-fixtures'
 import { createMockRedisClient } from './test-helpers/redis-client'
 
 const __dirname = path.dirname(fileURLToPath(import.meta.url))
@@ -66,6 +71,213 @@ describe('callStepFile', () => {
     })
   })
 
+  it('should emit a batch of events from a python step', async () => {
+    const baseDir = path.join(__dirname, 'steps')
+    const step = createEventStep(
+      { subscribes: ['test'], emits: ['TEST_EVENT'] },
+      path.join(baseDir, 'emit-many-step.py'),
+    )
+    const traceId = randomUUID()
+    const tracer = new NoTracer()
+    const motia = createMockMotia(baseDir)
+
+    jest.spyOn(motia.eventAdapter, 'emit').mockImplementation(() => Promise.resolve())
+    jest.spyOn(tracer, 'emitOperation')
+
+    await callStepFile({ step, traceId, logger: new Logger(), tracer }, motia)
+
+    expect(motia.eventAdapter.emit).toHaveBeenCalledTimes(2)
+    expect(motia.eventAdapter.emit).toHaveBeenLastCalledWith(
+      expect.objectContaining({ topic: 'TEST_EVENT', data: { index: 2 }, traceId }),
+    )
+    expect(tracer.emitOperation).toHaveBeenCalledTimes(3)
+    expect(tracer.emitOperation).toHaveBeenCalledWith('NOT_ALLOWED', { index: 1 }, false)
+  })
+
+  it('should serve identical input of a cached step from the cache', async () => {
+    const baseDir = path.join(__dirname, 'steps')
+    const step = createEventStep(
+      { name: 'CachedEmitManyStep', subscribes: ['test'], emits: ['TEST_EVENT'], cache: { ttl: 60, key: 'id' } },
+      path.join(baseDir, 'emit-many-step.py'),
+    )
+    const motia = createMockMotia(baseDir)
+    const call = (data: unknown) =>
+      callStepFile({ step, data, traceId: randomUUID(), logger: new Logger(), tracer: new NoTracer() }, motia)
+
+    jest.spyOn(motia.eventAdapter, 'emit').mockImplementation(() => Promise.resolve())
+
+    // the second call waits for the result of the first one
+    await Promise.all([call({ id: 1 }), call({ id: 1, ignored: true })])
+    await call({ id: 1 })
+
+    expect(getStepCache().getMetrics().CachedEmitManyStep).toEqual({ hits: 1, misses: 1, shared: 1 })
+    expect(motia.eventAdapter.emit).toHaveBeenCalledTimes(6)
+    expect(motia.eventAdapter.emit).toHaveBeenLastCalledWith(
+      expect.objectContaining({ topic: 'TEST_EVENT', data: { index: 2 } }),
+    )
+  })
+
+  it('should replay the rpc recording of a python step', async () => {
+    const recordingDir = fs.mkdtempSync(path.join(os.tmpdir(), 'motia-recording-'))
+    const baseDir = path.join(__dirname, 'steps')
+    const step = createEventStep(
+      { name: 'StateStep', subscribes: ['test'], emits: ['TEST_EVENT'] },
+      path.join(baseDir, 'state-step.py'),
+    )
+    const traceId = randomUUID()
+    const motia = createMockMotia(baseDir)
+
+    jest.spyOn(motia.eventAdapter, 'emit').mockImplementation(() => Promise.resolve())
+    await motia.state.set(traceId, 'count', 1)
+
+    process.env.MOTIA_PYTHON_RECORD = recordingDir
+    try {
+      await callStepFile({ step, traceId, logger: new Logger(), tracer: new NoTracer(), data: { increment: 2 } }, motia)
+    } finally {
+      delete process.env.MOTIA_PYTHON_RECORD
+    }
+
+    const [file] = fs.readdirSync(recordingDir)
+    const recording = await readRpcRecording(path.join(recordingDir, file))
+
+    expect(recording).toEqual(expect.objectContaining({ step: 'StateStep', filePath: 'state-step.py', traceId }))
+
+    // the state changed since, the replay gets the recorded responses
+    await motia.state.set(traceId, 'count', 10)
+    const report = await replayRpcRecording(recording, { baseDir, logger: new Logger() })
+
+    expect(report.differences).toEqual([])
+    expect(report.timeline.map(({ method }) => method)).toEqual(['state.get', 'state.set', 'emit', 'close'])
+  })
+
+  it('should give python steps with typedInput an instance of their input model', async () => {
+    const baseDir = path.join(__dirname, 'steps')
+    const step = createEventStep({ subscribes: ['test'], emits: [] }, path.join(baseDir, 'typed-input-step.py'))
+    const traceId = randomUUID()
+    const logger = new Logger()
+    const tracer = new NoTracer()
+    const motia = createMockMotia(baseDir)
+
+    jest.spyOn(logger, 'log')
+
+    await callStepFile({ step, traceId, logger, tracer, data: { email: 'a@b.c', quantity: '2' } }, motia)
+
+    expect(logger.log).toHaveBeenCalledWith(
+      expect.objectContaining({ msg: 'typed input', email: 'a@b.c', quantity: 2, tags: null }),
+    )
+  })
+
+  it('should reject invalid input of python steps before the handler runs', async () => {
+    const baseDir = path.join(__dirname, 'steps')
+    const step = createEventStep({ subscribes: ['test'], emits: [] }, path.join(baseDir, 'typed-input-step.py'))
+    const traceId = randomUUID()
+    const logger = new Logger()
+    const tracer = new NoTracer()
+    const motia = createMockMotia(baseDir)
+
+    jest.spyOn(logger, 'log')
+
+    await expect(callStepFile({ step, traceId, logger, tracer, data: { quantity: 'many' } }, motia)).rejects.toEqual(
+      expect.objectContaining({
+        code: 'INVALID_INPUT',
+        errors: [
+          expect.objectContaining({ loc: ['email'], type: 'missing' }),
+          expect.objectContaining({ loc: ['quantity'], type: 'int_parsing' }),
+        ],
+      }),
+    )
+    expect(logger.log).not.toHaveBeenCalledWith(expect.objectContaining({ msg: 'typed input' }))
+  })
+
+  it('should trace the calls to the process pool of the python runner', async () => {
+    process.env.MOTIA_PYTHON_CPU_WORKERS = '1'
+
+    const baseDir = path.join(__dirname, 'steps')
+    const step = createEventStep({ subscribes: ['test'], emits: [] }, path.join(baseDir, 'cpu-step.py'))
+    const traceId = randomUUID()
+    const logger = new Logger()
+    const tracer = new NoTracer()
+    const motia = createMockMotia(baseDir)
+
+    jest.spyOn(logger, 'log')
+    jest.spyOn(tracer, 'cpuOperation')
+
+    await callStepFile({ step, traceId, logger, tracer, data: { values: [1, 2, 3] } }, motia)
+
+    expect(logger.log).toHaveBeenCalledWith(expect.objectContaining({ msg: 'computed', total: 6, squares: [1, 4, 9] }))
+    expect(tracer.cpuOperation).toHaveBeenCalledWith('run', expect.objectContaining({ function: 'sum', tasks: 1 }))
+    expect(tracer.cpuOperation).toHaveBeenCalledWith(
+      'map',
+      expect.objectContaining({ function: 'square', tasks: 3, chunksize: 2, duration: expect.any(Number) }),
+    )
+  }, 20000)
+
+  it('should record the spans of a python step', async () => {
+    const baseDir = path.join(__dirname, 'steps')
+    const step = createEventStep({ subscribes: ['test'], emits: [] }, path.join(baseDir, 'span-step.py'))
+    const tracer = new NoTracer()
+
+    jest.spyOn(tracer, 'spans')
+
+    await callStepFile(
+      { step, traceId: randomUUID(), logger: new Logger(), tracer, data: { values: [1, 2] } },
+      createMockMotia(baseDir),
+    )
+
+    expect(tracer.spans).toHaveBeenCalledTimes(1)
+    expect(tracer.spans).toHaveBeenCalledWith([
+      expect.objectContaining({ id: 3, parentId: 2, depth: 2, name: 'total' }),
+      expect.objectContaining({ id: 2, parentId: 1, depth: 1, name: 'parse' }),
+      expect.objectContaining({
+        id: 1,
+        depth: 0,
+        name: 'fetch-pets',
+        attributes: { limit: 2, count: 3 },
+        duration: expect.any(Number),
+      }),
+    ])
+  })
+
+  it('should give python handlers the resources of the setup hook of their module', async () => {
+    const baseDir = path.join(__dirname, 'steps')
+    const step = createEventStep({ subscribes: ['test'], emits: [] }, path.join(baseDir, 'resources-step.py'))
+    const logger = new Logger()
+
+    jest.spyOn(logger, 'log')
+
+    await callStepFile({ step, traceId: randomUUID(), logger, tracer: new NoTracer() }, createMockMotia(baseDir))
+
+    const messages = jest.mocked(logger.log).mock.calls.map(([entry]) => entry.msg)
+    expect(messages).toEqual(['setup', 'handled', 'teardown'])
+    expect(logger.log).toHaveBeenCalledWith(expect.objectContaining({ msg: 'teardown', calls: 1 }))
+  })
+
+  it('should stream the response of a python api step', async () => {
+    const baseDir = path.join(__dirname, 'steps')
+    const step = createApiStep(
+      { emits: [], path: '/stream', method: 'GET' },
+      path.join(baseDir, 'streaming-api-step.py'),
+    )
+    const chunks: Array<Buffer | string> = []
+    const response = {
+      start: jest.fn(),
+      write: jest.fn(async (chunk: Buffer | string) => {
+        chunks.push(chunk)
+      }),
+      end: jest.fn(),
+    }
+
+    const result = await callStepFile(
+      { step, traceId: randomUUID(), logger: new Logger(), tracer: new NoTracer(), response },
+      createMockMotia(baseDir),
+    )
+
+    expect(result).toBeUndefined()
+    expect(response.start).toHaveBeenCalledWith(200, { 'Content-Type': 'text/plain' })
+    expect(chunks).toEqual(['Hello', ' ', 'world', Buffer.from('!')])
+    expect(response.end).toHaveBeenCalledTimes(1)
+  })
+
   describe('Timeout Functionality', () => {
     it('should not timeout when no timeout is configured', async () => {
       const baseDir = path.join(__dirname, 'steps')
@@ -124,6 +336,34 @@ describe('callStepFile', () => {
       )
     }, 10000)
 
+    it('should let the python runner cancel the handler at the deadline', async () => {
+      const baseDir = path.join(__dirname, 'steps')
+      const step = createEventStep({ subscribes: ['test'], emits: [] }, path.join(baseDir, 'long-running-step.py'))
+      const traceId = randomUUID()
+      const logger = new Logger()
+      const tracer = new NoTracer()
+      const motia = createMockMotia(baseDir)
+
+      jest.spyOn(tracer, 'end')
+
+      const infrastructure: InfrastructureConfig = {
+        handler: {
+          timeout: 1,
+        },
+      }
+
+      await expect(callStepFile({ step, traceId, logger, tracer, infrastructure }, motia)).rejects.toThrow(
+        'Step execution timed out after 1 seconds',
+      )
+
+      expect(tracer.end).toHaveBeenCalledWith(
+        expect.objectContaining({
+          message: 'Step execution timed out after 1 seconds',
+          code: 'HANDLER_TIMEOUT',
+        }),
+      )
+    }, 10000)
+
     it('should clear timeout after successful execution', async () => {
       const baseDir = path.join(__dirname, 'steps')
       const step = createCronStep({ emits: [], cron: '* * * * *' }, path.join(baseDir, 'cron-step.ts'))
@@ -0,0 +1,85 @@
+import { jest } from '@jest/globals'
+import { EventBatcher } from '../event-batcher'
+import { QueueManager } from '../queue-manager'
+import type { Event, QueueConfig } from '../types'
+
+const wait = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms))
+
+describe('EventBatcher', () => {
+  const queueConfig: QueueConfig = { type: 'standard', maxRetries: 3, visibilityTimeout: 0, delaySeconds: 0 }
+
+  const createEvent = (data: unknown, messageGroupId?: string): Event => ({
+    topic: 'scores',
+    data,
+    traceId: 'test-trace-id',
+    messageGroupId,
+  })
+
+  it('should process a batch once it is full', async () => {
+    const processBatch = jest.fn(async (_: number[]) => undefined)
+    const batcher = new EventBatcher({ maxSize: 3, maxWaitMs: 60_000 }, processBatch)
+
+    await Promise.all([1, 2, 3].map((item) => batcher.add(item)))
+
+    expect(processBatch).toHaveBeenCalledWith([1, 2, 3])
+    expect(batcher.getMetrics()).toEqual({ batches: 1, items: 3, avgBatchSize: 3 })
+  })
+
+  it('should process a partial batch after the wait time', async () => {
+    const processBatch = jest.fn(async (_: number[]) => undefined)
+    const batcher = new EventBatcher({ maxSize: 10, maxWaitMs: 10 }, processBatch)
+
+    await Promise.all([batcher.add(1), batcher.add(2)])
+
+    expect(processBatch).toHaveBeenCalledTimes(1)
+    expect(processBatch).toHaveBeenCalledWith([1, 2])
+  })
+
+  it('should only retry the events of a batch that failed', async () => {
+    const queueManager = new QueueManager()
+    const batches: number[][] = []
+    const batcher = new EventBatcher<Event>({ maxSize: 3, maxWaitMs: 10 }, async (events) => {
+      batches.push(events.map((event) => event.data as number))
+      // the second event of the first batch fails
+      return batches.length === 1 ? { 1: new Error('failed') } : undefined
+    })
+
+    queueManager.subscribe('scores', (event) => batcher.add(event), queueConfig, 'step')
+
+    for (const value of [1, 2, 3]) {
+      await queueManager.enqueue('scores', createEvent(value))
+    }
+    await wait(100)
+
+    expect(batches).toEqual([[1, 2, 3], [2]])
+    expect(queueManager.getMetrics('scores')).toEqual(expect.objectContaining({ queueDepth: 0, retriesCount: 1 }))
+    queueManager.reset()
+  })
+
+  it('should not put two events of the same message group in a batch', async () => {
+    const queueManager = new QueueManager()
+    const batches: string[][] = []
+    const batcher = new EventBatcher<Event>({ maxSize: 4, maxWaitMs: 10 }, async (events) => {
+      batches.push(events.map((event) => event.data as string))
+      return undefined
+    })
+
+    queueManager.subscribe('scores', (event) => batcher.add(event), { ...queueConfig, type: 'fifo' }, 'step')
+
+    for (const [value, group] of [
+      ['a1', 'a'],
+      ['b1', 'b'],
+      ['a2', 'a'],
+      ['b2', 'b'],
+    ]) {
+      await queueManager.enqueue('scores', createEvent(value, group))
+    }
+    await wait(100)
+
+    expect(batches).toEqual([
+      ['a1', 'b1'],
+      ['a2', 'b2'],
+    ])
+    queueManager.reset()
+  })
+})
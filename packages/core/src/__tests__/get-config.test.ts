@@ -36,6 +36,19 @@ describe('Get Config', () => {
     expect(apiStep.method).toEqual('POST')
   })
 
+  it('should read a literal python config without importing the module', async () => {
+    const baseDir = __dirname
+    const config = await getStepConfig(path.join(baseDir, 'steps', 'constants-step.py'))
+
+    expect(config).toEqual({
+      type: 'event',
+      name: 'constants-step',
+      subscribes: ['orders'],
+      emits: ['orders.processed'],
+      flows: ['shop'],
+    })
+  })
+
   it('should get the config from a ruby file', async () => {
     const baseDir = __dirname
     const mockApiStep = await getStepConfig(path.join(baseDir, 'steps', 'api-step.rb'))
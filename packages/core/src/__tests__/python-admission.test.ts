@@ -0,0 +1,64 @@
+import { type AdmissionPermit, PythonAdmission } from '../process-communication/python-admission'
+
+const flush = () => new Promise((resolve) => setImmediate(resolve))
+
+describe('PythonAdmission', () => {
+  it('should queue the executions over the global limit', async () => {
+    const admission = new PythonAdmission({ limit: 2 })
+    const permits: AdmissionPermit[] = []
+
+    for (let i = 0; i < 3; i++) {
+      void admission.acquire('step').then((permit) => permits.push(permit))
+    }
+    await flush()
+
+    expect(permits).toHaveLength(2)
+    expect(admission.getMetrics().step).toEqual(expect.objectContaining({ running: 2, waiting: 1 }))
+
+    permits[0].release()
+    await flush()
+
+    expect(permits).toHaveLength(3)
+    expect(admission.getMetrics().step).toEqual(expect.objectContaining({ running: 2, waiting: 0, admitted: 3 }))
+  })
+
+  it('should apply the limit of a step', async () => {
+    const admission = new PythonAdmission({ limit: 10 })
+    const admitted: string[] = []
+
+    for (const step of ['capped', 'capped', 'other']) {
+      void admission.acquire(step, { limit: 1 }).then(() => admitted.push(step))
+    }
+    await flush()
+
+    expect(admitted).toEqual(['capped', 'other'])
+  })
+
+  it('should share the slots between the waiting steps by weight', async () => {
+    const admission = new PythonAdmission({ limit: 1 })
+    const admitted: string[] = []
+    const blocker = await admission.acquire('blocker')
+
+    const acquire = (step: string, weight?: number) =>
+      admission.acquire(step, { weight, topic: step }).then((permit) => {
+        admitted.push(step)
+        permit.release()
+      })
+
+    const executions = [
+      ...Array.from({ length: 8 }, () => acquire('hot')),
+      ...Array.from({ length: 4 }, () => acquire('cold')),
+      ...Array.from({ length: 8 }, () => acquire('heavy', 3)),
+    ]
+
+    blocker.release()
+    await Promise.all(executions)
+
+    // the first 8 slots after the backlog built up: 2 for hot and cold each, 4 for the step with a weight of 3
+    const firstSlots = admitted.slice(0, 8)
+    expect(firstSlots.filter((step) => step === 'hot')).toHaveLength(2)
+    expect(firstSlots.filter((step) => step === 'cold')).toHaveLength(2)
+    expect(firstSlots.filter((step) => step === 'heavy')).toHaveLength(4)
+    expect(admission.getTopicMetrics().cold).toEqual(expect.objectContaining({ admitted: 4, running: 0, waiting: 0 }))
+  })
+})
@@ -0,0 +1,51 @@
+import path from 'path'
+import { fileURLToPath } from 'url'
+import { type PythonWorker, PythonWorkerPool } from '../process-communication/python-worker-pool'
+
+const __dirname = path.dirname(fileURLToPath(import.meta.url))
+const baseDir = path.join(__dirname, 'steps')
+
+const invoke = (worker: PythonWorker): Promise<unknown> => {
+  return new Promise((resolve) => {
+    worker.processManager.handler('emit', async () => undefined)
+    worker.processManager.handler('result', async () => undefined)
+    worker.processManager.handler('close', async (err) => resolve(err))
+    worker.invoke(path.join(baseDir, 'api-step.py'), JSON.stringify({ data: {}, traceId: 'trace', flows: [] }))
+  })
+}
+
+describe('PythonWorkerPool', () => {
+  let pool: PythonWorkerPool
+
+  afterEach(() => pool.shutdown())
+
+  it('should reuse the worker across invocations', async () => {
+    pool = new PythonWorkerPool({ size: 1, maxInvocations: 10, maxRssMb: 4096, projectRoot: baseDir })
+
+    const worker = await pool.acquire()
+    await expect(invoke(worker)).resolves.toBeNull()
+    pool.release(worker)
+
+    await expect(pool.acquire()).resolves.toBe(worker)
+    expect(worker.status).toEqual(expect.objectContaining({ invocations: 1, leakedTasks: [] }))
+  }, 10000)
+
+  it('should replace the worker once it reached max invocations', async () => {
+    pool = new PythonWorkerPool({ size: 1, maxInvocations: 1, maxRssMb: 4096, projectRoot: baseDir })
+
+    const worker = await pool.acquire()
+    await invoke(worker)
+    pool.release(worker)
+
+    const replacement = await pool.acquire()
+
+    expect(replacement).not.toBe(worker)
+    expect(pool.getMetrics()).toEqual(
+      expect.objectContaining({
+        workers: 1,
+        invocations: 1,
+        recycled: { max_invocations: 1, max_rss: 0, timeout: 0, exited: 0 },
+      }),
+    )
+  }, 10000)
+})
@@ -0,0 +1,28 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'python'))
+
+from motia_cpu_pool import CpuPool  # noqa: E402
+
+def square(value: int) -> int:
+    return value * value
+
+class CpuPoolTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.pool = CpuPool(size=2)
+
+    async def asyncTearDown(self) -> None:
+        self.pool.shutdown()
+
+    async def test_maps_items_in_chunks_keeping_their_order(self) -> None:
+        self.assertEqual(await self.pool.map(square, range(7), chunksize=3), [0, 1, 4, 9, 16, 25, 36])
+
+    async def test_rejects_chunk_sizes_below_one(self) -> None:
+        for chunksize in (0, -1):
+            with self.assertRaises(ValueError):
+                await self.pool.map(square, [1, 2], chunksize=chunksize)
+
+if __name__ == '__main__':
+    unittest.main()
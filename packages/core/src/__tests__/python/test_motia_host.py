@@ -0,0 +1,235 @@
+import asyncio
+import os
+import sys
+import time
+import unittest
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'python'))
+
+from motia_host import HostStep, PythonHost  # noqa: E402
+from motia_memory_state import MemoryStateStore  # noqa: E402
+from motia_queue_engine import QueueEngine, get_queue_config_with_defaults  # noqa: E402
+
+def queue_config(**overrides: Any) -> Dict[str, Any]:
+    return get_queue_config_with_defaults({'queue': overrides})
+
+class QueueEngineTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.logs: List[Dict[str, Any]] = []
+        self.engine = QueueEngine(log=lambda level, msg, args: self.logs.append({'level': level, 'msg': msg, **args}))
+
+    async def drain(self) -> None:
+        await asyncio.wait_for(self.engine.drain(), timeout=5)
+
+    async def test_handles_the_messages_of_a_group_in_order_one_at_a_time(self) -> None:
+        handled: List[str] = []
+        running: Dict[str, int] = {}
+        overlaps: List[str] = []
+
+        async def handler(event: Dict[str, Any]) -> None:
+            group = event['group']
+            running[group] = running.get(group, 0) + 1
+            if running[group] > 1:
+                overlaps.append(group)
+            # later messages finish first when the group is not respected
+            await asyncio.sleep(0.01 * (4 - event['index']))
+            handled.append(f"{group}{event['index']}")
+            running[group] -= 1
+
+        self.engine.subscribe('orders', handler, queue_config(type='fifo'), 'step')
+
+        for index in range(1, 4):
+            for group in ('a', 'b'):
+                await self.engine.enqueue('orders', {'group': group, 'index': index}, group)
+
+        await self.drain()
+
+        self.assertEqual([item for item in handled if item[0] == 'a'], ['a1', 'a2', 'a3'])
+        self.assertEqual([item for item in handled if item[0] == 'b'], ['b1', 'b2', 'b3'])
+        self.assertEqual(overlaps, [])
+
+    async def test_handles_standard_messages_concurrently(self) -> None:
+        running = 0
+        max_running = 0
+
+        async def handler(event: Dict[str, Any]) -> None:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        self.engine.subscribe('orders', handler, queue_config(), 'step')
+
+        for group in ('a', 'a', 'a'):
+            await self.engine.enqueue('orders', {}, group)
+
+        await self.drain()
+
+        self.assertEqual(max_running, 3)
+
+    async def test_retries_failed_messages(self) -> None:
+        attempts = 0
+
+        async def handler(event: Dict[str, Any]) -> None:
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise ValueError('temporary failure')
+
+        self.engine.subscribe('orders', handler, queue_config(maxRetries=3, visibilityTimeout=0), 'step')
+        await self.engine.enqueue('orders', {})
+        await self.drain()
+
+        self.assertEqual(attempts, 2)
+        self.assertEqual(self.engine.get_metrics('orders')['retriesCount'], 1)
+        self.assertEqual(self.engine.get_metrics('orders')['dlqCount'], 0)
+
+    async def test_moves_messages_to_the_dead_letter_queue_after_max_retries(self) -> None:
+        attempts = 0
+
+        async def handler(event: Dict[str, Any]) -> None:
+            nonlocal attempts
+            attempts += 1
+            raise ValueError('permanent failure')
+
+        self.engine.subscribe('orders', handler, queue_config(maxRetries=2, visibilityTimeout=0), 'step')
+        await self.engine.enqueue('orders', {})
+        await self.drain()
+
+        metrics = self.engine.get_metrics('orders')
+        self.assertEqual(attempts, 2)
+        self.assertEqual(metrics['retriesCount'], 1)
+        self.assertEqual(metrics['dlqCount'], 1)
+        self.assertEqual(metrics['queueDepth'], 0)
+        self.assertEqual(len(self.logs), 1)
+        self.assertEqual(self.logs[0]['originalError'], 'permanent failure')
+        self.assertEqual(self.logs[0]['attempts'], 2)
+
+    async def test_releases_the_group_of_a_message_moved_to_the_dead_letter_queue(self) -> None:
+        handled: List[int] = []
+
+        async def handler(event: Dict[str, Any]) -> None:
+            if event['index'] == 1:
+                raise ValueError('permanent failure')
+            handled.append(event['index'])
+
+        self.engine.subscribe('orders', handler, queue_config(type='fifo', maxRetries=1, visibilityTimeout=0), 'step')
+        await self.engine.enqueue('orders', {'index': 1}, 'a')
+        await self.engine.enqueue('orders', {'index': 2}, 'a')
+        await self.drain()
+
+        self.assertEqual(handled, [2])
+        self.assertEqual(self.engine.get_metrics('orders')['dlqCount'], 1)
+
+    async def test_delays_messages(self) -> None:
+        handled_at: List[float] = []
+
+        async def handler(event: Dict[str, Any]) -> None:
+            handled_at.append(time.perf_counter())
+
+        self.engine.subscribe('orders', handler, queue_config(delaySeconds=0.1), 'step')
+        started_at = time.perf_counter()
+        await self.engine.enqueue('orders', {})
+
+        await asyncio.sleep(0.05)
+        self.assertEqual(handled_at, [])
+
+        await self.drain()
+        self.assertEqual(len(handled_at), 1)
+        self.assertGreaterEqual(handled_at[0] - started_at, 0.09)
+
+    async def test_gives_each_subscription_its_own_copy(self) -> None:
+        handled: List[str] = []
+
+        async def first(event: Dict[str, Any]) -> None:
+            handled.append('first')
+
+        async def second(event: Dict[str, Any]) -> None:
+            handled.append('second')
+
+        self.engine.subscribe('orders', first, queue_config(), 'first')
+        self.engine.subscribe('orders', second, queue_config(), 'second')
+        await self.engine.enqueue('orders', {})
+        await self.drain()
+
+        self.assertEqual(sorted(handled), ['first', 'second'])
+
+class MemoryStateStoreTest(unittest.IsolatedAsyncioTestCase):
+    async def test_gets_sets_and_clears_values(self) -> None:
+        state = MemoryStateStore()
+
+        await state.set({'traceId': 'trace', 'key': 'order', 'value': {'id': 1}})
+        await state.set({'traceId': 'trace', 'key': 'user', 'value': 'john'})
+        await state.set({'traceId': 'other', 'key': 'order', 'value': {'id': 2}})
+
+        self.assertEqual(await state.get({'traceId': 'trace', 'key': 'order'}), {'id': 1})
+        self.assertEqual(await state.get_group({'groupId': 'trace'}), [{'id': 1}, 'john'])
+        self.assertEqual(await state.delete({'traceId': 'trace', 'key': 'user'}), 'john')
+        self.assertIsNone(await state.get({'traceId': 'trace', 'key': 'user'}))
+
+        await state.clear({'traceId': 'trace'})
+
+        self.assertIsNone(await state.get({'traceId': 'trace', 'key': 'order'}))
+        self.assertEqual(await state.get({'traceId': 'other', 'key': 'order'}), {'id': 2})
+
+    async def test_returns_copies_of_the_values(self) -> None:
+        state = MemoryStateStore()
+        value = {'items': [1]}
+
+        await state.set({'traceId': 'trace', 'key': 'order', 'value': value})
+        value['items'].append(2)
+        stored = await state.get({'traceId': 'trace', 'key': 'order'})
+        stored['items'].append(3)
+
+        self.assertEqual(await state.get({'traceId': 'trace', 'key': 'order'}), {'items': [1]})
+
+class PythonHostTest(unittest.IsolatedAsyncioTestCase):
+    def add_step(self, host: PythonHost, config: Dict[str, Any], handler: Any) -> None:
+        module = SimpleNamespace(config={'type': 'event', 'flows': ['flow'], **config}, handler=handler)
+        host.add_step(HostStep(host.project_dir / 'steps' / f"{config['name']}_step.py", module))
+
+    async def test_runs_event_flows_with_state_and_emits(self) -> None:
+        host = PythonHost(os.path.dirname(__file__), log=lambda entry: None)
+        received: List[Any] = []
+
+        async def start(data: Dict[str, Any], context: Any) -> None:
+            await context.state.set(context.trace_id, 'order', {'id': data['id']})
+            await context.emit({'topic': 'order.saved', 'data': {'id': data['id']}})
+
+        async def saved(data: Dict[str, Any], context: Any) -> None:
+            received.append((data, await context.state.get(context.trace_id, 'order')))
+            await context.state.clear(context.trace_id)
+
+        self.add_step(host, {'name': 'start', 'subscribes': ['order.created'], 'emits': ['order.saved']}, start)
+        self.add_step(host, {'name': 'saved', 'subscribes': ['order.saved'], 'emits': []}, saved)
+
+        trace_id = await host.emit({'topic': 'order.created', 'data': {'id': 1}})
+        await asyncio.wait_for(host.run_until_idle(), timeout=5)
+
+        # RpcStateManager wraps dict values like it does with the Node host
+        self.assertEqual(received, [({'id': 1}, {'data': {'id': 1}})])
+        self.assertIsNone(await host.state.get({'traceId': trace_id, 'key': 'order'}))
+
+    async def test_drops_emits_to_topics_the_step_does_not_declare(self) -> None:
+        host = PythonHost(os.path.dirname(__file__), log=lambda entry: None)
+        received: List[Any] = []
+
+        async def start(data: Dict[str, Any], context: Any) -> None:
+            await context.emit({'topic': 'order.saved', 'data': data})
+
+        async def saved(data: Dict[str, Any], context: Any) -> None:
+            received.append(data)
+
+        self.add_step(host, {'name': 'start', 'subscribes': ['order.created'], 'emits': ['order.other']}, start)
+        self.add_step(host, {'name': 'saved', 'subscribes': ['order.saved'], 'emits': []}, saved)
+
+        await host.emit({'topic': 'order.created', 'data': {'id': 1}})
+        await asyncio.wait_for(host.run_until_idle(), timeout=5)
+
+        self.assertEqual(received, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import { RuntimeMetrics } from '../observability/runtime-metrics'
+
+describe('RuntimeMetrics', () => {
+  it('should write histograms in the Prometheus text format', () => {
+    const metrics = new RuntimeMetrics()
+
+    metrics.observe('motia_rpc_duration_seconds', { method: 'state.get' }, 0.002)
+    metrics.observe('motia_rpc_duration_seconds', { method: 'state.get' }, 2)
+
+    const output = metrics.toPrometheus()
+
+    expect(output).toContain('# TYPE motia_rpc_duration_seconds histogram')
+    expect(output).toContain('motia_rpc_duration_seconds_bucket{method="state.get",le="0.001"} 0')
+    expect(output).toContain('motia_rpc_duration_seconds_bucket{method="state.get",le="0.0025"} 1')
+    expect(output).toContain('motia_rpc_duration_seconds_bucket{method="state.get",le="1"} 1')
+    expect(output).toContain('motia_rpc_duration_seconds_bucket{method="state.get",le="+Inf"} 2')
+    expect(output).toContain('motia_rpc_duration_seconds_sum{method="state.get"} 2.002')
+    expect(output).toContain('motia_rpc_duration_seconds_count{method="state.get"} 2')
+  })
+
+  it('should count the label sets over the limit under a single series', () => {
+    const metrics = new RuntimeMetrics(2)
+
+    for (const step of ['a', 'b', 'c', 'd']) {
+      metrics.observe('motia_python_import_seconds', { step }, 0.1)
+    }
+
+    const [snapshot] = metrics.snapshot().filter(({ name }) => name === 'motia_python_import_seconds')
+
+    expect(snapshot.series.map(({ labels, count }) => [labels.step, count])).toEqual([
+      ['a', 1],
+      ['b', 1],
+      ['__other__', 2],
+    ])
+  })
+
+  it('should refresh the metrics of the collectors when read', () => {
+    const metrics = new RuntimeMetrics()
+    let busy = 1
+
+    metrics.collect('workers', (registry) => registry.set('motia_python_workers', { state: 'busy' }, busy))
+    expect(metrics.toPrometheus()).toContain('motia_python_workers{state="busy"} 1')
+
+    busy = 3
+    expect(metrics.toPrometheus()).toContain('motia_python_workers{state="busy"} 3')
+
+    metrics.collect('workers')
+    busy = 5
+    expect(metrics.toPrometheus()).toContain('motia_python_workers{state="busy"} 3')
+  })
+})
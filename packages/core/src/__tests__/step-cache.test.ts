@@ -0,0 +1,33 @@
+import { MemoryStateAdapter } from '../adapters/defaults/state/memory-state-adapter'
+import { getStepCacheGroup, StepCache } from '../step-cache'
+
+describe('StepCache', () => {
+  afterEach(() => jest.restoreAllMocks())
+
+  it('should delete the expired entries of the step when writing', async () => {
+    const state = new MemoryStateAdapter()
+    const cache = new StepCache()
+    const now = jest.spyOn(Date, 'now').mockReturnValue(1_000)
+
+    await cache.run(state, 'step', { ttl: 1 }, { id: 1 }, async () => 'first')
+    await cache.run(state, 'step', { ttl: 60 }, { id: 2 }, async () => 'second')
+
+    now.mockReturnValue(5_000)
+    await cache.run(state, 'step', { ttl: 60 }, { id: 3 }, async () => 'third')
+
+    const entries = await state.getGroup<{ result: string }>(getStepCacheGroup('step'))
+    expect(entries.map(({ result }) => result).sort()).toEqual(['second', 'third'])
+  })
+
+  it('should evict the entries closest to expiring over maxEntries', async () => {
+    const state = new MemoryStateAdapter()
+    const cache = new StepCache()
+
+    for (const id of [1, 2, 3]) {
+      await cache.run(state, 'step', { ttl: 60 + id, maxEntries: 2 }, { id }, async () => id)
+    }
+
+    const entries = await state.getGroup<{ result: number }>(getStepCacheGroup('step'))
+    expect(entries.map(({ result }) => result).sort()).toEqual([2, 3])
+  })
+})
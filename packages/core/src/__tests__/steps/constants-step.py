@@ -0,0 +1,17 @@
+# not installed, the config is read without importing the module
+import motia_missing_dependency
+
+TOPIC = "orders"
+FLOWS = ["shop"]
+
+config = {
+    "type": "event",
+    "name": "constants-step",
+    "subscribes": [TOPIC],
+    "emits": [f"{TOPIC}.processed"],
+    "flows": FLOWS,
+}
+
+
+async def handler(input, context):
+    await context.emit({"topic": f"{TOPIC}.processed", "data": motia_missing_dependency.process(input)})
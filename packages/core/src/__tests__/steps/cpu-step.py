@@ -0,0 +1,17 @@
+config = {
+    "type": "event",
+    "name": "CpuStep",
+    "subscribes": ["test"],
+    "emits": [],
+    "flows": ["test"],
+}
+
+
+def square(value):
+    return value * value
+
+
+async def handler(input, context):
+    total = await context.run_cpu(sum, input["values"])
+    squares = await context.map_cpu(square, input["values"], chunksize=2)
+    context.logger.info("computed", {"total": total, "squares": squares})
@@ -0,0 +1,15 @@
+config = {
+    "type": "event",
+    "name": "EmitManyStep",
+    "subscribes": ["test"],
+    "emits": ["TEST_EVENT"],
+    "flows": ["test"],
+}
+
+
+async def handler(_, context):
+    await context.emit_many([
+        {"topic": "TEST_EVENT", "data": {"index": 0}},
+        {"topic": "NOT_ALLOWED", "data": {"index": 1}},
+        {"topic": "TEST_EVENT", "data": {"index": 2}},
+    ])
@@ -0,0 +1,16 @@
+import asyncio
+
+config = {
+    "type": "event",
+    "name": "LongRunningPythonStep",
+    "subscribes": ["test"],
+    "emits": [],
+    "flows": ["test"],
+}
+
+
+async def handler(_, context):
+    try:
+        await asyncio.sleep(5)
+    finally:
+        context.logger.info("cleaned up")
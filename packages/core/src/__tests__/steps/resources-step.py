@@ -0,0 +1,28 @@
+config = {
+    "type": "event",
+    "name": "ResourcesStep",
+    "subscribes": ["test"],
+    "emits": [],
+    "flows": ["test"],
+}
+
+
+class Client:
+    def __init__(self):
+        self.calls = 0
+        self.closed = False
+
+
+async def setup(ctx):
+    ctx.logger.info("setup", {"step": ctx.step})
+    return {"client": Client()}
+
+
+async def teardown(ctx):
+    ctx.resources.client.closed = True
+    ctx.logger.info("teardown", {"calls": ctx.resources.client.calls})
+
+
+async def handler(_, context):
+    context.resources.client.calls += 1
+    context.logger.info("handled", {"calls": context.resources.client.calls})
@@ -0,0 +1,20 @@
+from motia_tracing import traced
+
+config = {
+    "type": "event",
+    "name": "SpanStep",
+    "subscribes": ["test"],
+    "emits": [],
+    "flows": ["test"],
+}
+
+
+@traced
+def total(values):
+    return sum(values)
+
+
+async def handler(input, context):
+    with context.tracer.span("fetch-pets", {"limit": 2}) as span:
+        with context.tracer.span("parse"):
+            span.set_attribute("count", total(input["values"]))
@@ -0,0 +1,13 @@
+config = {
+    "type": "event",
+    "name": "StateStep",
+    "subscribes": ["test"],
+    "emits": ["TEST_EVENT"],
+    "flows": ["test"],
+}
+
+
+async def handler(input, context):
+    count = await context.state.get(context.trace_id, "count") or 0
+    await context.state.set(context.trace_id, "count", count + input["increment"])
+    await context.emit({"topic": "TEST_EVENT", "data": {"count": count + input["increment"]}})
@@ -0,0 +1,21 @@
+config = {
+    "type": "api",
+    "name": "streaming-api-step",
+    "emits": [],
+    "path": "/stream",
+    "method": "GET",
+}
+
+
+async def tokens():
+    for token in ["Hello", " ", "world"]:
+        yield token
+    yield b"!"
+
+
+async def handler(_, context):
+    return {
+        "status": 200,
+        "headers": {"Content-Type": "text/plain"},
+        "body": tokens(),
+    }
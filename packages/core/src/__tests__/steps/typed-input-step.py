@@ -0,0 +1,21 @@
+config = {
+    "type": "event",
+    "name": "TypedInputStep",
+    "subscribes": ["test"],
+    "emits": [],
+    "flows": ["test"],
+    "input": {
+        "type": "object",
+        "properties": {
+            "email": {"type": "string"},
+            "quantity": {"type": "integer"},
+            "tags": {"type": "array", "items": {"type": "string"}},
+        },
+        "required": ["email", "quantity"],
+    },
+    "typedInput": True,
+}
+
+
+async def handler(input, context):
+    context.logger.info("typed input", {"email": input.email, "quantity": input.quantity, "tags": input.tags})
@@ -1,5 +1,6 @@
 import { v4 as uuidv4 } from 'uuid'
 import { DEFAULT_QUEUE_CONFIG } from '../../../infrastructure-validator/defaults'
+import { getPythonAdmission } from '../../../process-communication/python-admission'
 import { QueueManager, type QueueMetrics } from '../../../queue-manager'
 import type { Event, QueueConfig } from '../../../types'
 import type { EventAdapter, SubscriptionHandle } from '../../interfaces/event-adapter.interface'
@@ -58,6 +59,15 @@ export class InMemoryQueueEventAdapter implements EventAdapter {
   }
 
   getAllMetrics(): Record<string, QueueMetrics> {
-    return this.queueManager.getAllMetrics()
+    const metrics = this.queueManager.getAllMetrics()
+    const admission = getPythonAdmission()?.getTopicMetrics() ?? {}
+
+    for (const [topic, topicAdmission] of Object.entries(admission)) {
+      if (metrics[topic]) {
+        metrics[topic].admission = topicAdmission
+      }
+    }
+
+    return metrics
   }
 }
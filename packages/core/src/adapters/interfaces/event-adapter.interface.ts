@@ -9,6 +9,11 @@ export interface SubscriptionHandle {
 export interface EventAdapter {
   emit<TData>(event: Event<TData>): Promise<void>
 
+  /**
+   * Enqueues a batch of events at once, adapters without it get the events one by one through emit
+   */
+  emitMany?<TData>(events: Event<TData>[]): Promise<void>
+
   subscribe<TData>(
     topic: string,
     stepName: string,
@@ -1,5 +1,5 @@
 import type { Logger } from '../../logger'
-import type { StateOperation, StreamOperation, TraceError } from '../../observability/types'
+import type { CpuOperation, StateOperation, StreamOperation, TraceError } from '../../observability/types'
 import type { Step } from '../../types'
 
 export interface Metric {
@@ -9,11 +9,27 @@ export interface Metric {
   timestamp?: number
 }
 
+export type CpuOperationInput = { function: string; duration: number; tasks: number; chunksize?: number }
+
+export type SpanInput = {
+  id: number
+  parentId?: number
+  depth: number
+  name: string
+  start: number
+  duration: number
+  attributes?: Record<string, unknown>
+  error?: string
+}
+
 export interface Tracer {
   end(err?: TraceError): Promise<void>
   stateOperation(operation: StateOperation, input: unknown): Promise<void>
   emitOperation(topic: string, data: unknown, success: boolean): Promise<void>
   streamOperation(streamName: string, operation: StreamOperation, input: unknown): Promise<void>
+  cpuOperation?(operation: CpuOperation, input: CpuOperationInput): Promise<void>
+  spans?(spans: SpanInput[]): Promise<void>
+  queueWait?(duration: number): Promise<void>
   child(step: Step, logger: Logger): Tracer
 }
 
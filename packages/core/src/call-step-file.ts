@@ -1,10 +1,19 @@
+import path from 'path'
 import { trackEvent } from './analytics/utils'
+import { getStepLanguage } from './get-step-language'
+import { isEventStep } from './guards'
 import { getLanguageBasedRunner } from './language-runner'
 import type { Logger } from './logger'
 import type { Motia } from './motia'
-import type { Tracer } from './observability'
-import type { TraceError } from './observability/types'
+import type { CpuOperationInput, SpanInput, Tracer } from './observability'
+import { getRuntimeMetrics, type PythonRunnerMetrics } from './observability/runtime-metrics'
+import type { CpuOperation, TraceError } from './observability/types'
 import { ProcessManager } from './process-communication/process-manager'
+import { getPythonAdmission } from './process-communication/python-admission'
+import { getPythonWorkerPool } from './process-communication/python-worker-pool'
+import { getRpcRecordingDir, RpcRecorder } from './process-communication/rpc-recording'
+import type { ResponseStream } from './response-stream'
+import { type CachedEmit, type CachedResult, getStepCache } from './step-cache'
 import { compile } from './ts-compiler'
 import type { Event, InfrastructureConfig, Step } from './types'
 import type { BaseStreamItem, StateStreamEvent, StateStreamEventChannel } from './types-stream'
@@ -15,10 +24,21 @@ type StateSetInput = { traceId: string; key: string; value: unknown }
 type StateDeleteInput = { traceId: string; key: string }
 type StateClearInput = { traceId: string }
 
+type CpuInput = CpuOperationInput & { operation: CpuOperation }
+
+type ResponseStartInput = { status: number; headers: Record<string, string> }
+type ResponseChunkInput = { data: Buffer | string }
+
 type StateStreamGetInput = { groupId: string; id: string }
 type StateStreamSendInput = { channel: StateStreamEventChannel; event: StateStreamEvent<unknown> }
 type StateStreamMutateInput = { groupId: string; id: string; data: BaseStreamItem }
 
+// Reported by runners that cancelled the handler at its deadline
+const HANDLER_TIMEOUT_CODE = 'HANDLER_TIMEOUT'
+const TIMEOUT_GRACE_PERIOD_MS = 5000
+
+const isPythonStep = (filePath: string) => filePath.endsWith('.py')
+
 type CallStepFileOptions = {
   step: Step
   traceId: string
@@ -27,18 +47,126 @@ type CallStepFileOptions = {
   logger: Logger
   tracer: Tracer
   infrastructure?: Partial<InfrastructureConfig>
+  // lets API steps stream their response instead of returning it at once
+  response?: ResponseStream
+  // topic of the event that triggered an event step
+  topic?: string
 }
 
-export const callStepFile = <TData>(options: CallStepFileOptions, motia: Motia): Promise<TData | undefined> => {
-  const { step, traceId, data, tracer, logger, contextInFirstArg = false, infrastructure } = options
+/**
+ * Steps with a cache config get the result and the emits of an earlier execution with the same input when
+ * there is one, the emits are sent again with the trace of this execution
+ */
+export const callStepFile = async <TData>(options: CallStepFileOptions, motia: Motia): Promise<TData | undefined> => {
+  const { step, data } = options
+  const cacheConfig = isEventStep(step) ? step.config.cache : undefined
+
+  if (!cacheConfig) {
+    return admitStepFile<TData>(options, motia)
+  }
 
+  const { entry, cached } = await getStepCache().run<TData>(motia.state, step.config.name, cacheConfig, data, (emits) =>
+    admitStepFile<TData>(options, motia, emits),
+  )
+
+  if (cached) {
+    await replayCachedEmits(entry, options, motia)
+  }
+
+  return entry.result
+}
+
+const replayCachedEmits = async ({ emits }: CachedResult, options: CallStepFileOptions, motia: Motia) => {
+  const { step, traceId, logger, tracer } = options
   const flows = step.config.flows
 
+  logger.debug('Step result served from the cache', { step: step.config.name, emits: emits.length })
+
+  for (const emit of emits) {
+    // the step config can have changed since the result was cached
+    const allowed = isAllowedToEmit(step, emit.topic)
+    tracer.emitOperation(emit.topic, emit.data, allowed)
+
+    if (allowed) {
+      await motia.eventAdapter.emit({ ...emit, traceId, flows, logger, tracer })
+    }
+  }
+
+  tracer.end()
+}
+
+/**
+ * Python executions wait for a slot of the admission queue before their process or worker is taken, the time
+ * they waited is recorded in the trace
+ */
+const admitStepFile = async <TData>(
+  options: CallStepFileOptions,
+  motia: Motia,
+  emits?: CachedEmit[],
+): Promise<TData | undefined> => {
+  const admission = isPythonStep(options.step.filePath) ? getPythonAdmission() : undefined
+
+  if (!admission) {
+    return runStepFile<TData>(options, motia, emits)
+  }
+
+  const { step, infrastructure, topic, tracer } = options
+  const permit = await admission.acquire(step.config.name, {
+    limit: infrastructure?.handler?.concurrency,
+    weight: infrastructure?.handler?.weight,
+    topic,
+  })
+
+  try {
+    getRuntimeMetrics().observe('motia_step_queue_wait_seconds', { step: step.config.name }, permit.waitMs / 1000)
+
+    if (permit.waitMs > 0) {
+      await tracer.queueWait?.(permit.waitMs)
+    }
+    return await runStepFile<TData>(options, motia, emits)
+  } finally {
+    permit.release()
+  }
+}
+
+// emits, when given, collects the events sent by the step so they can be cached with its result
+const runStepFile = <TData>(
+  options: CallStepFileOptions,
+  motia: Motia,
+  emits?: CachedEmit[],
+): Promise<TData | undefined> => {
+  const { step, traceId, data, tracer, logger, contextInFirstArg = false, infrastructure, response } = options
+
+  const flows = step.config.flows
+  const recordingDir = isPythonStep(step.filePath) ? getRpcRecordingDir() : undefined
+  let recorder: RpcRecorder | undefined
+
+  const startedAt = performance.now()
+  const observeDuration = (status: 'ok' | 'error') => {
+    const labels = { step: step.config.name, language: getStepLanguage(step.filePath) ?? 'unknown', status }
+    getRuntimeMetrics().observe('motia_step_duration_seconds', labels, (performance.now() - startedAt) / 1000)
+  }
+
   return (async () => {
     try {
       const streamConfig = motia.lockedData.getStreams()
       const streams = Object.keys(streamConfig).map((name) => ({ name }))
-      const jsonData = JSON.stringify({ data, flows, traceId, contextInFirstArg, streams })
+      const timeoutSeconds = infrastructure?.handler?.timeout
+      const deadline = timeoutSeconds ? Date.now() + timeoutSeconds * 1000 : undefined
+      const jsonData = JSON.stringify({
+        data,
+        flows,
+        traceId,
+        contextInFirstArg,
+        streams,
+        deadline,
+        timeout: timeoutSeconds,
+      })
+
+      if (recordingDir) {
+        const filePath = path.relative(motia.lockedData.baseDir, step.filePath)
+        recorder = new RpcRecorder({ step: step.config.name, filePath, traceId, input: jsonData })
+      }
 
       const filePathToExecute = step.filePath.endsWith('.ts')
         ? await compile(step.filePath, motia.lockedData.baseDir)
@@ -48,6 +176,248 @@ export const callStepFile = <TData>(options: CallStepFileOptions, motia: Motia):
       let result: TData | undefined
       let timeoutId: NodeJS.Timeout | undefined
 
+      const timeoutError = (reported?: TraceError): Error => {
+        const errorMessage = `Step execution timed out after ${timeoutSeconds} seconds`
+        // the stack reported by the runner is where the handler was cancelled
+        const cancelledAt = reported?.stack ? { code: reported.code, stack: reported.stack } : {}
+
+        logger.error(errorMessage, { step: step.config.name, timeout: timeoutSeconds, ...cancelledAt })
+        tracer.end({ message: errorMessage, ...cancelledAt })
+        trackEvent('step_execution_timeout', {
+          stepName: step.config.name,
+          traceId,
+          timeout: timeoutSeconds,
+        })
+
+        return new Error(errorMessage)
+      }
+
+      const handlerError = (err: TraceError) => {
+        trackEvent('step_execution_error', {
+          stepName: step.config.name,
+          traceId,
+          message: err.message,
+        })
+
+        tracer.end({
+          message: err.message,
+          code: err.code,
+          stack: err.stack?.replace(new RegExp(`${motia.lockedData.baseDir}/`), ''),
+        })
+      }
+
+      const exitError = (code: number) => {
+        const error = { message: `Process exited with code ${code}`, code }
+        tracer.end(error)
+        trackEvent('step_execution_error', { stepName: step.config.name, traceId, code })
+      }
+
+      const registerHandlers = (processManager: ProcessManager) => {
+        processManager.record(recorder)
+        processManager.handler<unknown>('log', async (input: unknown) => logger.log(input))
+
+        processManager.handler<StateGetInput, unknown>('state.get', async (input) => {
+          tracer.stateOperation('get', input)
+          return motia.state.get(input.traceId, input.key)
+        })
+
+        processManager.handler<StateSetInput, unknown>('state.set', async (input) => {
+          tracer.stateOperation('set', { traceId: input.traceId, key: input.key, value: input.value })
+          return motia.state.set(input.traceId, input.key, input.value)
+        })
+
+        processManager.handler<StateDeleteInput, unknown>('state.delete', async (input) => {
+          tracer.stateOperation('delete', input)
+          return motia.state.delete(input.traceId, input.key)
+        })
+
+        processManager.handler<StateClearInput, void>('state.clear', async (input) => {
+          tracer.stateOperation('clear', input)
+          return motia.state.clear(input.traceId)
+        })
+
+        processManager.handler<StateStreamGetInput>(`state.getGroup`, async (input) => {
+          tracer.stateOperation('getGroup', input)
+          return motia.state.getGroup(input.groupId)
+        })
+
+        // sent by the Python runner after each call to its process pool
+        processManager.handler<CpuInput, void>('cpu', async ({ operation, ...input }) => {
+          return tracer.cpuOperation?.(operation, input)
+        })
+
+        // sent by the Python runner after each invocation, before the close message
+        processManager.handler<PythonRunnerMetrics, void>('metrics', async (input) => {
+          const metrics = getRuntimeMetrics()
+
+          processManager.ready(input.readyAt)
+          metrics.inc('motia_python_starts_total', { start: input.start })
+
+          if (input.importMs !== undefined) {
+            metrics.observe('motia_python_import_seconds', { step: step.config.name }, input.importMs / 1000)
+          }
+          if (input.rssMb !== undefined) {
+            metrics.observe('motia_python_rss_bytes', {}, input.rssMb * 1024 * 1024)
+          }
+        })
+
+        // spans of the handler, buffered by the Python runner and sent in batches
+        processManager.handler<{ spans: SpanInput[] }, void>('spans', async (input) => {
+          return tracer.spans?.(input.spans)
+        })
+
+        processManager.handler<TData, void>('result', async (input) => {
+          const inputWithBody = input as TData & { body?: { type?: string; data?: number[] } }
+
+          if (inputWithBody.body && inputWithBody.body.type === 'Buffer') {
+            inputWithBody.body = Buffer.from(inputWithBody.body.data || []) as unknown as typeof inputWithBody.body
+          }
+          result = inputWithBody as TData
+        })
+
+        if (response) {
+          processManager.handler<ResponseStartInput, void>('response.start', async (input) => {
+            response.start(input.status, input.headers)
+          })
+
+          processManager.handler<ResponseChunkInput, void>('response.chunk', async (input) => {
+            return response.write(input.data)
+          })
+
+          processManager.handler<void, void>('response.end', async () => response.end())
+        }
+
+        processManager.handler<Event, unknown>('emit', async (input) => {
+          const flows = step.config.flows
+
+          if (!isAllowedToEmit(step, input.topic)) {
+            tracer.emitOperation(input.topic, input.data, false)
+            return motia.printer.printInvalidEmit(step, input.topic)
+          }
+
+          tracer.emitOperation(input.topic, input.data, true)
+          emits?.push(input)
+          return motia.eventAdapter.emit({ ...input, traceId, flows, logger, tracer })
+        })
+
+        processManager.handler<Event[], void>('emitMany', async (input) => {
+          const flows = step.config.flows
+          const allowedTopics = new Map<string, boolean>()
+          const events: Event[] = []
+
+          for (const event of input) {
+            let allowed = allowedTopics.get(event.topic)
+
+            if (allowed === undefined) {
+              allowed = isAllowedToEmit(step, event.topic)
+              allowedTopics.set(event.topic, allowed)
+
+              if (!allowed) {
+                motia.printer.printInvalidEmit(step, event.topic)
+              }
+            }
+
+            tracer.emitOperation(event.topic, event.data, allowed)
+
+            if (allowed) {
+              emits?.push(event)
+              events.push({ ...event, traceId, flows, logger, tracer })
+            }
+          }
+
+          if (motia.eventAdapter.emitMany) {
+            return motia.eventAdapter.emitMany(events)
+          }
+
+          for (const event of events) {
+            await motia.eventAdapter.emit(event)
+          }
+        })
+
+        Object.entries(streamConfig).forEach(([name, streamFactory]) => {
+          const stateStream = streamFactory()
+
+          processManager.handler<StateStreamGetInput>(`streams.${name}.get`, async (input) => {
+            tracer.streamOperation(name, 'get', input)
+            return stateStream.get(input.groupId, input.id)
+          })
+
+          processManager.handler<StateStreamMutateInput>(`streams.${name}.set`, async (input) => {
+            tracer.streamOperation(name, 'set', { groupId: input.groupId, id: input.id, data: input.data })
+            return stateStream.set(input.groupId, input.id, input.data)
+          })
+
+          processManager.handler<StateStreamGetInput>(`streams.${name}.delete`, async (input) => {
+            tracer.streamOperation(name, 'delete', input)
+            return stateStream.delete(input.groupId, input.id)
+          })
+
+          processManager.handler<StateStreamGetInput>(`streams.${name}.getGroup`, async (input) => {
+            tracer.streamOperation(name, 'getGroup', input)
+            return stateStream.getGroup(input.groupId)
+          })
+
+          processManager.handler<StateStreamSendInput>(`streams.${name}.send`, async (input) => {
+            tracer.streamOperation(name, 'send', input)
+            return stateStream.send(input.channel, input.event)
+          })
+        })
+      }
+
+      const workerPool = isPythonStep(step.filePath) ? getPythonWorkerPool(motia.lockedData.baseDir) : undefined
+
+      if (workerPool) {
+        const worker = await workerPool.acquire()
+
+        return new Promise<TData | undefined>((resolve, reject) => {
+          const { processManager } = worker
+          const finish = () => {
+            if (timeoutId) clearTimeout(timeoutId)
+            worker.onExit = undefined
+          }
+
+          trackEvent('step_execution_started', {
+            stepName: step.config.name,
+            language: command,
+            type: step.config.type,
+            streams: streams.length,
+          })
+
+          if (timeoutSeconds) {
+            timeoutId = setTimeout(() => {
+              finish()
+              workerPool.discard(worker)
+              reject(timeoutError())
+            }, timeoutSeconds * 1000 + TIMEOUT_GRACE_PERIOD_MS)
+          }
+
+          registerHandlers(processManager)
+
+          processManager.handler<TraceError | undefined>('close', async (err) => {
+            finish()
+            workerPool.release(worker)
+
+            if (err?.code === HANDLER_TIMEOUT_CODE) {
+              reject(timeoutError(err))
+            } else if (err) {
+              handlerError(err)
+              reject(err)
+            } else {
+              tracer.end()
+              resolve(result)
+            }
+          })
+
+          worker.logger = logger
+          worker.onExit = (code) => {
+            finish()
+            exitError(code ?? 0)
+            reject(`Process exited with code ${code}`)
+          }
+          worker.invoke(step.filePath, jsonData)
+        })
+      }
+
       return new Promise<TData | undefined>((resolve, reject) => {
         const processManager = new ProcessManager({
           command,
@@ -64,127 +434,38 @@ export const callStepFile = <TData>(options: CallStepFileOptions, motia: Motia):
           streams: streams.length,
         })
 
-        const timeoutSeconds = infrastructure?.handler?.timeout
         if (timeoutSeconds) {
+          // The Python runner cancels the handler at the deadline and reports the timeout itself, it's only
+          // killed when it doesn't exit within the grace period
+          const gracePeriodMs = isPythonStep(step.filePath) ? TIMEOUT_GRACE_PERIOD_MS : 0
+
           timeoutId = setTimeout(async () => {
             processManager.kill()
-            const errorMessage = `Step execution timed out after ${timeoutSeconds} seconds`
-            logger.error(errorMessage, { step: step.config.name, timeout: timeoutSeconds })
-            tracer.end({ message: errorMessage })
-            trackEvent('step_execution_timeout', {
-              stepName: step.config.name,
-              traceId,
-              timeout: timeoutSeconds,
-            })
-            reject(new Error(errorMessage))
-          }, timeoutSeconds * 1000)
+            reject(timeoutError())
+          }, timeoutSeconds * 1000 + gracePeriodMs)
         }
 
         processManager
           .spawn()
           .then(() => {
             processManager.handler<TraceError | undefined>('close', async (err) => {
-              if (err) {
+              if (err?.code === HANDLER_TIMEOUT_CODE) {
                 if (timeoutId) clearTimeout(timeoutId)
                 processManager.close()
-
-                trackEvent('step_execution_error', {
-                  stepName: step.config.name,
-                  traceId,
-                  message: err.message,
-                })
-
-                tracer.end({
-                  message: err.message,
-                  code: err.code,
-                  stack: err.stack?.replace(new RegExp(`${motia.lockedData.baseDir}/`), ''),
-                })
-
-                const error = err ?? new Error('Handler execution failed')
-
-                reject(error)
+                reject(timeoutError(err))
+              } else if (err) {
+                if (timeoutId) clearTimeout(timeoutId)
+                processManager.close()
+                handlerError(err)
+                reject(err)
               } else {
                 tracer.end()
               }
 
               processManager.kill()
             })
-            processManager.handler<unknown>('log', async (input: unknown) => logger.log(input))
-
-            processManager.handler<StateGetInput, unknown>('state.get', async (input) => {
-              tracer.stateOperation('get', input)
-              return motia.state.get(input.traceId, input.key)
-            })
-
-            processManager.handler<StateSetInput, unknown>('state.set', async (input) => {
-              tracer.stateOperation('set', { traceId: input.traceId, key: input.key, value: input.value })
-              return motia.state.set(input.traceId, input.key, input.value)
-            })
-
-            processManager.handler<StateDeleteInput, unknown>('state.delete', async (input) => {
-              tracer.stateOperation('delete', input)
-              return motia.state.delete(input.traceId, input.key)
-            })
-
-            processManager.handler<StateClearInput, void>('state.clear', async (input) => {
-              tracer.stateOperation('clear', input)
-              return motia.state.clear(input.traceId)
-            })
-
-            processManager.handler<StateStreamGetInput>(`state.getGroup`, async (input) => {
-              tracer.stateOperation('getGroup', input)
-              return motia.state.getGroup(input.groupId)
-            })
-
-            processManager.handler<TData, void>('result', async (input) => {
-              const inputWithBody = input as TData & { body?: { type?: string; data?: number[] } }
-
-              if (inputWithBody.body && inputWithBody.body.type === 'Buffer') {
-                inputWithBody.body = Buffer.from(inputWithBody.body.data || []) as unknown as typeof inputWithBody.body
-              }
-              result = inputWithBody as TData
-            })
-
-            processManager.handler<Event, unknown>('emit', async (input) => {
-              const flows = step.config.flows
-
-              if (!isAllowedToEmit(step, input.topic)) {
-                tracer.emitOperation(input.topic, input.data, false)
-                return motia.printer.printInvalidEmit(step, input.topic)
-              }
-
-              tracer.emitOperation(input.topic, input.data, true)
-              return motia.eventAdapter.emit({ ...input, traceId, flows, logger, tracer })
-            })
-
-            Object.entries(streamConfig).forEach(([name, streamFactory]) => {
-              const stateStream = streamFactory()
-
-              processManager.handler<StateStreamGetInput>(`streams.${name}.get`, async (input) => {
-                tracer.streamOperation(name, 'get', input)
-                return stateStream.get(input.groupId, input.id)
-              })
-
-              processManager.handler<StateStreamMutateInput>(`streams.${name}.set`, async (input) => {
-                tracer.streamOperation(name, 'set', { groupId: input.groupId, id: input.id, data: input.data })
-                return stateStream.set(input.groupId, input.id, input.data)
-              })
-
-              processManager.handler<StateStreamGetInput>(`streams.${name}.delete`, async (input) => {
-                tracer.streamOperation(name, 'delete', input)
-                return stateStream.delete(input.groupId, input.id)
-              })
 
-              processManager.handler<StateStreamGetInput>(`streams.${name}.getGroup`, async (input) => {
-                tracer.streamOperation(name, 'getGroup', input)
-                return stateStream.getGroup(input.groupId)
-              })
-
-              processManager.handler<StateStreamSendInput>(`streams.${name}.send`, async (input) => {
-                tracer.streamOperation(name, 'send', input)
-                return stateStream.send(input.channel, input.event)
-              })
-            })
+            registerHandlers(processManager)
 
             processManager.onStdout((data) => {
               try {
@@ -202,9 +483,7 @@ export const callStepFile = <TData>(options: CallStepFileOptions, motia: Motia):
               processManager.close()
 
               if (code !== 0 && code !== null) {
-                const error = { message: `Process exited with code ${code}`, code }
-                tracer.end(error)
-                trackEvent('step_execution_error', { stepName: step.config.name, traceId, code })
+                exitError(code)
                 reject(`Process exited with code ${code}`)
               } else {
                 tracer.end()
@@ -267,4 +546,15 @@ export const callStepFile = <TData>(options: CallStepFileOptions, motia: Motia):
       throw err
     }
   })()
+    .then(
+      (result) => {
+        observeDuration('ok')
+        return result
+      },
+      (error) => {
+        observeDuration('error')
+        throw error
+      },
+    )
+    .finally(() => recordingDir && recorder?.save(recordingDir, logger))
 }
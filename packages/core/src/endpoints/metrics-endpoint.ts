@@ -0,0 +1,13 @@
+import type { Express } from 'express'
+import { getRuntimeMetrics } from '../observability/runtime-metrics'
+
+export const metricsEndpoint = (app: Express) => {
+  // Prometheus text format
+  app.get('/__motia/metrics', (_req, res) => {
+    res.type('text/plain; version=0.0.4; charset=utf-8').send(getRuntimeMetrics().toPrometheus())
+  })
+
+  app.get('/__motia/metrics/json', (_req, res) => {
+    res.json(getRuntimeMetrics().snapshot())
+  })
+}
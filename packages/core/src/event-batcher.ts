@@ -0,0 +1,83 @@
+import type { EventBatchConfig } from './types'
+
+// errors of the items of a batch that failed, by their position in the batch
+export type BatchFailures = Record<number, unknown>
+
+export type EventBatchMetrics = {
+  batches: number
+  items: number
+  avgBatchSize: number
+}
+
+type PendingItem<TItem> = {
+  item: TItem
+  resolve: () => void
+  reject: (error: unknown) => void
+}
+
+/**
+ * Gathers the events a subscription receives into batches of up to maxSize, a batch is processed once it's full
+ * or maxWaitMs after its first event arrived.
+ *
+ * Each event keeps its own promise, resolved or rejected with the outcome of its item, so the adapter that
+ * delivered it acknowledges or retries it on its own.
+ */
+export class EventBatcher<TItem> {
+  private pending: PendingItem<TItem>[] = []
+  private timeout?: NodeJS.Timeout
+  private batches = 0
+  private items = 0
+
+  constructor(
+    private readonly config: EventBatchConfig,
+    private readonly processBatch: (items: TItem[]) => Promise<BatchFailures | undefined>,
+  ) {}
+
+  add(item: TItem): Promise<void> {
+    return new Promise<void>((resolve, reject) => {
+      this.pending.push({ item, resolve, reject })
+
+      if (this.pending.length >= this.config.maxSize) {
+        this.flush()
+      } else if (!this.timeout) {
+        this.timeout = setTimeout(() => this.flush(), this.config.maxWaitMs)
+      }
+    })
+  }
+
+  flush(): void {
+    if (this.timeout) {
+      clearTimeout(this.timeout)
+      this.timeout = undefined
+    }
+
+    const batch = this.pending.splice(0, this.config.maxSize)
+    if (batch.length === 0) {
+      return
+    }
+
+    this.batches++
+    this.items += batch.length
+
+    this.processBatch(batch.map(({ item }) => item)).then(
+      (failures) => {
+        batch.forEach(({ resolve, reject }, index) => {
+          if (failures && index in failures) {
+            reject(failures[index])
+          } else {
+            resolve()
+          }
+        })
+      },
+      (error) => batch.forEach(({ reject }) => reject(error)),
+    )
+  }
+
+  getMetrics(): EventBatchMetrics {
+    return {
+      batches: this.batches,
+      items: this.items,
+      avgBatchSize: this.batches ? this.items / this.batches : 0,
+    }
+  }
+}
@@ -5,6 +5,9 @@ import { compile } from './ts-compiler'
 import type { StepConfig } from './types'
 import type { StreamConfig } from './types-stream'
 
+// python configs that aren't literals are read by importing the module, the reason comes with the config
+type ConfigMessage<T> = T & { __motia_configImportReason?: string }
+
 const getConfig = async <T>(file: string, projectRoot?: string): Promise<T | null> => {
   const filePathToExecute = file.endsWith('.ts') ? await compile(file, projectRoot || process.cwd()) : file
 
@@ -28,12 +31,17 @@ const getConfig = async <T>(file: string, projectRoot?: string): Promise<T | nul
     processManager
       .spawn()
       .then(() => {
-        processManager.onMessage<T>((message) => {
+        processManager.onMessage<ConfigMessage<T>>((message) => {
+          const importReason = message.__motia_configImportReason
+          delete message.__motia_configImportReason
           config = message
           globalLogger.debug(`[Config] Read config via ${processManager.commType?.toUpperCase()}`, {
             config,
             communicationType: processManager.commType,
           })
+          if (importReason) {
+            globalLogger.debug(`[Config] Imported ${file} to read its config`, { reason: importReason })
+          }
           resolve(config)
           processManager.kill()
         })
@@ -61,6 +61,8 @@ export const handlerBaseSchema = z.object({
     .min(AWS_LAMBDA_LIMITS.MIN_TIMEOUT_SECONDS, `Timeout must be at least ${AWS_LAMBDA_LIMITS.MIN_TIMEOUT_SECONDS}s`)
     .max(AWS_LAMBDA_LIMITS.MAX_TIMEOUT_SECONDS, `Timeout cannot exceed ${AWS_LAMBDA_LIMITS.MAX_TIMEOUT_SECONDS}s`),
   cpu: z.number().optional(),
+  concurrency: z.number().int().min(1, 'concurrency must be at least 1').optional(),
+  weight: z.number().positive('weight must be positive').optional(),
 })
 
 export const handlerSchema = handlerBaseSchema.partial().superRefine((handler, ctx) => {
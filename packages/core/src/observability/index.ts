@@ -1,4 +1,9 @@
-import type { ObservabilityAdapter, Tracer } from '../adapters/interfaces/observability-adapter.interface'
+import type {
+  CpuOperationInput,
+  ObservabilityAdapter,
+  SpanInput,
+  Tracer,
+} from '../adapters/interfaces/observability-adapter.interface'
 
-export type { ObservabilityAdapter, Tracer }
+export type { CpuOperationInput, ObservabilityAdapter, SpanInput, Tracer }
 export type TracerFactory = ObservabilityAdapter
@@ -13,6 +13,15 @@ export class NoTracer implements Tracer {
   async streamOperation() {
     return Promise.resolve()
   }
+  async cpuOperation() {
+    return Promise.resolve()
+  }
+  async spans() {
+    return Promise.resolve()
+  }
+  async queueWait() {
+    return Promise.resolve()
+  }
   clear() {}
   child() {
     return this
@@ -0,0 +1,284 @@
+export type MetricType = 'counter' | 'gauge' | 'histogram'
+export type MetricLabels = Record<string, string>
+
+type MetricDefinition = {
+  type: MetricType
+  help: string
+  labels: string[]
+  // upper bounds of the histogram buckets
+  buckets?: number[]
+}
+
+// seconds
+const DURATION_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+const RPC_BUCKETS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1]
+const RSS_BUCKETS = [32, 64, 128, 256, 512, 1024, 2048, 4096].map((mb) => mb * 1024 * 1024)
+
+export const RUNTIME_METRICS = {
+  motia_step_duration_seconds: {
+    type: 'histogram',
+    help: 'Duration of step executions, without the time spent in the admission queue',
+    labels: ['step', 'language', 'status'],
+    buckets: DURATION_BUCKETS,
+  },
+  motia_step_queue_wait_seconds: {
+    type: 'histogram',
+    help: 'Time Python executions waited in the admission queue',
+    labels: ['step'],
+    buckets: DURATION_BUCKETS,
+  },
+  motia_process_spawns_total: {
+    type: 'counter',
+    help: 'Processes spawned by the host',
+    labels: ['context'],
+  },
+  motia_process_spawn_seconds: {
+    type: 'histogram',
+    help: 'Time from spawning a Python runner until it was ready to run a handler',
+    labels: ['context'],
+    buckets: DURATION_BUCKETS,
+  },
+  motia_processes: {
+    type: 'gauge',
+    help: 'Processes spawned by the host that are still running',
+    labels: ['context'],
+  },
+  motia_rpc_duration_seconds: {
+    type: 'histogram',
+    help: 'Time the host took to handle the RPC requests of step processes',
+    labels: ['method'],
+    buckets: RPC_BUCKETS,
+  },
+  motia_python_starts_total: {
+    type: 'counter',
+    help: 'Python invocations that imported the step module (cold) or reused it in a worker (warm)',
+    labels: ['start'],
+  },
+  motia_python_import_seconds: {
+    type: 'histogram',
+    help: 'Time Python runners took to import step modules on cold starts',
+    labels: ['step'],
+    buckets: DURATION_BUCKETS,
+  },
+  motia_python_rss_bytes: {
+    type: 'histogram',
+    help: 'Resident set size of Python runners after each invocation',
+    labels: [],
+    buckets: RSS_BUCKETS,
+  },
+  motia_python_workers: {
+    type: 'gauge',
+    help: 'Python workers in the pool',
+    labels: ['state'],
+  },
+  motia_python_worker_recycles_total: {
+    type: 'counter',
+    help: 'Python workers replaced, by reason',
+    labels: ['reason'],
+  },
+  motia_python_admission_executions: {
+    type: 'gauge',
+    help: 'Python executions running or waiting in the admission queue',
+    labels: ['step', 'state'],
+  },
+  motia_step_cache_lookups_total: {
+    type: 'counter',
+    help: 'Lookups of the step cache, shared ones waited for an execution in progress',
+    labels: ['step', 'result'],
+  },
+  motia_event_batch_items_total: {
+    type: 'counter',
+    help: 'Events processed by batch steps',
+    labels: ['step'],
+  },
+  motia_event_batches_total: {
+    type: 'counter',
+    help: 'Batches processed by batch steps',
+    labels: ['step'],
+  },
+} satisfies Record<string, MetricDefinition>
+
+export type RuntimeMetricName = keyof typeof RUNTIME_METRICS
+
+/**
+ * Sent by the Python runner after each invocation, before the close message
+ */
+export type PythonRunnerMetrics = {
+  // epoch time in ms the runner was ready to run handlers
+  readyAt: number
+  start: 'cold' | 'warm'
+  importMs?: number
+  rssMb?: number
+}
+
+export type MetricSeries = {
+  labels: MetricLabels
+  // counters and gauges
+  value?: number
+  // histograms, bucket counts are cumulative as in the Prometheus format, count is the +Inf bucket
+  count?: number
+  sum?: number
+  buckets?: Array<{ le: number; count: number }>
+}
+
+export type MetricSnapshot = {
+  name: RuntimeMetricName
+  type: MetricType
+  help: string
+  series: MetricSeries[]
+}
+
+type Series = {
+  labels: MetricLabels
+  value: number
+  // histograms only, not cumulative
+  bucketCounts?: number[]
+}
+
+// label value of the series over the limit of a metric
+const OVERFLOW_LABEL = '__other__'
+
+const escapeLabel = (value: string) => value.replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n')
+
+const formatLabels = (labels: MetricLabels, extra?: MetricLabels) => {
+  const entries = Object.entries({ ...labels, ...extra })
+  return entries.length ? `{${entries.map(([key, value]) => `${key}="${escapeLabel(value)}"`).join(',')}}` : ''
+}
+
+/**
+ * In-process registry of the runtime metrics of the host, scraped in the Prometheus text format.
+ *
+ * Each metric keeps at most maxSeries label sets, later ones are counted under `__other__` so step names,
+ * RPC methods and the like can't grow the output without bounds. Collectors refresh the metrics kept by
+ * other components (the worker pool, the admission queues, the step cache) when the metrics are read.
+ */
+export class RuntimeMetrics {
+  private series = new Map<RuntimeMetricName, Map<string, Series>>()
+  private collectors = new Map<string, (metrics: RuntimeMetrics) => void>()
+
+  constructor(private readonly maxSeries = 200) {}
+
+  inc(name: RuntimeMetricName, labels: MetricLabels = {}, value = 1): void {
+    this.getSeries(name, labels).value += value
+  }
+
+  set(name: RuntimeMetricName, labels: MetricLabels, value: number): void {
+    this.getSeries(name, labels).value = value
+  }
+
+  observe(name: RuntimeMetricName, labels: MetricLabels, value: number): void {
+    const series = this.getSeries(name, labels)
+    const buckets = (RUNTIME_METRICS[name] as MetricDefinition).buckets ?? []
+    const index = buckets.findIndex((bound) => value <= bound)
+
+    series.value += value
+    series.bucketCounts![index === -1 ? buckets.length : index]++
+  }
+
+  /**
+   * Registers a function called before the metrics are read, a collector with the same id is replaced
+   */
+  collect(id: string, collector?: (metrics: RuntimeMetrics) => void): void {
+    if (collector) {
+      this.collectors.set(id, collector)
+    } else {
+      this.collectors.delete(id)
+    }
+  }
+
+  snapshot(): MetricSnapshot[] {
+    this.collectors.forEach((collector) => collector(this))
+
+    return (Object.keys(RUNTIME_METRICS) as RuntimeMetricName[]).map((name) => {
+      const { type, help, buckets = [] } = RUNTIME_METRICS[name] as MetricDefinition
+      const series = Array.from(this.series.get(name)?.values() ?? [], ({ labels, value, bucketCounts }) => {
+        if (!bucketCounts) {
+          return { labels, value }
+        }
+
+        let count = 0
+        const cumulative = buckets.map((le, index) => {
+          count += bucketCounts[index]
+          return { le, count }
+        })
+
+        return { labels, count: count + bucketCounts[buckets.length], sum: value, buckets: cumulative }
+      })
+
+      return { name, type, help, series }
+    })
+  }
+
+  toPrometheus(): string {
+    const lines: string[] = []
+
+    for (const { name, type, help, series } of this.snapshot()) {
+      lines.push(`# HELP ${name} ${help}`, `# TYPE ${name} ${type}`)
+
+      for (const { labels, value, count, sum, buckets } of series) {
+        if (!buckets) {
+          lines.push(`${name}${formatLabels(labels)} ${value}`)
+          continue
+        }
+
+        for (const bucket of buckets) {
+          lines.push(`${name}_bucket${formatLabels(labels, { le: String(bucket.le) })} ${bucket.count}`)
+        }
+        lines.push(
+          `${name}_bucket${formatLabels(labels, { le: '+Inf' })} ${count}`,
+          `${name}_sum${formatLabels(labels)} ${sum}`,
+          `${name}_count${formatLabels(labels)} ${count}`,
+        )
+      }
+    }
+
+    return `${lines.join('\n')}\n`
+  }
+
+  reset(): void {
+    this.series.clear()
+  }
+
+  private getSeries(name: RuntimeMetricName, labels: MetricLabels): Series {
+    const definition = RUNTIME_METRICS[name] as MetricDefinition
+    let metricSeries = this.series.get(name)
+
+    if (!metricSeries) {
+      metricSeries = new Map()
+      this.series.set(name, metricSeries)
+    }
+
+    let key = JSON.stringify(definition.labels.map((label) => labels[label] ?? ''))
+    let series = metricSeries.get(key)
+
+    if (!series && metricSeries.size >= this.maxSeries) {
+      labels = Object.fromEntries(definition.labels.map((label) => [label, OVERFLOW_LABEL]))
+      key = JSON.stringify(definition.labels.map(() => OVERFLOW_LABEL))
+      series = metricSeries.get(key)
+    }
+
+    if (!series) {
+      series = {
+        labels: Object.fromEntries(definition.labels.map((label) => [label, labels[label] ?? ''])),
+        value: 0,
+        bucketCounts: definition.buckets ? new Array(definition.buckets.length + 1).fill(0) : undefined,
+      }
+      metricSeries.set(key, series)
+    }
+
+    return series
+  }
+}
+
+let runtimeMetrics: RuntimeMetrics | undefined
+
+/**
+ * The runtime metrics of the host, MOTIA_METRICS_MAX_SERIES limits the label sets of each metric
+ */
+export const getRuntimeMetrics = (): RuntimeMetrics => {
+  if (!runtimeMetrics) {
+    runtimeMetrics = new RuntimeMetrics(Number(process.env.MOTIA_METRICS_MAX_SERIES ?? 200))
+  }
+
+  return runtimeMetrics
+}
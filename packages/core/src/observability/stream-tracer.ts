@@ -1,9 +1,9 @@
 import type { Logger } from '../logger'
 import type { Step } from '../types'
 import { createTrace } from './create-trace'
-import type { Tracer } from './index'
+import type { CpuOperationInput, SpanInput, Tracer } from './index'
 import type { TraceManager } from './trace-manager'
-import type { StateOperation, StreamOperation, Trace, TraceError, TraceEvent, TraceGroup } from './types'
+import type { CpuOperation, StateOperation, StreamOperation, Trace, TraceError, TraceEvent, TraceGroup } from './types'
 
 export class StreamTracer implements Tracer {
   constructor(
@@ -89,6 +89,43 @@ export class StreamTracer implements Tracer {
     })
   }
 
+  async cpuOperation(operation: CpuOperation, input: CpuOperationInput) {
+    await this.addEvent({
+      type: 'cpu',
+      // the runner reports the call once it finished
+      timestamp: Date.now() - input.duration,
+      operation,
+      function: input.function,
+      duration: input.duration,
+      tasks: input.tasks,
+      chunksize: input.chunksize,
+    })
+  }
+
+  async spans(spans: SpanInput[]) {
+    // the runner sends the spans of a handler in batches, the trace is updated once per batch
+    for (const span of spans) {
+      this.trace.events.push({
+        type: 'span',
+        timestamp: span.start,
+        spanId: span.id,
+        parentSpanId: span.parentId,
+        depth: span.depth,
+        name: span.name,
+        duration: span.duration,
+        attributes: span.attributes,
+        error: span.error,
+      })
+    }
+
+    await this.manager.updateTrace()
+  }
+
+  async queueWait(duration: number) {
+    this.trace.queueWait = duration
+    await this.manager.updateTrace()
+  }
+
   child(step: Step, logger: Logger) {
     const trace = createTrace(this.traceGroup, step)
     const manager = this.manager.child(trace)
@@ -21,14 +21,17 @@ export interface Trace {
   startTime: number
   endTime?: number
   error?: TraceError
+  // time the step waited for an execution slot before it started, in ms
+  queueWait?: number
   entryPoint: { type: StepConfig['type']; stepName: string }
   events: TraceEvent[]
 }
 
-export type TraceEvent = StateEvent | EmitEvent | StreamEvent | LogEntry
+export type TraceEvent = StateEvent | EmitEvent | StreamEvent | CpuEvent | SpanEvent | LogEntry
 
 export type StateOperation = 'get' | 'getGroup' | 'set' | 'delete' | 'clear'
 export type StreamOperation = 'get' | 'getGroup' | 'set' | 'delete' | 'clear' | 'send'
+export type CpuOperation = 'run' | 'map'
 
 export interface StateEvent {
   type: 'state'
@@ -58,6 +61,34 @@ export interface StreamEvent {
   calls: number
 }
 
+/**
+ * Work sent by a Python handler to the process pool of the runner (context.run_cpu / context.map_cpu)
+ */
+export interface CpuEvent {
+  type: 'cpu'
+  timestamp: number
+  operation: CpuOperation
+  function: string
+  duration: number
+  tasks: number
+  chunksize?: number
+}
+
+/**
+ * Span recorded by a Python handler (context.tracer.span / @traced), nested under its parent span
+ */
+export interface SpanEvent {
+  type: 'span'
+  timestamp: number
+  spanId: number
+  parentSpanId?: number
+  depth: number
+  name: string
+  duration: number
+  attributes?: Record<string, unknown>
+  error?: string
+}
+
 export interface LogEntry {
   type: 'log'
   timestamp: number
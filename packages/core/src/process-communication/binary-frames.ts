@@ -0,0 +1,122 @@
+import type { Readable } from 'stream'
+
+// frame id and byte length, followed by the bytes
+const FRAME_HEADER_SIZE = 8
+
+/**
+ * NumPy arrays sent by the Python runner
+ */
+export type BinaryArray = { dtype: string; shape: number[]; data: Buffer }
+
+type BinaryPlaceholder = { $binary: number | string; dtype?: string; shape?: number[] }
+
+export type BinaryMessage = { frames?: number[]; binary?: boolean }
+
+const isPlaceholder = (value: object): value is BinaryPlaceholder => '$binary' in value
+
+/**
+ * Reads the raw frames written by the Python runner to its binary pipe.
+ *
+ * A frame completely contained in a chunk of the pipe is referenced without copying, frames split across
+ * chunks are copied once into a buffer of their size.
+ */
+export class BinaryFrameReader {
+  private frames = new Map<number, Buffer>()
+  private waiters = new Map<number, () => void>()
+  private header = Buffer.alloc(0)
+  private current?: { id: number; data: Buffer; offset: number }
+
+  constructor(stream: Readable) {
+    stream.on('data', (chunk: Buffer) => this.push(chunk))
+  }
+
+  push(chunk: Buffer): void {
+    let offset = 0
+
+    while (offset < chunk.length) {
+      if (this.current) {
+        const { id, data } = this.current
+        const length = Math.min(data.length - this.current.offset, chunk.length - offset)
+
+        chunk.copy(data, this.current.offset, offset, offset + length)
+        this.current.offset += length
+        offset += length
+
+        if (this.current.offset === data.length) {
+          this.current = undefined
+          this.complete(id, data)
+        }
+        continue
+      }
+
+      const headerLength = Math.min(FRAME_HEADER_SIZE - this.header.length, chunk.length - offset)
+      this.header = Buffer.concat([this.header, chunk.subarray(offset, offset + headerLength)])
+      offset += headerLength
+
+      if (this.header.length < FRAME_HEADER_SIZE) {
+        return
+      }
+
+      const id = this.header.readUInt32BE(0)
+      const length = this.header.readUInt32BE(4)
+      this.header = Buffer.alloc(0)
+
+      if (chunk.length - offset >= length) {
+        this.complete(id, chunk.subarray(offset, offset + length))
+        offset += length
+      } else {
+        this.current = { id, data: Buffer.allocUnsafe(length), offset: 0 }
+      }
+    }
+  }
+
+  /**
+   * Replaces the binary placeholders of a message once the frames it references were received
+   */
+  async decode<T>(message: T & BinaryMessage): Promise<T> {
+    await Promise.all((message.frames ?? []).map((id) => this.waitFor(id)))
+
+    const decoded = decodeBinary(message, this.frames)
+    message.frames?.forEach((id) => this.frames.delete(id))
+
+    return decoded
+  }
+
+  private waitFor(id: number): Promise<void> | void {
+    if (!this.frames.has(id)) {
+      return new Promise((resolve) => this.waiters.set(id, resolve))
+    }
+  }
+
+  private complete(id: number, data: Buffer): void {
+    this.frames.set(id, data)
+    this.waiters.get(id)?.()
+    this.waiters.delete(id)
+  }
+}
+
+/**
+ * Frames are referenced by id, base64 strings are embedded by runners without a binary pipe
+ */
+export const decodeBinary = <T>(value: T, frames: Map<number, Buffer> = new Map()): T => {
+  if (Array.isArray(value)) {
+    return value.map((item) => decodeBinary(item, frames)) as T
+  }
+
+  if (!value || typeof value !== 'object' || Buffer.isBuffer(value)) {
+    return value
+  }
+
+  if (isPlaceholder(value)) {
+    const { $binary, dtype, shape } = value
+    const data = typeof $binary === 'number' ? frames.get($binary) : Buffer.from($binary, 'base64')
+
+    if (!data) {
+      throw new Error(`Binary frame ${$binary} not found`)
+    }
+
+    return (dtype ? { dtype, shape, data } : data) as T
+  }
+
+  return Object.fromEntries(Object.entries(value).map(([key, item]) => [key, decodeBinary(item, frames)])) as T
+}
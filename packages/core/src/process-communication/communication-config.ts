@@ -22,6 +22,12 @@ export function createCommunicationConfig(command: string, projectRoot?: string)
       ...process.env,
       PYTHONPATH: projectRoot || process.cwd(),
     }
+
+    if (type === 'ipc') {
+      // bytes and NumPy arrays are written as raw frames to a pipe next to the IPC channel
+      spawnOptions.stdio = ['inherit', 'inherit', 'inherit', 'ipc', 'pipe']
+      spawnOptions.env.MOTIA_BINARY_FD = '4'
+    }
   }
 
   return { type, spawnOptions }
@@ -1,9 +1,11 @@
-import { type ChildProcess, spawn } from 'child_process'
+import { type ChildProcess, type Serializable, spawn } from 'child_process'
 import type { Logger } from '../logger'
+import { getRuntimeMetrics } from '../observability/runtime-metrics'
 import { RpcProcessor } from '../step-handler-rpc-processor'
 import { RpcStdinProcessor } from '../step-handler-rpc-stdin-processor'
 import { type CommunicationType, createCommunicationConfig } from './communication-config'
 import type { MessageCallback, RpcHandler, RpcProcessorInterface } from './rpc-processor-interface'
+import type { RpcRecorder } from './rpc-recording'
 
 export interface ProcessManagerOptions {
   command: string
@@ -13,10 +15,15 @@ export interface ProcessManagerOptions {
   projectRoot?: string
 }
 
+// stream methods are counted without the stream name, like streams.get
+const getMethodLabel = (method: string) => method.replace(/^streams\.[^.]+\./, 'streams.')
+
 export class ProcessManager {
   private child?: ChildProcess
   private processor?: RpcProcessorInterface
   private communicationType?: CommunicationType
+  private spawnedAt?: number
+  private readyObserved = false
 
   constructor(private options: ProcessManagerOptions) {}
 
@@ -34,8 +41,24 @@ export class ProcessManager {
     })
 
     // Spawn the process
+    this.spawnedAt = Date.now()
     this.child = spawn(command, args, commConfig.spawnOptions)
 
+    const metrics = getRuntimeMetrics()
+    metrics.inc('motia_process_spawns_total', { context })
+    metrics.inc('motia_processes', { context })
+
+    // a process that fails to spawn only emits an error
+    let running = true
+    const exited = () => {
+      if (running) {
+        running = false
+        metrics.inc('motia_processes', { context }, -1)
+      }
+    }
+    this.child.once('exit', exited)
+    this.child.once('error', exited)
+
     // Create appropriate processor based on communication type
     this.processor = this.communicationType === 'rpc' ? new RpcStdinProcessor(this.child) : new RpcProcessor(this.child)
 
@@ -49,7 +72,34 @@ export class ProcessManager {
     if (!this.processor) {
       throw new Error('Process not spawned yet. Call spawn() first.')
     }
-    this.processor.handler(method, handler)
+    const labels = { method: getMethodLabel(method) }
+
+    this.processor.handler<TInput, TOutput>(method, async (input) => {
+      const startedAt = performance.now()
+
+      try {
+        return await handler(input)
+      } finally {
+        getRuntimeMetrics().observe('motia_rpc_duration_seconds', labels, (performance.now() - startedAt) / 1000)
+      }
+    })
+  }
+
+  /**
+   * Records the time it took the process to be ready to run handlers, reported by the process itself,
+   * only the first report of a process counts
+   */
+  ready(readyAt: number): void {
+    if (this.readyObserved || !this.spawnedAt) {
+      return
+    }
+
+    this.readyObserved = true
+    getRuntimeMetrics().observe(
+      'motia_process_spawn_seconds',
+      { context: this.options.context ?? 'Process' },
+      Math.max(0, readyAt - this.spawnedAt) / 1000,
+    )
   }
 
   onMessage<T = unknown>(callback: MessageCallback<T>): void {
@@ -59,6 +109,16 @@ export class ProcessManager {
     this.processor.onMessage(callback)
   }
 
+  /**
+   * Captures the RPC traffic of the process into the recorder, workers get the recorder of each invocation
+   */
+  record(recorder?: RpcRecorder): void {
+    if (!this.processor) {
+      throw new Error('Process not spawned yet. Call spawn() first.')
+    }
+    this.processor.record(recorder)
+  }
+
   onProcessClose(callback: (code: number | null) => void): void {
     if (!this.child) {
       throw new Error('Process not spawned yet. Call spawn() first.')
@@ -90,6 +150,18 @@ export class ProcessManager {
     }
   }
 
+  send(message: unknown): void {
+    if (!this.child) {
+      throw new Error('Process not spawned yet. Call spawn() first.')
+    }
+
+    if (this.communicationType === 'rpc') {
+      this.child.stdin?.write(`${JSON.stringify(message)}\n`)
+    } else {
+      this.child.send?.(message as Serializable)
+    }
+  }
+
   kill(): void {
     if (this.child) {
       this.child.kill('SIGKILL')
@@ -0,0 +1,203 @@
+import os from 'os'
+import { getRuntimeMetrics } from '../observability/runtime-metrics'
+
+export type AdmissionMetrics = {
+  running: number
+  waiting: number
+  admitted: number
+  avgWaitMs: number
+  maxWaitMs: number
+}
+
+export type AdmissionPermit = {
+  // time spent in the admission queue
+  waitMs: number
+  release: () => void
+}
+
+export type AdmissionRequest = {
+  // executions of the step allowed at once, the global limit when not set
+  limit?: number
+  // share of the global slots the step gets while other steps are waiting too
+  weight?: number
+  // topic the execution was triggered by, for the queue metrics
+  topic?: string
+}
+
+export type PythonAdmissionOptions = {
+  limit: number
+  stepLimit?: number
+}
+
+type Stats = { running: number; waiting: number; admitted: number; totalWaitMs: number; maxWaitMs: number }
+
+type Waiter = { enqueuedAt: number; topic?: string; resolve: (permit: AdmissionPermit) => void }
+
+type StepQueue = {
+  stats: Stats
+  limit: number
+  weight: number
+  // stride scheduling: grows by 1 / weight on each admission, the waiting step with the lowest pass goes next
+  pass: number
+  waiters: Waiter[]
+}
+
+const createStats = (): Stats => ({ running: 0, waiting: 0, admitted: 0, totalWaitMs: 0, maxWaitMs: 0 })
+
+const toMetrics = ({ running, waiting, admitted, totalWaitMs, maxWaitMs }: Stats): AdmissionMetrics => ({
+  running,
+  waiting,
+  admitted,
+  avgWaitMs: admitted ? totalWaitMs / admitted : 0,
+  maxWaitMs,
+})
+
+/**
+ * Limits how many Python executions run at once, globally and for each step.
+ *
+ * Executions over the limits wait in a queue per step. When a slot frees up, the steps with waiting
+ * executions share it in proportion to their weight, so a backed up topic can't starve the other steps.
+ */
+export class PythonAdmission {
+  private running = 0
+  private virtualTime = 0
+  private steps = new Map<string, StepQueue>()
+  private topics = new Map<string, Stats>()
+
+  constructor(private readonly options: PythonAdmissionOptions) {}
+
+  acquire(step: string, request: AdmissionRequest = {}): Promise<AdmissionPermit> {
+    const queue = this.getQueue(step, request)
+    const waiter: Waiter = { enqueuedAt: Date.now(), topic: request.topic, resolve: () => {} }
+    const permit = new Promise<AdmissionPermit>((resolve) => {
+      waiter.resolve = resolve
+    })
+
+    if (queue.waiters.length === 0) {
+      // a step that was idle doesn't get credit for the time it didn't use its share
+      queue.pass = Math.max(queue.pass, this.virtualTime)
+    }
+
+    queue.waiters.push(waiter)
+    this.updateWaiting(queue, waiter.topic, 1)
+    this.dispatch()
+
+    return permit
+  }
+
+  getMetrics(): Record<string, AdmissionMetrics> {
+    return Object.fromEntries(Array.from(this.steps, ([step, queue]) => [step, toMetrics(queue.stats)]))
+  }
+
+  getTopicMetrics(): Record<string, AdmissionMetrics> {
+    return Object.fromEntries(Array.from(this.topics, ([topic, stats]) => [topic, toMetrics(stats)]))
+  }
+
+  private getQueue(step: string, request: AdmissionRequest): StepQueue {
+    let queue = this.steps.get(step)
+
+    if (!queue) {
+      queue = { stats: createStats(), limit: Infinity, weight: 1, pass: this.virtualTime, waiters: [] }
+      this.steps.set(step, queue)
+    }
+
+    // the config of a step can change while the dev server runs
+    queue.limit = request.limit ?? this.options.stepLimit ?? Infinity
+    queue.weight = request.weight && request.weight > 0 ? request.weight : 1
+
+    return queue
+  }
+
+  private getTopicStats(topic?: string): Stats | undefined {
+    if (!topic) {
+      return undefined
+    }
+
+    let stats = this.topics.get(topic)
+    if (!stats) {
+      stats = createStats()
+      this.topics.set(topic, stats)
+    }
+    return stats
+  }
+
+  private updateWaiting(queue: StepQueue, topic: string | undefined, delta: number): void {
+    queue.stats.waiting += delta
+    const topicStats = this.getTopicStats(topic)
+    if (topicStats) topicStats.waiting += delta
+  }
+
+  private dispatch(): void {
+    while (this.running < this.options.limit) {
+      let next: StepQueue | undefined
+
+      for (const queue of this.steps.values()) {
+        if (queue.waiters.length > 0 && queue.stats.running < queue.limit && (!next || queue.pass < next.pass)) {
+          next = queue
+        }
+      }
+
+      if (!next) {
+        return
+      }
+
+      this.admit(next)
+    }
+  }
+
+  private admit(queue: StepQueue): void {
+    const waiter = queue.waiters.shift()!
+    const waitMs = Date.now() - waiter.enqueuedAt
+    const topicStats = this.getTopicStats(waiter.topic)
+    const stats = topicStats ? [queue.stats, topicStats] : [queue.stats]
+
+    this.virtualTime = queue.pass
+    queue.pass += 1 / queue.weight
+    this.running++
+
+    for (const item of stats) {
+      item.waiting--
+      item.running++
+      item.admitted++
+      item.totalWaitMs += waitMs
+      item.maxWaitMs = Math.max(item.maxWaitMs, waitMs)
+    }
+
+    let released = false
+    const release = () => {
+      if (released) return
+      released = true
+      this.running--
+      stats.forEach((item) => item.running--)
+      this.dispatch()
+    }
+
+    waiter.resolve({ waitMs, release })
+  }
+}
+
+let pythonAdmission: PythonAdmission | undefined
+
+/**
+ * Python executions are limited to MOTIA_PYTHON_MAX_CONCURRENCY at once (twice the number of CPUs by default,
+ * 0 turns the limit off). MOTIA_PYTHON_STEP_MAX_CONCURRENCY sets a default limit for each step, steps can set
+ * their own with infrastructure.handler.concurrency.
+ */
+export const getPythonAdmission = (): PythonAdmission | undefined => {
+  const limit = Number(process.env.MOTIA_PYTHON_MAX_CONCURRENCY ?? os.cpus().length * 2)
+
+  if (!pythonAdmission && limit > 0) {
+    const stepLimit = Number(process.env.MOTIA_PYTHON_STEP_MAX_CONCURRENCY ?? 0)
+    const admission = new PythonAdmission({ limit, stepLimit: stepLimit > 0 ? stepLimit : undefined })
+
+    getRuntimeMetrics().collect('python-admission', (metrics) => {
+      Object.entries(admission.getMetrics()).forEach(([step, { running, waiting }]) => {
+        metrics.set('motia_python_admission_executions', { step, state: 'running' }, running)
+        metrics.set('motia_python_admission_executions', { step, state: 'waiting' }, waiting)
+      })
+    })
+    pythonAdmission = admission
+  }
+
+  return pythonAdmission
+}
@@ -0,0 +1,236 @@
+import { getLanguageBasedRunner } from '../language-runner'
+import { globalLogger, type Logger } from '../logger'
+import { getRuntimeMetrics } from '../observability/runtime-metrics'
+import { ProcessManager } from './process-manager'
+
+export type WorkerRecycleReason = 'max_invocations' | 'max_rss' | 'timeout' | 'exited'
+
+/**
+ * Sent by the worker after each invocation, before the close message
+ */
+export type PythonWorkerStatus = {
+  invocations: number
+  maxRssMb: number | null
+  leakedTasks: string[]
+  recycle?: 'max_invocations' | 'max_rss'
+}
+
+export type PythonWorkerMetrics = {
+  workers: number
+  busyWorkers: number
+  invocations: number
+  leakedTasks: number
+  recycled: Record<WorkerRecycleReason, number>
+}
+
+export type PythonWorkerPoolOptions = {
+  size: number
+  maxInvocations: number
+  maxRssMb: number
+  projectRoot: string
+  logger?: Logger
+}
+
+export class PythonWorker {
+  status?: PythonWorkerStatus
+  // logger of the current invocation, used for the output of the process
+  logger: Logger = globalLogger
+  onExit?: (code: number | null) => void
+
+  constructor(readonly processManager: ProcessManager) {}
+
+  invoke(filePath: string, args: string): void {
+    this.status = undefined
+    this.processManager.send({ type: 'invoke', filePath, args })
+  }
+}
+
+/**
+ * Long-running python-runner.py processes reused across invocations, each one runs a single handler at a time.
+ *
+ * Workers report their status after each invocation and are drained and replaced once they handled
+ * maxInvocations or their RSS crossed maxRssMb. Workers killed after a timeout or exiting on their own are
+ * replaced as well.
+ */
+export class PythonWorkerPool {
+  private readonly logger: Logger
+  private workers = new Set<PythonWorker>()
+  private idle: PythonWorker[] = []
+  private waiters: Array<(worker: PythonWorker) => void> = []
+  private spawning = 0
+  private invocations = 0
+  private leakedTasks = 0
+  private recycled: Record<WorkerRecycleReason, number> = { max_invocations: 0, max_rss: 0, timeout: 0, exited: 0 }
+
+  constructor(private readonly options: PythonWorkerPoolOptions) {
+    this.logger = options.logger ?? globalLogger
+  }
+
+  async acquire(): Promise<PythonWorker> {
+    const worker = this.idle.pop()
+
+    if (worker) {
+      return worker
+    }
+
+    if (this.workers.size + this.spawning < this.options.size) {
+      return this.spawnWorker()
+    }
+
+    return new Promise((resolve) => this.waiters.push(resolve))
+  }
+
+  /**
+   * Hands the worker to the next invocation, unless it asked to be recycled
+   */
+  release(worker: PythonWorker): void {
+    const { status } = worker
+    this.invocations++
+
+    if (status?.leakedTasks.length) {
+      this.leakedTasks += status.leakedTasks.length
+      this.logger.warn('[Python worker] Handler returned with pending asyncio tasks, they were cancelled', {
+        tasks: status.leakedTasks,
+      })
+    }
+
+    if (status?.recycle) {
+      this.recycle(worker, status.recycle)
+    } else if (this.workers.has(worker)) {
+      this.handOff(worker)
+    }
+  }
+
+  /**
+   * Kills a worker that didn't finish its invocation in time
+   */
+  discard(worker: PythonWorker): void {
+    this.recycle(worker, 'timeout')
+  }
+
+  getMetrics(): PythonWorkerMetrics {
+    return {
+      workers: this.workers.size,
+      busyWorkers: this.workers.size - this.idle.length,
+      invocations: this.invocations,
+      leakedTasks: this.leakedTasks,
+      recycled: { ...this.recycled },
+    }
+  }
+
+  shutdown(): void {
+    this.workers.forEach((worker) => worker.processManager.send({ type: 'shutdown' }))
+    this.workers.clear()
+    this.idle = []
+  }
+
+  private handOff(worker: PythonWorker): void {
+    const waiter = this.waiters.shift()
+
+    if (waiter) {
+      waiter(worker)
+    } else {
+      this.idle.push(worker)
+    }
+  }
+
+  private recycle(worker: PythonWorker, reason: WorkerRecycleReason): void {
+    if (!this.workers.delete(worker)) {
+      return
+    }
+
+    this.idle = this.idle.filter((idle) => idle !== worker)
+    this.recycled[reason]++
+    this.logger.debug('[Python worker] Recycling worker', { reason, status: worker.status })
+
+    if (reason === 'max_invocations' || reason === 'max_rss') {
+      // the worker is idle, it exits as soon as it reads the message
+      worker.processManager.send({ type: 'shutdown' })
+    } else if (reason === 'timeout') {
+      worker.processManager.kill()
+    }
+
+    this.spawnWorker()
+      .then((replacement) => this.handOff(replacement))
+      .catch((error) => this.logger.error('[Python worker] Failed to replace worker', { error: error.message }))
+  }
+
+  private async spawnWorker(): Promise<PythonWorker> {
+    const { runner, command, args } = getLanguageBasedRunner('python-runner.py')
+    const { maxInvocations, maxRssMb, projectRoot } = this.options
+    const processManager = new ProcessManager({
+      command,
+      args: [...args, runner, '--worker', JSON.stringify({ maxInvocations, maxRssMb })],
+      logger: this.logger,
+      context: 'PythonWorker',
+      projectRoot,
+    })
+
+    this.spawning++
+
+    try {
+      await processManager.spawn()
+    } finally {
+      this.spawning--
+    }
+
+    const worker = new PythonWorker(processManager)
+
+    processManager.handler<PythonWorkerStatus, void>('worker_status', async (status) => {
+      worker.status = status
+    })
+    processManager.onStdout((data) => worker.logger.info(Buffer.from(data).toString()))
+    processManager.onStderr((data) => worker.logger.error(Buffer.from(data).toString()))
+    processManager.onProcessClose((code) => {
+      processManager.close()
+
+      if (this.workers.has(worker)) {
+        this.recycle(worker, 'exited')
+      }
+
+      worker.onExit?.(code)
+    })
+
+    this.workers.add(worker)
+
+    return worker
+  }
+}
+
+let pythonWorkerPool: PythonWorkerPool | undefined
+
+/**
+ * Python steps run in reused workers when MOTIA_PYTHON_WORKERS is set to the size of the pool,
+ * otherwise each invocation starts its own python-runner.py process.
+ */
+export const getPythonWorkerPool = (projectRoot: string): PythonWorkerPool | undefined => {
+  const size = Number(process.env.MOTIA_PYTHON_WORKERS ?? 0)
+
+  if (!pythonWorkerPool && size > 0) {
+    const pool = new PythonWorkerPool({
+      size,
+      maxInvocations: Number(process.env.MOTIA_PYTHON_WORKER_MAX_INVOCATIONS ?? 1000),
+      maxRssMb: Number(process.env.MOTIA_PYTHON_WORKER_MAX_RSS_MB ?? 1024),
+      projectRoot,
+    })
+
+    getRuntimeMetrics().collect('python-worker-pool', (metrics) => {
+      const { workers, busyWorkers, recycled } = pool.getMetrics()
+
+      metrics.set('motia_python_workers', { state: 'busy' }, busyWorkers)
+      metrics.set('motia_python_workers', { state: 'idle' }, workers - busyWorkers)
+      Object.entries(recycled).forEach(([reason, count]) => {
+        metrics.set('motia_python_worker_recycles_total', { reason }, count)
+      })
+    })
+    pythonWorkerPool = pool
+  }
+
+  return pythonWorkerPool
+}
+
+export const shutdownPythonWorkerPool = (): void => {
+  pythonWorkerPool?.shutdown()
+  pythonWorkerPool = undefined
+  getRuntimeMetrics().collect('python-worker-pool')
+}
@@ -1,3 +1,5 @@
+import type { RpcRecorder } from './rpc-recording'
+
 export type RpcHandler<TInput, TOutput> = (input: TInput) => Promise<TOutput>
 export type MessageCallback<T = unknown> = (message: T) => void
 
@@ -5,6 +7,8 @@ export interface RpcProcessorInterface {
   handler<TInput, TOutput = unknown>(method: string, handler: RpcHandler<TInput, TOutput>): void
   handle(method: string, input: unknown): Promise<unknown>
   onMessage<T = unknown>(callback: MessageCallback<T>): void
+  // records the requests and responses from now on, until it's called again
+  record(recorder?: RpcRecorder): void
   init(): Promise<void>
   close(): void
 }
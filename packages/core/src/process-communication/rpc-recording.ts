@@ -0,0 +1,131 @@
+import fs from 'fs'
+import path from 'path'
+import { promisify } from 'util'
+import zlib from 'zlib'
+import type { Logger } from '../logger'
+
+const gzip = promisify(zlib.gzip)
+const gunzip = promisify(zlib.gunzip)
+
+export const RPC_RECORDING_VERSION = 1
+
+export type RpcRecordedRequest = {
+  // ms since the invocation started
+  t: number
+  type: 'request'
+  id?: string
+  method: string
+  args: unknown
+}
+
+export type RpcRecordedResponse = {
+  t: number
+  type: 'response'
+  id: string
+  result?: unknown
+  error?: string
+}
+
+export type RpcRecordedMessage = RpcRecordedRequest | RpcRecordedResponse
+
+export type RpcRecording = {
+  version: number
+  step: string
+  // relative to the project root, so recordings can be replayed from another checkout
+  filePath: string
+  traceId: string
+  // payload the runner was invoked with
+  input: string
+  startedAt: number
+  duration: number
+  messages: RpcRecordedMessage[]
+}
+
+export type RpcRecorderOptions = {
+  step: string
+  filePath: string
+  traceId: string
+  input: string
+}
+
+const toJson = (value: unknown): unknown => (value === undefined ? undefined : JSON.parse(JSON.stringify(value)))
+
+/**
+ * Records the RPC traffic of an invocation: the requests of the runner and the responses of the host, with the
+ * time they happened at
+ */
+export class RpcRecorder {
+  private readonly startedAt = Date.now()
+  private readonly start = performance.now()
+  private readonly messages: RpcRecordedMessage[] = []
+
+  constructor(private readonly options: RpcRecorderOptions) {}
+
+  request(id: string | undefined, method: string, args: unknown): void {
+    // copied as they are now, handlers can change the objects they get
+    this.messages.push({ t: this.now(), type: 'request', id, method, args: toJson(args) })
+  }
+
+  response(id: string, result: unknown, error: unknown): void {
+    if (error) {
+      this.messages.push({ t: this.now(), type: 'response', id, error: String(error) })
+    } else {
+      this.messages.push({ t: this.now(), type: 'response', id, result: toJson(result) })
+    }
+  }
+
+  toRecording(): RpcRecording {
+    return {
+      version: RPC_RECORDING_VERSION,
+      ...this.options,
+      startedAt: this.startedAt,
+      duration: this.now(),
+      messages: this.messages,
+    }
+  }
+
+  async save(dir: string, logger?: Logger): Promise<string | undefined> {
+    const { step, traceId } = this.options
+    const fileName = `${step.replace(/[^\w.-]+/g, '_')}-${this.startedAt}-${traceId.slice(0, 8)}.rpc.json.gz`
+    const file = path.join(dir, fileName)
+
+    try {
+      await fs.promises.mkdir(dir, { recursive: true })
+      await fs.promises.writeFile(file, await gzip(JSON.stringify(this.toRecording())))
+      return file
+    } catch (error) {
+      logger?.warn('Failed to save the RPC recording', { step, file, error: String(error) })
+      return undefined
+    }
+  }
+
+  private now(): number {
+    return Math.round((performance.now() - this.start) * 1000) / 1000
+  }
+}
+
+export const readRpcRecording = async (file: string): Promise<RpcRecording> => {
+  const content = await fs.promises.readFile(file)
+  const recording = JSON.parse((file.endsWith('.gz') ? await gunzip(content) : content).toString()) as RpcRecording
+
+  if (recording.version !== RPC_RECORDING_VERSION) {
+    throw new Error(`Unsupported RPC recording version ${recording.version} in ${file}`)
+  }
+
+  return recording
+}
+
+/**
+ * Python invocations are recorded to MOTIA_PYTHON_RECORD (a directory) when it's set, MOTIA_PYTHON_RECORD_SAMPLE
+ * (0 to 1, 1 by default) records only part of them
+ */
+export const getRpcRecordingDir = (): string | undefined => {
+  const dir = process.env.MOTIA_PYTHON_RECORD
+  const sample = Number(process.env.MOTIA_PYTHON_RECORD_SAMPLE ?? 1)
+
+  if (!dir || Math.random() >= sample) {
+    return undefined
+  }
+
+  return path.resolve(dir)
+}
@@ -0,0 +1,155 @@
+import path from 'path'
+import { setTimeout as sleep } from 'timers/promises'
+import { isDeepStrictEqual } from 'util'
+import { getLanguageBasedRunner } from '../language-runner'
+import type { Logger } from '../logger'
+import { ProcessManager } from './process-manager'
+import {
+  type RpcRecordedMessage,
+  type RpcRecordedRequest,
+  type RpcRecordedResponse,
+  RpcRecorder,
+  type RpcRecording,
+} from './rpc-recording'
+
+// carry timings, they're left out of the outputs compared between the recording and the replay
+const TIMING_METHODS = new Set(['log', 'spans', 'cpu', 'metrics'])
+
+export type RpcReplayOptions = {
+  // project root the step file path of the recording is relative to
+  baseDir: string
+  logger: Logger
+  // answers each request after the time the host took in the recording, on by default
+  realTiming?: boolean
+}
+
+export type RpcReplayOutput = {
+  method: string
+  args: unknown
+}
+
+export type RpcReplayDifference = {
+  index: number
+  recorded?: RpcReplayOutput
+  replayed?: RpcReplayOutput
+}
+
+export type RpcReplayReport = {
+  step: string
+  recorded: { duration: number; requests: number }
+  replayed: { duration: number; requests: number }
+  // when each output was sent, ms since the invocation started
+  timeline: { method: string; recorded?: number; replayed?: number }[]
+  differences: RpcReplayDifference[]
+}
+
+const isRequest = (message: RpcRecordedMessage): message is RpcRecordedRequest => message.type === 'request'
+
+const isResponse = (message: RpcRecordedMessage): message is RpcRecordedResponse => message.type === 'response'
+
+// the requests that make the result of the step: emits, state and stream calls, the result and the close error
+const getOutputs = (messages: RpcRecordedMessage[]) =>
+  messages.filter((message): message is RpcRecordedRequest => isRequest(message) && !TIMING_METHODS.has(message.method))
+
+const compareOutputs = (recorded: RpcRecordedRequest[], replayed: RpcRecordedRequest[]): RpcReplayDifference[] => {
+  const differences: RpcReplayDifference[] = []
+
+  for (let index = 0; index < Math.max(recorded.length, replayed.length); index++) {
+    const before = recorded[index]
+    const after = replayed[index]
+
+    if (!before || !after || before.method !== after.method || !isDeepStrictEqual(before.args, after.args)) {
+      differences.push({
+        index,
+        recorded: before && { method: before.method, args: before.args },
+        replayed: after && { method: after.method, args: after.args },
+      })
+    }
+  }
+
+  return differences
+}
+
+/**
+ * Runs the step of a recording again with the recorded responses instead of the adapters, and compares what
+ * it sends and how long it takes with the recording
+ */
+export const replayRpcRecording = async (
+  recording: RpcRecording,
+  options: RpcReplayOptions,
+): Promise<RpcReplayReport> => {
+  const { baseDir, logger, realTiming = true } = options
+  const filePath = path.resolve(baseDir, recording.filePath)
+  const { runner, command, args } = getLanguageBasedRunner(filePath)
+  const responses = new Map(recording.messages.filter(isResponse).map((response) => [response.id, response]))
+  const requests = new Map<string, RpcRecordedRequest[]>()
+
+  recording.messages.filter(isRequest).forEach((request) => {
+    requests.set(request.method, [...(requests.get(request.method) ?? []), request])
+  })
+
+  const input = JSON.parse(recording.input)
+  if (input.deadline) {
+    // the deadline is kept as far from the start as it was
+    input.deadline = Date.now() + (input.deadline - recording.startedAt)
+  }
+
+  const { step, traceId } = recording
+  const recorder = new RpcRecorder({ step, traceId, filePath: recording.filePath, input: recording.input })
+  const processManager = new ProcessManager({
+    command,
+    args: [...args, runner, filePath, JSON.stringify(input)],
+    logger,
+    context: 'StepReplay',
+    projectRoot: baseDir,
+  })
+
+  await processManager.spawn()
+  processManager.record(recorder)
+  processManager.handler<unknown>('log', async (input) => logger.log(input))
+
+  requests.forEach((recorded, method) => {
+    if (method === 'log' || method === 'close') return
+
+    processManager.handler<unknown>(method, async () => {
+      const request = recorded.shift()
+      const response = request?.id ? responses.get(request.id) : undefined
+
+      // requests the runner doesn't wait for, or that the host didn't answer before the recording ended
+      if (!request || !response) {
+        return undefined
+      }
+      if (realTiming) {
+        await sleep(response.t - request.t)
+      }
+      if (response.error !== undefined) {
+        throw response.error
+      }
+      return response.result
+    })
+  })
+
+  await new Promise<void>((resolve, reject) => {
+    // the runner is ended by the host once it sent its close message, as in callStepFile
+    processManager.handler<unknown>('close', async () => processManager.kill())
+    processManager.onProcessClose(() => resolve())
+    processManager.onProcessError(reject)
+  })
+  processManager.close()
+
+  const replayed = recorder.toRecording()
+  const recordedOutputs = getOutputs(recording.messages)
+  const replayedOutputs = getOutputs(replayed.messages)
+
+  return {
+    step,
+    recorded: { duration: recording.duration, requests: recording.messages.filter(isRequest).length },
+    replayed: { duration: replayed.duration, requests: replayed.messages.filter(isRequest).length },
+    timeline: Array.from({ length: Math.max(recordedOutputs.length, replayedOutputs.length) }, (_, index) => ({
+      method: (recordedOutputs[index] ?? replayedOutputs[index]).method,
+      recorded: recordedOutputs[index]?.t,
+      replayed: replayedOutputs[index]?.t,
+    })),
+    differences: compareOutputs(recordedOutputs, replayedOutputs),
+  }
+}
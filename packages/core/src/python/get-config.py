@@ -4,6 +4,7 @@ import importlib.util
 import os
 import platform
 from pathlib import Path
+from motia_static_config import read_static_config
 
 def sendMessage(text):
     'sends a Node IPC message to parent proccess'
@@ -20,6 +21,31 @@ def sendMessage(text):
         NODEIPCFD = int(os.environ["NODE_CHANNEL_FD"])
         os.write(NODEIPCFD, bytesMessage)
 
+def to_json_schema(value):
+    'pydantic model classes can be declared as schemas, the host gets their JSON schema'
+    if isinstance(value, type) and hasattr(value, 'model_json_schema'):
+        return value.model_json_schema()
+    return value
+
+def prepare_config(config):
+    if 'middleware' in config:
+        del config['middleware']
+
+    if 'canAccess' in config:
+        del config['canAccess']
+        config['__motia_hasCanAccess'] = True
+
+    for key in ('input', 'bodySchema'):
+        if key in config:
+            config[key] = to_json_schema(config[key])
+
+    if isinstance(config.get('responseSchema'), dict):
+        config['responseSchema'] = {
+            status: to_json_schema(schema) for status, schema in config['responseSchema'].items()
+        }
+
+    return config
+
 async def run_python_module(file_path: str) -> None:
     try:
         path = Path(file_path).resolve()
@@ -27,6 +53,12 @@ async def run_python_module(file_path: str) -> None:
         if steps_dir is None:
             raise RuntimeError("Could not find 'src' or 'steps' directory in path")
 
+        # literal configs are read from the source, importing the module (and everything it imports) is the slow path
+        config, reason = read_static_config(file_path)
+        if config is not None:
+            sendMessage(prepare_config(config))
+            return
+
         project_root = steps_dir.parent
         project_parent = project_root.parent
         if str(project_parent) not in sys.path:
@@ -48,14 +80,10 @@ async def run_python_module(file_path: str) -> None:
         if not hasattr(module, 'config'):
             raise AttributeError(f"No 'config' found in module {file_path}")
 
-        if 'middleware' in module.config:
-            del module.config['middleware']
-        
-        if 'canAccess' in module.config:
-            del module.config['canAccess']
-            module.config['__motia_hasCanAccess'] = True
-
-        sendMessage(module.config)
+        config = prepare_config(module.config)
+        # the host reports why the module had to be imported
+        config['__motia_configImportReason'] = reason
+        sendMessage(config)
 
     except Exception as error:
         print('Error running Python module:', str(error), file=sys.stderr)
@@ -0,0 +1,46 @@
+import traceback
+from typing import Any, Dict, List
+from motia_payload import InputValidationError, prepare_input
+
+def is_batch_step(config: Dict[str, Any]) -> bool:
+    return config.get('type') == 'event' and bool(config.get('batch'))
+
+def error_to_dict(error: BaseException) -> Dict[str, Any]:
+    if isinstance(error, InputValidationError):
+        return error.to_dict()
+    return {
+        'message': str(error),
+        'stack': ''.join(traceback.format_exception(type(error), error, error.__traceback__)),
+    }
+
+class Batch:
+    """Inputs of the events of a batch step, given to the handler as a list.
+
+    Inputs that fail validation are left out of the list and reported as failed, the host retries each
+    failed event on its own. The handler returns None when every input succeeded, or a list with a result
+    for each input it got, where an exception marks the input as failed.
+    """
+
+    def __init__(self, config: Dict[str, Any], file_path: str, items: List[Any]):
+        self.inputs: List[Any] = []
+        # position in the batch of each input given to the handler
+        self.positions: List[int] = []
+        self.failed: Dict[int, Dict[str, Any]] = {}
+
+        for position, item in enumerate(items):
+            try:
+                self.inputs.append(prepare_input(config, file_path, item))
+                self.positions.append(position)
+            except InputValidationError as error:
+                self.failed[position] = error.to_dict()
+
+    def outcome(self, result: Any) -> Dict[str, Any]:
+        if isinstance(result, (list, tuple)):
+            if len(result) != len(self.positions):
+                raise ValueError(f"Batch handler returned {len(result)} results for {len(self.positions)} inputs")
+
+            for position, item in zip(self.positions, result):
+                if isinstance(item, BaseException):
+                    self.failed[position] = error_to_dict(item)
+
+        return {'failed': {str(position): error for position, error in self.failed.items()}}
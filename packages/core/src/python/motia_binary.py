@@ -0,0 +1,84 @@
+import base64
+import json
+import os
+import struct
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# set by the host when it opened a pipe for the binary frames
+BINARY_FD_ENV = 'MOTIA_BINARY_FD'
+
+# frame id and byte length, followed by the bytes
+FRAME_HEADER = struct.Struct('>II')
+
+def get_binary_fd() -> Optional[int]:
+    value = os.environ.get(BINARY_FD_ENV)
+    return int(value) if value else None
+
+def as_binary(obj: Any) -> Optional[Tuple[memoryview, Dict[str, Any]]]:
+    """Bytes of a bytes-like value or a NumPy array, with the dtype and shape of arrays"""
+    if isinstance(obj, (bytes, bytearray)):
+        return memoryview(obj), {}
+
+    if isinstance(obj, memoryview):
+        # the frame is sent as is when possible, strided views are copied once
+        return (obj.cast('B') if obj.c_contiguous else memoryview(obj.tobytes())), {}
+
+    if type(obj).__name__ == 'ndarray' and type(obj).__module__ == 'numpy':
+        if obj.dtype.hasobject:
+            return None
+        data = obj if obj.flags.c_contiguous else obj.copy(order='C')
+        return memoryview(data).cast('B'), {'dtype': obj.dtype.str, 'shape': list(obj.shape)}
+
+    return None
+
+def write_all(fd: int, data: memoryview) -> None:
+    while data:
+        written = os.write(fd, data)
+        data = data[written:]
+
+class BinaryEncoder:
+    """Encodes the messages sent to the host.
+
+    Bytes-like values and NumPy arrays found in the message are replaced by {"$binary": frame, "dtype",
+    "shape"} and their bytes are written as raw frames to the binary pipe before the message, instead of
+    being JSON encoded. Without the pipe (RPC over stdin) they are embedded as base64. Messages announce the
+    frames they reference, so the host only looks for binary values in those.
+    """
+
+    def __init__(self, serialize: Callable[[Any], Any], fd: Optional[int] = None):
+        self.serialize = serialize
+        self.fd = fd
+        self.next_frame = 0
+
+    def encode(self, request: Dict[str, Any]) -> str:
+        frames: List[Tuple[int, memoryview]] = []
+        inline = False
+
+        def default(obj: Any) -> Any:
+            nonlocal inline
+            binary = as_binary(obj)
+            if binary is None:
+                return self.serialize(obj)
+
+            data, metadata = binary
+            if self.fd is None:
+                inline = True
+                return {'$binary': base64.b64encode(data).decode('ascii'), **metadata}
+
+            frame = self.next_frame
+            self.next_frame = (self.next_frame + 1) % 0xFFFFFFFF
+            frames.append((frame, data))
+            return {'$binary': frame, **metadata}
+
+        message = json.dumps(request, default=default)
+
+        if frames:
+            for frame, data in frames:
+                write_all(self.fd, memoryview(FRAME_HEADER.pack(frame, data.nbytes)))
+                write_all(self.fd, data)
+            return message[:-1] + ', "frames": ' + json.dumps([frame for frame, _ in frames]) + '}'
+
+        if inline:
+            return message[:-1] + ', "binary": true}'
+
+        return message
@@ -1,8 +1,12 @@
-from typing import Any, List, Optional
+import time
+from typing import Any, Callable, Iterable, List, Optional
+from motia_cpu_pool import get_cpu_pool
 from motia_type_definitions import HandlerResult
 from motia_rpc import RpcSender
 from motia_rpc_state_manager import RpcStateManager
 from motia_logger import Logger
+from motia_response import ResponseWriter
+from motia_tracing import SpanTracer, tracing_enabled
 from motia_dot_dict import DotDict
 
 class Context:
@@ -12,6 +16,8 @@ class Context:
         flows: List[str],
         rpc: RpcSender,
         streams: DotDict,
+        tracing: Optional[bool] = None,
+        resources: Any = None,
     ):
         self.trace_id = trace_id
         self.flows = flows
@@ -19,6 +25,41 @@ class Context:
         self.state = RpcStateManager(rpc)
         self.streams = streams
         self.logger = Logger(self.trace_id, self.flows, rpc)
+        self.response = ResponseWriter(rpc)
+        # returned by the setup hook of the step module
+        self.resources = resources
+        self.tracer = SpanTracer(trace_id, rpc, tracing_enabled() if tracing is None else tracing)
 
     async def emit(self, event: Any) -> Optional[HandlerResult]:
-        return await self.rpc.send('emit', event)
\ No newline at end of file
+        return await self.rpc.send('emit', event)
+
+    async def emit_many(self, events: List[Any]) -> None:
+        """Emits the events in a single message, the host checks each topic once and enqueues them together"""
+        if events:
+            await self.rpc.send('emitMany', list(events))
+
+    async def run_cpu(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Runs fn(*args) in the process pool of the runner, without blocking the event loop"""
+        start = time.time()
+        try:
+            return await get_cpu_pool().run(fn, *args)
+        finally:
+            self._trace_cpu('run', fn, start, tasks=1)
+
+    async def map_cpu(self, fn: Callable[[Any], Any], iterable: Iterable[Any], chunksize: int = 1) -> List[Any]:
+        """Runs fn on each item in the process pool of the runner, results keep the order of the items"""
+        items = list(iterable)
+        start = time.time()
+        try:
+            return await get_cpu_pool().map(fn, items, chunksize)
+        finally:
+            self._trace_cpu('map', fn, start, tasks=len(items), chunksize=chunksize)
+
+    def _trace_cpu(self, operation: str, fn: Callable[..., Any], start: float, **details: Any) -> None:
+        self.rpc.send_no_wait('cpu', {
+            'traceId': self.trace_id,
+            'operation': operation,
+            'function': getattr(fn, '__qualname__', repr(fn)),
+            'duration': round((time.time() - start) * 1000, 3),
+            **details,
+        })
@@ -0,0 +1,128 @@
+import asyncio
+import importlib
+import importlib.util
+import multiprocessing
+import os
+import sys
+import types
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional
+
+def _default_start_method() -> str:
+    # forking the runner would copy the thread blocked on the RPC channel, forkserver forks a clean process
+    return 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+def _load_function(module_name: str, file_path: str, qualname: str) -> Callable[..., Any]:
+    module = sys.modules.get(module_name)
+
+    if module is None:
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            # same as python-runner.py, step modules are loaded from their file
+            spec = importlib.util.spec_from_file_location(module_name, file_path)
+            if spec is None or spec.loader is None:
+                raise
+            module = importlib.util.module_from_spec(spec)
+            module.__package__ = module_name.rpartition('.')[0]
+            sys.modules[module_name] = module
+            spec.loader.exec_module(module)
+
+    fn: Any = module
+    for name in qualname.split('.'):
+        fn = getattr(fn, name)
+    return fn
+
+class _FileFunction:
+    """Pickles a function with the file of its module.
+
+    Functions are pickled by module name, the name of a step module comes from its path in the project and
+    is not always importable (e.g. project directories with dashes), so processes of the pool load the
+    module from its file instead.
+    """
+
+    def __init__(self, fn: Callable[..., Any], file_path: str):
+        self.fn = fn
+        self.file_path = file_path
+
+    def __reduce__(self) -> Any:
+        return (_load_function, (self.fn.__module__, self.file_path, self.fn.__qualname__))
+
+    def __call__(self, *args: Any) -> Any:
+        return self.fn(*args)
+
+def _picklable(fn: Callable[..., Any]) -> Callable[..., Any]:
+    module = sys.modules.get(getattr(fn, '__module__', None) or '')
+    file_path = getattr(module, '__file__', None)
+
+    if isinstance(fn, types.FunctionType) and file_path and '<locals>' not in fn.__qualname__:
+        return _FileFunction(fn, file_path)
+    return fn
+
+def _run_chunk(fn: Callable[[Any], Any], chunk: List[Any]) -> List[Any]:
+    return [fn(item) for item in chunk]
+
+class CpuPool:
+    """Process pool running the CPU-bound work of the handlers, owned by the runner.
+
+    The pool is started by the first call and outlives the invocation, so a reused worker starts its
+    processes once. Functions and arguments are pickled: functions must be defined at module level in the
+    step or in an importable module.
+    """
+
+    def __init__(self, size: Optional[int] = None, start_method: Optional[str] = None):
+        self.size = size or os.cpu_count() or 1
+        self.start_method = start_method or _default_start_method()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            context = multiprocessing.get_context(self.start_method)
+            self._executor = ProcessPoolExecutor(max_workers=self.size, mp_context=context)
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, _picklable(fn), *args)
+
+    async def map(self, fn: Callable[[Any], Any], iterable: Iterable[Any], chunksize: int = 1) -> List[Any]:
+        """Like Executor.map, items are sent to the pool in chunks of chunksize and results keep their order"""
+        if chunksize < 1:
+            raise ValueError("chunksize must be >= 1.")
+
+        items = list(iterable)
+        fn = _picklable(fn)
+        loop = asyncio.get_running_loop()
+        chunks = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+        results = await asyncio.gather(
+            *(loop.run_in_executor(self.executor, _run_chunk, fn, chunk) for chunk in chunks)
+        )
+
+        return [result for chunk in results for result in chunk]
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+_cpu_pool: Optional[CpuPool] = None
+
+def get_cpu_pool() -> CpuPool:
+    """The pool of the runner, sized by MOTIA_PYTHON_CPU_WORKERS (number of CPUs by default).
+
+    MOTIA_PYTHON_CPU_START_METHOD selects fork, forkserver or spawn.
+    """
+    global _cpu_pool
+
+    if _cpu_pool is None:
+        size = os.environ.get('MOTIA_PYTHON_CPU_WORKERS')
+        _cpu_pool = CpuPool(int(size) if size else None, os.environ.get('MOTIA_PYTHON_CPU_START_METHOD') or None)
+
+    return _cpu_pool
+
+def shutdown_cpu_pool() -> None:
+    global _cpu_pool
+
+    if _cpu_pool is not None:
+        _cpu_pool.shutdown()
+        _cpu_pool = None
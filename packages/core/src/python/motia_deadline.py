@@ -0,0 +1,55 @@
+import asyncio
+import time
+import traceback
+from typing import Any, Awaitable, Dict
+
+HANDLER_TIMEOUT_CODE = 'HANDLER_TIMEOUT'
+
+class HandlerTimeoutError(Exception):
+    """Raised when the handler is still running at its deadline, after it was cancelled"""
+
+    def __init__(self, timeout: float, cancelled_at: str = ''):
+        super().__init__(f"Step execution timed out after {timeout:g} seconds")
+        self.timeout = timeout
+        self.cancelled_at = cancelled_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'message': str(self),
+            'code': HANDLER_TIMEOUT_CODE,
+            'timeout': self.timeout,
+            'stack': self.cancelled_at,
+        }
+
+def _cancelled_at(error: BaseException) -> str:
+    """Where the handler was awaiting when it got cancelled, taken from the CancelledError"""
+    cancelled = error.__context__ or error.__cause__
+    if cancelled is None:
+        return ''
+    return ''.join(traceback.format_tb(cancelled.__traceback__))
+
+async def run_with_deadline(awaitable: Awaitable[Any], deadline: float, timeout: float) -> Any:
+    """Runs the awaitable until the deadline (epoch seconds).
+
+    The task is cancelled at the deadline, so `finally` blocks and context managers in the handler and
+    middlewares still run, then HandlerTimeoutError is raised. A TimeoutError raised by the handler
+    itself before the deadline is not converted.
+    """
+    remaining = max(0.0, deadline - time.time())
+
+    if hasattr(asyncio, 'timeout'):  # Python 3.11+
+        scope = asyncio.timeout(remaining)
+        try:
+            async with scope:
+                return await awaitable
+        except TimeoutError as error:
+            if scope.expired():
+                raise HandlerTimeoutError(timeout, _cancelled_at(error)) from None
+            raise
+
+    try:
+        return await asyncio.wait_for(awaitable, remaining)
+    except asyncio.TimeoutError as error:
+        if time.time() >= deadline:
+            raise HandlerTimeoutError(timeout, _cancelled_at(error)) from None
+        raise
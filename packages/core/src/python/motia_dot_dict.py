@@ -1,11 +1,25 @@
 class DotDict(dict):
+    """Attribute access to the keys of a dict.
+
+    Nested dicts are wrapped on first access and the view replaces them in the parent, so they are only
+    wrapped once and changes made through the view are seen by the parent. No instance `__dict__` is
+    allocated, views are as light as the dicts they wrap.
+    """
+
+    __slots__ = ()
+
     def __getattr__(self, key):
         try:
             value = self[key]
-            return DotDict(value) if isinstance(value, dict) else value
         except KeyError:
             raise AttributeError(f"No such attribute: {key}")
 
+        if type(value) is dict:
+            value = DotDict(value)
+            dict.__setitem__(self, key, value)
+
+        return value
+
     def __setattr__(self, key, value):
         self[key] = value
 
@@ -13,4 +27,4 @@ class DotDict(dict):
         try:
             del self[key]
         except KeyError:
-            raise AttributeError(f"No such attribute: {key}")
\ No newline at end of file
+            raise AttributeError(f"No such attribute: {key}")
@@ -0,0 +1,21 @@
+import asyncio
+import os
+
+def uvloop_enabled() -> bool:
+    return os.environ.get('MOTIA_PYTHON_UVLOOP', '').lower() in ('1', 'true')
+
+def create_event_loop() -> asyncio.AbstractEventLoop:
+    """Creates the event loop of the runner.
+
+    Projects opt in to uvloop with MOTIA_PYTHON_UVLOOP=true, it's used when installed in the project
+    environment and the runner silently falls back to the default asyncio loop otherwise.
+    """
+    if uvloop_enabled():
+        try:
+            import uvloop
+
+            return uvloop.new_event_loop()
+        except ImportError:
+            pass
+
+    return asyncio.new_event_loop()
@@ -0,0 +1,302 @@
+"""Embedded host for projects where every step of a flow is written in Python.
+
+The Node host runs each Python handler in its own process and serves emits, state and logs through JSON
+messages. This host imports the `*_step.py` files once and runs their event handlers in a single asyncio
+loop: events go through QueueEngine (same FIFO groups, retries and visibility timeouts as the Node
+QueueManager), state is kept in memory and `context.emit` / `context.state` are plain function calls.
+
+Handlers get the same Context, RpcStateManager and Logger as with python-runner.py, only the RpcSender is
+replaced by LocalRpc. API and cron steps, streams and the tracer are only available with the Node host.
+
+Usage: python motia_host.py <project-dir> [--emit topic='{"json": "data"}']... [--stdin] [--quiet]
+"""
+import argparse
+import asyncio
+import importlib.util
+import json
+import random
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from motia_batch import is_batch_step
+from motia_context import Context
+from motia_cpu_pool import shutdown_cpu_pool
+from motia_deadline import run_with_deadline
+from motia_dot_dict import DotDict
+from motia_event_loop import create_event_loop
+from motia_logger import Logger
+from motia_memory_state import MemoryStateStore
+from motia_middleware import compose_middleware
+from motia_payload import prepare_input
+from motia_queue_engine import QueueEngine, get_queue_config_with_defaults
+from motia_resources import StepResources
+from motia_rpc_communication import serialize_for_json
+
+LogSink = Callable[[Dict[str, Any]], None]
+
+TRACE_ID_CHARS = 'ABCDEFGHJKMNPQRSTUVWXYZ123456789'
+IGNORED_DIRS = {'__pycache__', 'node_modules', 'python_modules', '.motia', 'dist'}
+
+def generate_trace_id() -> str:
+    """Same format as generateTraceId in the Node host"""
+    random_part = ''.join(random.choice(TRACE_ID_CHARS) for _ in range(5))
+    return f"{random_part}-{str(int(time.time() * 1000))[6:]}"
+
+def print_log(entry: Dict[str, Any]) -> None:
+    print(json.dumps(entry, default=serialize_for_json), flush=True)
+
+def import_step_module(file_path: Path) -> Any:
+    """Imports a step file the same way python-runner.py does, so relative imports keep working"""
+    steps_dir = next((p for p in file_path.parents if p.name in ("src", "steps")), None)
+    if steps_dir is None:
+        raise RuntimeError("Could not find 'src' or 'steps' directory in path")
+
+    project_parent = steps_dir.parent.parent
+    if str(project_parent) not in sys.path:
+        sys.path.insert(0, str(project_parent))
+
+    module_name = ".".join(file_path.relative_to(project_parent).with_suffix("").parts)
+    package_name = module_name.rsplit(".", 1)[0] if "." in module_name else ""
+
+    spec = importlib.util.spec_from_file_location(module_name, str(file_path))
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Could not load module from {file_path}")
+
+    module = importlib.util.module_from_spec(spec)
+    module.__package__ = package_name
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+
+    return module
+
+class LocalRpc:
+    """Stands in for RpcSender: methods are dispatched to in-process handlers instead of being sent to Node"""
+
+    def __init__(self, handlers: Dict[str, Callable[[Any], Any]]):
+        self.handlers = handlers
+
+    def send_no_wait(self, method: str, args: Any) -> None:
+        handler = self.handlers.get(method)
+        if handler is not None:
+            result = handler(args)
+            if asyncio.iscoroutine(result):
+                asyncio.ensure_future(result)
+
+    async def send(self, method: str, args: Any) -> Any:
+        handler = self.handlers.get(method)
+        if handler is None:
+            raise Exception(f"Method {method} is not available in the embedded Python host")
+        return await handler(args)
+
+    async def init(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+class HostStep:
+    def __init__(self, file_path: Path, module: Any):
+        self.file_path = file_path
+        self.module = module
+        self.config: Dict[str, Any] = module.config
+        self.name: str = self.config.get('name') or file_path.stem
+        self.flows: List[str] = self.config.get('flows') or []
+        self.emits = {emit if isinstance(emit, str) else emit.get('topic') for emit in self.config.get('emits') or []}
+        self.middleware = compose_middleware(*self.config.get('middleware', []))
+        self.timeout: Optional[float] = ((self.config.get('infrastructure') or {}).get('handler') or {}).get('timeout')
+
+    def can_emit(self, topic: str) -> bool:
+        return not self.emits or topic in self.emits
+
+class PythonHost:
+    def __init__(self, project_dir: str, log: Optional[LogSink] = None):
+        self.project_dir = Path(project_dir).resolve()
+        self.log = log or print_log
+        self.state = MemoryStateStore()
+        self.state_handlers = self.state.rpc_handlers()
+        self.queue = QueueEngine(log=self._host_log)
+        self.steps: List[HostStep] = []
+        self.skipped: Dict[str, str] = {}
+        self.resources = StepResources()
+
+    def _host_log(self, level: str, msg: str, args: Optional[Dict[str, Any]] = None) -> None:
+        self.log({'level': level, 'time': int(time.time() * 1000), 'msg': msg, **(args or {})})
+
+    def discover(self) -> List[Path]:
+        files: List[Path] = []
+
+        for dir_name in ('steps', 'src'):
+            steps_dir = self.project_dir / dir_name
+            if steps_dir.is_dir():
+                files.extend(
+                    path for path in steps_dir.rglob('*_step.py')
+                    if not IGNORED_DIRS.intersection(path.relative_to(steps_dir).parts)
+                )
+
+        return sorted(files)
+
+    def load(self) -> List[HostStep]:
+        """Imports the step files and subscribes the event steps to their topics"""
+        for file_path in self.discover():
+            try:
+                module = import_step_module(file_path)
+            except Exception as error:
+                self.skipped[str(file_path)] = f"import failed: {error}"
+                continue
+
+            config = getattr(module, 'config', None)
+            if not isinstance(config, dict) or not hasattr(module, 'handler'):
+                self.skipped[str(file_path)] = 'no config or handler'
+                continue
+
+            if config.get('type') != 'event':
+                self.skipped[str(file_path)] = f"{config.get('type')} steps need the Node host"
+                continue
+
+            self.add_step(HostStep(file_path, module))
+
+        return self.steps
+
+    def add_step(self, step: HostStep) -> None:
+        queue_config = get_queue_config_with_defaults(step.config.get('infrastructure'))
+
+        async def handler(event: Dict[str, Any]) -> None:
+            await self._run_step(step, event)
+
+        for topic in step.config.get('subscribes') or []:
+            self.queue.subscribe(topic, handler, queue_config, step.name)
+
+        self.steps.append(step)
+
+    async def emit(self, event: Dict[str, Any], trace_id: Optional[str] = None, flows: Optional[List[str]] = None) -> str:
+        """Enqueues an event from outside of the flow, starting a new trace unless one is given"""
+        trace_id = trace_id or generate_trace_id()
+        await self._enqueue(event, trace_id, flows or [])
+        return trace_id
+
+    async def _enqueue(self, event: Dict[str, Any], trace_id: str, flows: List[str]) -> None:
+        # serialized once, each handler decodes its own copy as if it came through the RPC channel
+        payload = json.dumps(event.get('data'), default=serialize_for_json)
+        message_group_id = event.get('messageGroupId')
+        queued = {
+            'topic': event['topic'],
+            'payload': payload,
+            'traceId': trace_id,
+            'flows': flows,
+            'messageGroupId': message_group_id,
+        }
+        await self.queue.enqueue(event['topic'], queued, message_group_id)
+
+    def _rpc(self, step: HostStep, trace_id: str) -> LocalRpc:
+        log = self.log
+        name = step.name
+
+        def log_handler(entry: Dict[str, Any]) -> None:
+            entry['step'] = name
+            log(entry)
+
+        async def emit_handler(event: Dict[str, Any]) -> None:
+            topic = event.get('topic')
+            if not step.can_emit(topic):
+                self._host_log('warn', f"Step {name} is not allowed to emit {topic}", {'traceId': trace_id, 'step': name})
+                return None
+            await self._enqueue(event, trace_id, step.flows)
+
+        async def emit_many_handler(events: List[Dict[str, Any]]) -> None:
+            for event in events:
+                await emit_handler(event)
+
+        return LocalRpc({
+            **self.state_handlers,
+            'log': log_handler,
+            'emit': emit_handler,
+            'emitMany': emit_many_handler,
+        })
+
+    async def _run_step(self, step: HostStep, event: Dict[str, Any]) -> None:
+        trace_id = event['traceId']
+        rpc = self._rpc(step, trace_id)
+
+        async def handler_fn():
+            return await step.module.handler(data, context)
+
+        try:
+            resources = await self.resources.get(str(step.file_path), step.module, Logger(trace_id, step.flows, rpc))
+            # there is no tracer to send the spans of the handlers to
+            context = Context(trace_id, step.flows, rpc, DotDict(), tracing=False, resources=resources)
+            data = prepare_input(step.config, str(step.file_path), json.loads(event['payload']))
+            batch = is_batch_step(step.config)
+            if batch:
+                # events are given one at a time, as batches of one
+                data = [data]
+            if step.timeout:
+                deadline = time.time() + step.timeout
+                result = await run_with_deadline(step.middleware(data, context, handler_fn), deadline, step.timeout)
+            else:
+                result = await step.middleware(data, context, handler_fn)
+            if batch and isinstance(result, (list, tuple)) and result and isinstance(result[0], BaseException):
+                raise result[0]
+        except Exception as error:
+            self._host_log('error', str(error), {
+                'traceId': trace_id,
+                'step': step.name,
+                'stack': ''.join(traceback.format_exception(type(error), error, error.__traceback__)),
+            })
+            raise
+
+    async def run_until_idle(self) -> None:
+        await self.queue.drain()
+
+    async def close(self) -> None:
+        """Runs the teardown hooks of the step modules"""
+        await self.resources.teardown_all(Logger(None, [], LocalRpc({'log': self.log})))
+
+def parse_emit(value: str) -> Dict[str, Any]:
+    topic, _, data = value.partition('=')
+    return {'topic': topic, 'data': json.loads(data) if data else None}
+
+async def read_stdin_events(host: PythonHost) -> None:
+    """Enqueues one event per line of stdin, `{"topic": ..., "data": ..., "messageGroupId": ...}`"""
+    loop = asyncio.get_running_loop()
+
+    while True:
+        line = await loop.run_in_executor(None, sys.stdin.readline)
+        if not line:
+            break
+        if line.strip():
+            await host.emit(json.loads(line))
+
+async def main(args: argparse.Namespace) -> None:
+    host = PythonHost(args.project_dir, log=(lambda entry: None) if args.quiet else None)
+    steps = host.load()
+
+    print(f"Loaded {len(steps)} event steps from {host.project_dir}", file=sys.stderr)
+    for file_path, reason in host.skipped.items():
+        print(f"Skipped {file_path}: {reason}", file=sys.stderr)
+
+    start = time.perf_counter()
+
+    for value in args.emit:
+        await host.emit(parse_emit(value))
+
+    if args.stdin:
+        await read_stdin_events(host)
+
+    await host.run_until_idle()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    await host.close()
+    shutdown_cpu_pool()
+    print(json.dumps({'elapsedMs': round(elapsed_ms, 1), 'queues': host.queue.get_all_metrics()}), file=sys.stderr)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Runs the Python event steps of a project in a single process')
+    parser.add_argument('project_dir')
+    parser.add_argument('--emit', action='append', default=[], help="event to enqueue, topic='{\"json\": \"data\"}'")
+    parser.add_argument('--stdin', action='store_true', help='enqueue the JSON events read from stdin')
+    parser.add_argument('--quiet', action='store_true', help='discard the logs of the handlers')
+
+    loop = create_event_loop()
+    asyncio.set_event_loop(loop)
+    loop.run_until_complete(main(parser.parse_args()))
@@ -4,10 +4,13 @@ import json
 import sys
 import os
 from typing import Any, Dict, Optional, Callable
+from motia_binary import BinaryEncoder, get_binary_fd
 
 def serialize_for_json(obj: Any) -> Any:
     """Convert Python objects to JSON-serializable types"""
-    if hasattr(obj, '__dict__'):
+    if hasattr(obj, 'model_dump'):  # pydantic models, including typed inputs
+        return obj.model_dump(mode='json', by_alias=True)
+    elif hasattr(obj, '__dict__'):
         return obj.__dict__
     elif hasattr(obj, '_asdict'):
         return obj._asdict()
@@ -26,6 +29,7 @@ class IpcCommunication:
         self.pending_requests: Dict[str, asyncio.Future] = {}
         self.ipc_reader_task: Optional[asyncio.Task] = None
         self.message_handlers: Dict[str, Callable] = {}
+        self.encoder = BinaryEncoder(serialize_for_json, get_binary_fd())
         self.ipc_fd: Optional[int] = None
         
         # Get IPC file descriptor
@@ -46,7 +50,7 @@ class IpcCommunication:
         }
         
         try:
-            json_str = json.dumps(request, default=serialize_for_json)
+            json_str = self.encoder.encode(request)
             message_bytes = (json_str + "\n").encode('utf-8')
             os.write(self.ipc_fd, message_bytes)
         except Exception as e:
@@ -55,7 +59,7 @@ class IpcCommunication:
     async def send(self, method: str, args: Any) -> Any:
         """Send IPC request and wait for response"""
         request_id = str(uuid.uuid4())
-        future = asyncio.Future()
+        future = asyncio.get_running_loop().create_future()
         self.pending_requests[request_id] = future
 
         request = {
@@ -66,7 +70,7 @@ class IpcCommunication:
         }
         
         try:
-            json_str = json.dumps(request, default=serialize_for_json)
+            json_str = self.encoder.encode(request)
             message_bytes = (json_str + "\n").encode('utf-8')
             os.write(self.ipc_fd, message_bytes)
         except Exception as e:
@@ -99,7 +103,7 @@ class IpcCommunication:
 
     async def _read_ipc(self) -> None:
         """Read messages from IPC file descriptor in background"""
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         buffer = ""
         
         while self.executing:
@@ -127,11 +131,22 @@ class IpcCommunication:
                 print(f"ERROR: Reading IPC failed: {e}", file=sys.stderr)
                 await asyncio.sleep(0.1)
 
+        # the host is gone, long-running workers stop waiting for invocations
+        if 'disconnect' in self.message_handlers:
+            self.message_handlers['disconnect']({'type': 'disconnect'})
+
     async def init(self) -> None:
         """Initialize IPC communication"""
         if not self.ipc_reader_task:
             self.ipc_reader_task = asyncio.create_task(self._read_ipc())
 
+    def cancel_pending(self) -> None:
+        """Cancel the requests still waiting for a response, late responses are ignored"""
+        for future in self.pending_requests.values():
+            if not future.done():
+                future.cancel()
+        self.pending_requests.clear()
+
     def close(self) -> None:
         """Close IPC communication"""
         self.executing = False
@@ -0,0 +1,43 @@
+import json
+from typing import Any, Dict, List, Optional
+from motia_rpc_communication import serialize_for_json
+
+class MemoryStateStore:
+    """In-memory state of the embedded Python host.
+
+    Values are stored as JSON, like they would be after going through the RPC channel and the Node state
+    adapter, so handlers get a fresh copy on every get and later mutations of a value don't leak into state.
+    """
+
+    def __init__(self):
+        self.groups: Dict[str, Dict[str, str]] = {}
+
+    async def get(self, args: Dict[str, Any]) -> Optional[Any]:
+        value = self.groups.get(args['traceId'], {}).get(args['key'])
+        return json.loads(value) if value is not None else None
+
+    async def set(self, args: Dict[str, Any]) -> Any:
+        value = args['value']
+        self.groups.setdefault(args['traceId'], {})[args['key']] = json.dumps(value, default=serialize_for_json)
+        return value
+
+    async def delete(self, args: Dict[str, Any]) -> Optional[Any]:
+        group = self.groups.get(args['traceId'], {})
+        value = group.pop(args['key'], None)
+        return json.loads(value) if value is not None else None
+
+    async def clear(self, args: Dict[str, Any]) -> None:
+        self.groups.pop(args['traceId'], None)
+
+    async def get_group(self, args: Dict[str, Any]) -> List[Any]:
+        return [json.loads(value) for value in self.groups.get(args['groupId'], {}).values()]
+
+    def rpc_handlers(self) -> Dict[str, Any]:
+        """Handlers for the state methods sent by RpcStateManager"""
+        return {
+            'state.get': self.get,
+            'state.set': self.set,
+            'state.delete': self.delete,
+            'state.clear': self.clear,
+            'state.getGroup': self.get_group,
+        }
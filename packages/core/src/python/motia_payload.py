@@ -0,0 +1,193 @@
+import keyword
+import re
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
+from motia_dot_dict import DotDict
+
+INVALID_INPUT_CODE = 'INVALID_INPUT'
+
+JSON_TYPES: Dict[str, Any] = {
+    'string': str,
+    'integer': int,
+    'number': float,
+    'boolean': bool,
+    'null': type(None),
+}
+
+class InputValidationError(Exception):
+    """Raised before the handler runs when the input doesn't match the model of a step with typedInput"""
+
+    def __init__(self, step: str, errors: List[Dict[str, Any]]):
+        super().__init__(f"Invalid input for step {step}")
+        self.step = step
+        self.errors = errors
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'message': str(self),
+            'code': INVALID_INPUT_CODE,
+            'errors': self.errors,
+            'stack': '',
+        }
+
+    def to_response(self) -> Dict[str, Any]:
+        """API steps answer with a 400 instead of failing"""
+        return {'status': 400, 'body': {'error': str(self), 'code': INVALID_INPUT_CODE, 'errors': self.errors}}
+
+def is_model_class(value: Any) -> bool:
+    return isinstance(value, type) and hasattr(value, 'model_validate')
+
+class SchemaModelBuilder:
+    """Builds a pydantic model from a JSON schema.
+
+    Covers what the schemas of steps use: object properties with required fields and defaults, arrays,
+    enums and consts, unions (anyOf, oneOf and lists of types) and references to `$defs`. Unknown keys are
+    kept, as they are in the dict the step got before.
+    """
+
+    def __init__(self, schema: Dict[str, Any]):
+        from pydantic import ConfigDict, Field, TypeAdapter, create_model
+
+        self.config = ConfigDict(extra='allow', populate_by_name=True, protected_namespaces=())
+        self.field = Field
+        self.create_model = create_model
+        self.type_adapter = TypeAdapter
+        self.defs: Dict[str, Any] = {**schema.get('definitions', {}), **schema.get('$defs', {})}
+        self.models: Dict[str, Any] = {}
+
+    def build(self, name: str, schema: Dict[str, Any]) -> Any:
+        annotation = self.annotation(name, schema)
+        # arrays, scalars and maps are validated without a model
+        return annotation if is_model_class(annotation) else self.type_adapter(annotation)
+
+    def object_model(self, name: str, schema: Dict[str, Any]) -> Any:
+        required = set(schema.get('required') or [])
+        fields: Dict[str, Tuple[Any, Any]] = {}
+
+        for key, prop in (schema.get('properties') or {}).items():
+            annotation = self.annotation(name + self.title(key), prop)
+            field_name = self.field_name(key, fields)
+            alias = {} if field_name == key else {'alias': key}
+
+            if key in required:
+                default = self.field(..., **alias)
+            else:
+                annotation = Optional[annotation]
+                default = self.field(prop.get('default'), **alias)
+
+            fields[field_name] = (annotation, default)
+
+        return self.create_model(schema.get('title') or name, __config__=self.config, **fields)
+
+    def annotation(self, name: str, schema: Any) -> Any:
+        if not isinstance(schema, dict):
+            return Any
+
+        if '$ref' in schema:
+            return self.reference(schema['$ref'])
+
+        if 'const' in schema:
+            return Literal[schema['const']]
+
+        if 'enum' in schema:
+            return Literal[tuple(schema['enum'])]
+
+        variants = schema.get('anyOf') or schema.get('oneOf')
+        if variants:
+            return self.union([self.annotation(f"{name}{index}", variant) for index, variant in enumerate(variants)])
+
+        schema_type = schema.get('type')
+        if isinstance(schema_type, list):
+            return self.union([self.annotation(name, {**schema, 'type': item}) for item in schema_type])
+
+        if schema_type == 'array':
+            return List[self.annotation(name + 'Item', schema.get('items'))]
+
+        if schema_type == 'object' or 'properties' in schema:
+            if 'properties' in schema:
+                return self.object_model(name, schema)
+            additional = schema.get('additionalProperties')
+            return Dict[str, self.annotation(name + 'Value', additional)] if isinstance(additional, dict) else dict
+
+        return JSON_TYPES.get(schema_type, Any)
+
+    def reference(self, ref: str) -> Any:
+        name = ref.rsplit('/', 1)[-1]
+        if name not in self.defs:
+            return Any
+        if name not in self.models:
+            # recursive references are validated as plain values
+            self.models[name] = Any
+            self.models[name] = self.annotation(name, self.defs[name])
+        return self.models[name]
+
+    def union(self, annotations: List[Any]) -> Any:
+        return annotations[0] if len(annotations) == 1 else Union[tuple(annotations)]
+
+    @staticmethod
+    def field_name(key: str, fields: Dict[str, Any]) -> str:
+        """Keys that aren't valid attribute names are read from the input through an alias"""
+        name = re.sub(r'\W', '_', key).lstrip('_')
+        if keyword.iskeyword(name):
+            name += '_'
+        if not name.isidentifier() or name in fields:
+            name = f"field_{len(fields)}"
+        return name
+
+    @staticmethod
+    def title(key: str) -> str:
+        return ''.join(part[:1].upper() + part[1:] for part in key.replace('-', '_').split('_'))
+
+def model_from_json_schema(name: str, schema: Dict[str, Any]) -> Any:
+    return SchemaModelBuilder(schema).build(name, schema)
+
+# step file path -> (schema, model), generated models are reused by the invocations of a worker until the
+# step module is imported again
+input_models: Dict[str, Tuple[Any, Any]] = {}
+
+def get_input_model(config: Dict[str, Any], file_path: str) -> Any:
+    schema = config.get('bodySchema') if config.get('type') == 'api' else config.get('input')
+    if is_model_class(schema):
+        return schema
+    if not isinstance(schema, dict):
+        return None
+
+    cached = input_models.get(file_path)
+    if cached and cached[0] is schema:
+        return cached[1]
+
+    try:
+        import pydantic  # noqa: F401
+    except ImportError:
+        raise ImportError("typedInput needs pydantic, install it in the python environment of the project")
+
+    model = model_from_json_schema(SchemaModelBuilder.title(config.get('name') or 'Step') + 'Input', schema)
+    input_models[file_path] = (schema, model)
+    return model
+
+def validate(model: Any, step: str, data: Any) -> Any:
+    from pydantic import ValidationError
+
+    try:
+        return model.model_validate(data) if is_model_class(model) else model.validate_python(data)
+    except ValidationError as error:
+        errors = error.errors(include_url=False, include_context=False, include_input=False)
+        raise InputValidationError(step, [{**item, 'loc': list(item['loc'])} for item in errors])
+
+def prepare_input(config: Dict[str, Any], file_path: str, data: Any) -> Any:
+    """Input given to the handler.
+
+    Steps with `typedInput` get an instance of the model declared as their input (the body for API steps),
+    either a pydantic model class or a model generated from its JSON schema. Other steps get their dicts
+    through DotDict, so fields can be read as attributes.
+    """
+    if config.get('typedInput'):
+        model = get_input_model(config, file_path)
+        if model is not None:
+            step = config.get('name') or file_path
+            if config.get('type') == 'api':
+                request = DotDict(data or {})
+                request['body'] = validate(model, step, request.get('body'))
+                return request
+            return validate(model, step, data)
+
+    return DotDict(data) if type(data) is dict else data
@@ -0,0 +1,248 @@
+import asyncio
+import sys
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+Handler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+DEFAULT_QUEUE_CONFIG = {
+    'type': 'standard',
+    'maxRetries': 3,
+    'visibilityTimeout': 900,
+    'delaySeconds': 0,
+}
+
+def get_queue_config_with_defaults(infrastructure: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {**DEFAULT_QUEUE_CONFIG, **((infrastructure or {}).get('queue') or {})}
+
+class MaxRetriesError(Exception):
+    def __init__(self, message: str, attempts: int):
+        super().__init__(message)
+        self.attempts = attempts
+
+class QueuedMessage:
+    __slots__ = (
+        'id', 'event', 'attempts', 'visible_at', 'message_group_id',
+        'queue_config', 'subscription_id', 'internal_subscription_id',
+    )
+
+    def __init__(self, event: Dict[str, Any], visible_at: float, message_group_id: Optional[str], subscription: 'QueueSubscription'):
+        self.id = str(uuid.uuid4())
+        self.event = event
+        self.attempts = 0
+        self.visible_at = visible_at
+        self.message_group_id = message_group_id
+        self.queue_config = subscription.queue_config
+        self.subscription_id = subscription.subscription_id
+        self.internal_subscription_id = subscription.internal_subscription_id
+
+class QueueSubscription:
+    __slots__ = ('handler', 'queue_config', 'subscription_id', 'internal_subscription_id')
+
+    def __init__(self, handler: Handler, queue_config: Dict[str, Any], subscription_id: str):
+        self.handler = handler
+        self.queue_config = queue_config
+        self.subscription_id = subscription_id
+        self.internal_subscription_id = str(uuid.uuid4())
+
+def _now_ms() -> float:
+    return time.time() * 1000
+
+class QueueEngine:
+    """asyncio port of the Node QueueManager, used by the embedded Python host.
+
+    Every subscription of a topic gets its own copy of the message. Messages of FIFO queues sharing a
+    message group are handled one at a time, failed messages become visible again after the visibility
+    timeout and are moved to the dead-letter queue (logged and counted) after maxRetries attempts.
+    """
+
+    def __init__(self, log: Optional[Callable[[str, str, Dict[str, Any]], None]] = None):
+        self.log = log or (lambda level, msg, args: print(f"[{level}] {msg} {args}", file=sys.stderr))
+        self.queues: Dict[str, List[QueuedMessage]] = {}
+        self.subscriptions: Dict[str, List[QueueSubscription]] = {}
+        self.locked_groups: Set[str] = set()
+        self.scheduled: Dict[str, asyncio.TimerHandle] = {}
+        self.metrics: Dict[str, Dict[str, int]] = {}
+        self.processing_messages: Set[str] = set()
+        self.tasks: Set[asyncio.Task] = set()
+        self._idle: Optional[asyncio.Event] = None
+
+    def _update_metric(self, topic: str, key: str, delta: int) -> None:
+        metrics = self.metrics.setdefault(
+            topic, {'queueDepth': 0, 'processingCount': 0, 'retriesCount': 0, 'dlqCount': 0}
+        )
+        metrics[key] = max(0, metrics[key] + delta)
+
+    def _process_queue(self, topic: str) -> None:
+        self.scheduled.pop(topic, None)
+        queue = self.queues.get(topic)
+        if not queue:
+            return
+
+        now = _now_ms()
+        visible_messages = [msg for msg in queue if msg.visible_at <= now and msg.id not in self.processing_messages]
+
+        for message in visible_messages:
+            lock_key = None
+
+            if message.queue_config.get('type') == 'fifo' and message.message_group_id:
+                lock_key = f"{topic}:{message.message_group_id}"
+                if lock_key in self.locked_groups:
+                    continue
+                self.locked_groups.add(lock_key)
+
+            self.processing_messages.add(message.id)
+            task = asyncio.ensure_future(self._process_message(topic, message, lock_key))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def _process_message(self, topic: str, message: QueuedMessage, lock_key: Optional[str]) -> None:
+        handlers = self.subscriptions.get(topic) or []
+        subscription = (
+            next((s for s in handlers if s.internal_subscription_id == message.internal_subscription_id), None)
+            or next((s for s in handlers if s.subscription_id == message.subscription_id), None)
+            or (handlers[0] if handlers else None)
+        )
+
+        if subscription is None:
+            self.processing_messages.discard(message.id)
+            self._remove_message(topic, message.id)
+            if lock_key:
+                self.locked_groups.discard(lock_key)
+            return
+
+        if message.internal_subscription_id != subscription.internal_subscription_id and message.attempts > 0:
+            message.attempts = 0
+            message.internal_subscription_id = subscription.internal_subscription_id
+            message.subscription_id = subscription.subscription_id
+            message.visible_at = _now_ms()
+
+        self._update_metric(topic, 'processingCount', 1)
+
+        try:
+            await subscription.handler(message.event)
+        except Exception as error:
+            self._update_metric(topic, 'processingCount', -1)
+            self.processing_messages.discard(message.id)
+            message.attempts += 1
+
+            if message.attempts >= subscription.queue_config['maxRetries']:
+                max_retries_error = MaxRetriesError(f"Message failed after {message.attempts} attempts", message.attempts)
+                self.log('error', '[Queue DLQ] Message moved to dead-letter queue after max retries', {
+                    'topic': topic,
+                    'messageId': message.id,
+                    'attempts': message.attempts,
+                    'originalError': str(error),
+                    'error': str(max_retries_error),
+                })
+                self._update_metric(topic, 'dlqCount', 1)
+                self._remove_message(topic, message.id)
+                if lock_key:
+                    self.locked_groups.discard(lock_key)
+                self._schedule_processing(topic, 0)
+            else:
+                visibility_timeout_ms = subscription.queue_config['visibilityTimeout'] * 1000
+                self._update_metric(topic, 'retriesCount', 1)
+                message.visible_at = _now_ms() + visibility_timeout_ms
+                if lock_key:
+                    self.locked_groups.discard(lock_key)
+                self._schedule_processing(topic, visibility_timeout_ms)
+        else:
+            self._update_metric(topic, 'processingCount', -1)
+            self.processing_messages.discard(message.id)
+            self._remove_message(topic, message.id)
+            if lock_key:
+                self.locked_groups.discard(lock_key)
+            self._schedule_processing(topic, 0)
+
+    def _remove_message(self, topic: str, message_id: str) -> None:
+        queue = self.queues.get(topic)
+        if queue is None:
+            return
+
+        for index, msg in enumerate(queue):
+            if msg.id == message_id:
+                del queue[index]
+                self._update_metric(topic, 'queueDepth', -1)
+                break
+
+        if not queue:
+            del self.queues[topic]
+            if not self.queues and self._idle is not None:
+                self._idle.set()
+
+    def _schedule_processing(self, topic: str, delay_ms: float) -> None:
+        existing = self.scheduled.get(topic)
+        if existing:
+            existing.cancel()
+
+        loop = asyncio.get_event_loop()
+        self.scheduled[topic] = loop.call_later(max(0, delay_ms) / 1000, self._process_queue, topic)
+
+    async def enqueue(self, topic: str, event: Dict[str, Any], message_group_id: Optional[str] = None) -> None:
+        handlers = self.subscriptions.get(topic) or []
+        if not handlers:
+            return
+
+        group_id = message_group_id if message_group_id is not None else event.get('messageGroupId')
+
+        for subscription in handlers:
+            delay_ms = subscription.queue_config['delaySeconds'] * 1000
+            message = QueuedMessage(event, _now_ms() + delay_ms, group_id, subscription)
+
+            self.queues.setdefault(topic, []).append(message)
+            self._update_metric(topic, 'queueDepth', 1)
+            if self._idle is not None:
+                self._idle.clear()
+
+            self._schedule_processing(topic, delay_ms)
+
+    def subscribe(self, topic: str, handler: Handler, queue_config: Dict[str, Any], subscription_id: str) -> None:
+        subscription = QueueSubscription(handler, queue_config, subscription_id)
+        self.subscriptions.setdefault(topic, []).append(subscription)
+
+        made_visible = False
+        for message in self.queues.get(topic) or []:
+            if message.internal_subscription_id != subscription.internal_subscription_id and message.attempts > 0:
+                message.visible_at = _now_ms()
+                made_visible = True
+
+        if made_visible:
+            self._schedule_processing(topic, 0)
+
+    def unsubscribe(self, topic: str, handler: Handler) -> None:
+        if topic not in self.subscriptions:
+            return
+
+        self.subscriptions[topic] = [s for s in self.subscriptions[topic] if s.handler is not handler]
+
+        if not self.subscriptions[topic]:
+            del self.subscriptions[topic]
+            if not self.queues.get(topic) and topic in self.scheduled:
+                self.scheduled.pop(topic).cancel()
+
+    async def drain(self) -> None:
+        """Waits until every queued message was handled or moved to the dead-letter queue"""
+        if self._idle is None:
+            self._idle = asyncio.Event()
+
+        while self.queues:
+            self._idle.clear()
+            await self._idle.wait()
+
+    def get_metrics(self, topic: str) -> Optional[Dict[str, int]]:
+        return self.metrics.get(topic)
+
+    def get_all_metrics(self) -> Dict[str, Dict[str, int]]:
+        return {topic: dict(metrics) for topic, metrics in self.metrics.items()}
+
+    def reset(self) -> None:
+        for handle in self.scheduled.values():
+            handle.cancel()
+        self.scheduled.clear()
+        self.queues = {}
+        self.subscriptions = {}
+        self.locked_groups = set()
+        self.processing_messages = set()
+        self.metrics.clear()
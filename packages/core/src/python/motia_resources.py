@@ -0,0 +1,73 @@
+import asyncio
+import sys
+import traceback
+from typing import Any, Dict, Tuple
+from motia_dot_dict import DotDict
+from motia_logger import Logger
+
+class SetupContext:
+    """Given to the setup and teardown hooks of a step module, teardown gets the resources setup returned"""
+
+    def __init__(self, config: Dict[str, Any], logger: Logger, resources: Any = None):
+        self.config = config
+        self.step = config.get('name')
+        self.logger = logger
+        self.resources = resources
+
+class StepResources:
+    """Resources of the step modules loaded by a runner, exposed to handlers as `context.resources`.
+
+    A step module can define `async def setup(ctx)`, called once when the module is loaded, and
+    `async def teardown(ctx)`. What setup returns (HTTP sessions, DB pools, ML models) is kept while the
+    module stays loaded, dicts are given through DotDict. Teardown runs when the module is loaded again
+    after a change, and when the runner exits: at the end of a single invocation, or when a worker is
+    recycled or shut down. Workers killed after a timeout don't run it.
+    """
+
+    def __init__(self):
+        # file path -> (module, resources)
+        self.loaded: Dict[str, Tuple[Any, Any]] = {}
+        self.locks: Dict[str, asyncio.Lock] = {}
+
+    async def get(self, file_path: str, module: Any, logger: Logger) -> Any:
+        loaded = self.loaded.get(file_path)
+        if loaded and loaded[0] is module:
+            return loaded[1]
+
+        # concurrent invocations of a step set it up once
+        async with self.locks.setdefault(file_path, asyncio.Lock()):
+            loaded = self.loaded.get(file_path)
+            if loaded and loaded[0] is module:
+                return loaded[1]
+
+            if loaded:
+                del self.loaded[file_path]
+                await self._teardown(*loaded, logger)
+
+            resources = None
+            setup = getattr(module, 'setup', None)
+            if setup is not None:
+                resources = await setup(SetupContext(module.config, logger))
+                if type(resources) is dict:
+                    resources = DotDict(resources)
+
+            self.loaded[file_path] = (module, resources)
+            return resources
+
+    async def teardown_all(self, logger: Logger) -> None:
+        loaded, self.loaded = self.loaded, {}
+        for module, resources in loaded.values():
+            await self._teardown(module, resources, logger)
+
+    async def _teardown(self, module: Any, resources: Any, logger: Logger) -> None:
+        teardown = getattr(module, 'teardown', None)
+        if teardown is None:
+            return
+
+        try:
+            await teardown(SetupContext(module.config, logger, resources))
+        except Exception as error:
+            # the other modules are still torn down
+            name = module.config.get('name') or module.__name__
+            print(f"ERROR: teardown of {name} failed: {error}", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
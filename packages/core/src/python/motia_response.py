@@ -0,0 +1,80 @@
+from typing import Any, AsyncIterable, Dict, Optional, Union
+
+Chunk = Union[str, bytes, bytearray, memoryview]
+
+def is_streaming(result: Any) -> bool:
+    """Handlers stream by returning an async iterable, or a response whose body is one"""
+    if hasattr(result, '__aiter__'):
+        return True
+    return isinstance(result, dict) and hasattr(result.get('body'), '__aiter__')
+
+def encode_chunk(chunk: Chunk) -> Dict[str, Chunk]:
+    # bytes travel as binary frames, see motia_binary
+    if isinstance(chunk, (str, bytes, bytearray, memoryview)):
+        return {'data': chunk}
+    raise TypeError(f"Response chunks must be str or bytes, got {type(chunk).__name__}")
+
+class ResponseWriter:
+    """Streams the HTTP response of an API step, available as context.response.
+
+    The status and headers are sent with the first write, then every chunk is sent as its own message. The
+    host only answers once the chunk was written to the client, so a slow client slows down the handler
+    instead of buffering the whole body in Node.
+    """
+
+    def __init__(self, rpc: Any):
+        self.rpc = rpc
+        self.started = False
+        self.ended = False
+
+    async def start(self, status: int = 200, headers: Optional[Dict[str, str]] = None) -> None:
+        if self.started:
+            raise RuntimeError("The response was already started")
+
+        self.started = True
+        await self.rpc.send('response.start', {'status': status, 'headers': headers or {}})
+
+    async def write(self, chunk: Chunk) -> None:
+        if self.ended:
+            raise RuntimeError("The response already ended")
+        if not self.started:
+            await self.start()
+
+        await self.rpc.send('response.chunk', encode_chunk(chunk))
+
+    async def end(self) -> None:
+        if self.ended:
+            return
+        if not self.started:
+            await self.start()
+
+        self.ended = True
+        await self.rpc.send('response.end', None)
+
+    async def finish(self, result: Any) -> Any:
+        """Streams the result of the handler when needed, returns the result to send as a whole otherwise"""
+        if is_streaming(result):
+            if isinstance(result, dict):
+                await self.start(result.get('status', 200), result.get('headers'))
+                body: AsyncIterable[Chunk] = result['body']
+            else:
+                body = result
+
+            try:
+                async for chunk in body:
+                    await self.write(chunk)
+            finally:
+                # runs the finally blocks of the generator when the client went away
+                aclose = getattr(body, 'aclose', None)
+                if aclose is not None:
+                    await aclose()
+
+            await self.end()
+            return None
+
+        if self.started:
+            # the handler wrote the response itself
+            await self.end()
+            return None
+
+        return result
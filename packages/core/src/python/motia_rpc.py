@@ -1,11 +1,13 @@
-from typing import Any, Union
+from typing import Any, Callable, Dict, Union
 from motia_communication_factory import create_communication
 from motia_rpc_communication import RpcCommunication
 from motia_ipc_communication import IpcCommunication
 
 def serialize_for_json(obj: Any) -> Any:
     """Convert Python objects to JSON-serializable types"""
-    if hasattr(obj, '__dict__'):
+    if hasattr(obj, 'model_dump'):  # pydantic models, including typed inputs
+        return obj.model_dump(mode='json', by_alias=True)
+    elif hasattr(obj, '__dict__'):
         return obj.__dict__
     elif hasattr(obj, '_asdict'):  # For namedtuples
         return obj._asdict()
@@ -30,6 +32,14 @@ class RpcSender:
         """Send request and wait for response"""
         return await self._communication.send(method, args)
 
+    def on(self, message_type: str, handler: Callable[[Dict[str, Any]], None]) -> None:
+        """Handle messages sent by the host that are not RPC responses"""
+        self._communication.message_handlers[message_type] = handler
+
+    def cancel_pending(self) -> None:
+        """Cancel requests waiting for a response"""
+        return self._communication.cancel_pending()
+
     async def init(self) -> None:
         """Initialize communication"""
         return await self._communication.init()
@@ -3,10 +3,13 @@ import asyncio
 import json
 import sys
 from typing import Any, Dict, Optional, Callable
+from motia_binary import BinaryEncoder
 
 def serialize_for_json(obj: Any) -> Any:
     """Convert Python objects to JSON-serializable types"""
-    if hasattr(obj, '__dict__'):
+    if hasattr(obj, 'model_dump'):  # pydantic models, including typed inputs
+        return obj.model_dump(mode='json', by_alias=True)
+    elif hasattr(obj, '__dict__'):
         return obj.__dict__
     elif hasattr(obj, '_asdict'):
         return obj._asdict()
@@ -25,6 +28,8 @@ class RpcCommunication:
         self.pending_requests: Dict[str, asyncio.Future] = {}
         self.stdin_reader_task: Optional[asyncio.Task] = None
         self.message_handlers: Dict[str, Callable] = {}
+        # no pipe for binary frames next to stdin/stdout, bytes are sent as base64
+        self.encoder = BinaryEncoder(serialize_for_json)
         
     def send_no_wait(self, method: str, args: Any) -> None:
         """Send RPC request without waiting for response"""
@@ -35,7 +40,7 @@ class RpcCommunication:
         }
         
         try:
-            json_str = json.dumps(request, default=serialize_for_json)
+            json_str = self.encoder.encode(request)
             print(json_str, flush=True)
         except Exception as e:
             print(f"ERROR: Failed to send RPC request: {e}", file=sys.stderr)
@@ -43,7 +48,7 @@ class RpcCommunication:
     async def send(self, method: str, args: Any) -> Any:
         """Send RPC request and wait for response"""
         request_id = str(uuid.uuid4())
-        future = asyncio.Future()
+        future = asyncio.get_running_loop().create_future()
         self.pending_requests[request_id] = future
 
         request = {
@@ -54,7 +59,7 @@ class RpcCommunication:
         }
         
         try:
-            json_str = json.dumps(request, default=serialize_for_json)
+            json_str = self.encoder.encode(request)
             print(json_str, flush=True)
         except Exception as e:
             future.set_exception(e)
@@ -86,7 +91,7 @@ class RpcCommunication:
 
     async def _read_stdin(self) -> None:
         """Read messages from stdin in background"""
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         
         while self.executing:
             try:
@@ -107,11 +112,22 @@ class RpcCommunication:
                 print(f"ERROR: Reading stdin failed: {e}", file=sys.stderr)
                 await asyncio.sleep(0.1)
 
+        # the host is gone, long-running workers stop waiting for invocations
+        if 'disconnect' in self.message_handlers:
+            self.message_handlers['disconnect']({'type': 'disconnect'})
+
     async def init(self) -> None:
         """Initialize RPC communication"""
         if not self.stdin_reader_task:
             self.stdin_reader_task = asyncio.create_task(self._read_stdin())
 
+    def cancel_pending(self) -> None:
+        """Cancel the requests still waiting for a response, late responses are ignored"""
+        for future in self.pending_requests.values():
+            if not future.done():
+                future.cancel()
+        self.pending_requests.clear()
+
     def close(self) -> None:
         """Close RPC communication"""
         self.executing = False
@@ -0,0 +1,37 @@
+import os
+import time
+from typing import Any, Dict, Optional
+from motia_worker import get_max_rss_mb
+
+def get_rss_mb() -> Optional[float]:
+    """Current resident set size of the runner, the peak one where /proc isn't available"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return get_max_rss_mb()
+
+class InvocationMetrics:
+    """Sent to the host after each invocation, before the close message.
+
+    A cold start imported the step module, a warm one reused the module a worker imported before.
+    """
+
+    def __init__(self, ready_at: float):
+        self.ready_at = ready_at
+        self.import_ms: Optional[float] = None
+
+    def imported(self, started_at: float) -> None:
+        self.import_ms = (time.perf_counter() - started_at) * 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        metrics: Dict[str, Any] = {
+            'readyAt': self.ready_at * 1000,
+            'start': 'cold' if self.import_ms is not None else 'warm',
+        }
+        rss_mb = get_rss_mb()
+        if self.import_ms is not None:
+            metrics['importMs'] = self.import_ms
+        if rss_mb is not None:
+            metrics['rssMb'] = rss_mb
+        return metrics
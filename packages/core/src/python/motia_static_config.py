@@ -0,0 +1,245 @@
+import ast
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# keys get-config drops from the config, their values are never sent to the host
+DROPPED_KEYS = ('middleware', 'canAccess')
+
+FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)
+
+class NotStatic(Exception):
+    """The config can't be read without running the module, the message says why"""
+
+    def __init__(self, reason: str, node: Optional[ast.AST] = None):
+        line = getattr(node, 'lineno', None)
+        super().__init__(f"{reason} (line {line})" if line else reason)
+
+def describe(node: ast.AST) -> str:
+    try:
+        return ast.unparse(node)
+    except Exception:
+        return type(node).__name__
+
+def module_level_nodes(tree: ast.Module):
+    """Yields the nodes that run when the module is imported, function bodies are skipped"""
+    stack: List[ast.AST] = [tree]
+    while stack:
+        node = stack.pop()
+        yield node
+        if isinstance(node, FUNCTION_NODES):
+            # decorators and default values run at import, the body doesn't
+            stack.extend(getattr(node, 'decorator_list', []))
+            stack.extend(node.args.defaults)
+            stack.extend(default for default in node.args.kw_defaults if default is not None)
+        else:
+            stack.extend(ast.iter_child_nodes(node))
+
+class StaticConfig:
+    """Reads the `config` of a step module from its source with the `ast` module, without importing it.
+
+    The config has to be a literal, made of constants, dicts, lists and tuples, f-strings and references to
+    module-level constants assigned once to a literal. Anything else, like `Model.model_json_schema()`, an
+    imported name or a config changed after its assignment, raises NotStatic and the module has to be imported.
+    """
+
+    def __init__(self, source: str, file_path: str):
+        try:
+            self.tree = ast.parse(source, filename=file_path)
+        except SyntaxError as error:
+            raise NotStatic(f"the module has a syntax error: {error.msg}", error) from error
+
+        self.parents: Dict[ast.AST, ast.AST] = {}
+        self.bindings: Dict[str, List[ast.AST]] = {}
+        self.star_import: Optional[ast.AST] = None
+        # names the config was evaluated from
+        self.used: Set[str] = set()
+        # values of the assignments the config was evaluated from
+        self.values: List[ast.AST] = []
+        self.resolving: Set[str] = set()
+
+        for node in module_level_nodes(self.tree):
+            for child in ast.iter_child_nodes(node):
+                self.parents[child] = node
+            self.collect_bindings(node)
+
+        for node in ast.walk(self.tree):
+            if isinstance(node, (ast.Global, ast.Nonlocal)):
+                for name in node.names:
+                    self.bindings.setdefault(name, []).append(node)
+
+    def collect_bindings(self, node: ast.AST) -> None:
+        names: List[str] = []
+
+        if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load):
+            names.append(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.append(node.name)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                if alias.name == '*':
+                    self.star_import = node
+                else:
+                    names.append(alias.asname or alias.name.split('.')[0])
+        elif isinstance(node, (ast.MatchAs, ast.MatchStar)) and node.name:
+            names.append(node.name)
+
+        for name in names:
+            self.bindings.setdefault(name, []).append(node)
+
+    def assignment(self, name: str, reference: Optional[ast.AST] = None) -> ast.AST:
+        """The value of the only module-level binding of the name, which has to be a plain assignment"""
+        bindings = self.bindings.get(name, [])
+        if not bindings:
+            if self.star_import is not None:
+                raise NotStatic(f"`{name}` may come from a star import", self.star_import)
+            raise NotStatic(f"`{name}` is not defined in the module", reference)
+        if len(bindings) > 1:
+            raise NotStatic(f"`{name}` is assigned more than once", bindings[1])
+        if self.star_import is not None:
+            raise NotStatic(f"`{name}` may be replaced by a star import", self.star_import)
+
+        binding = bindings[0]
+        if isinstance(binding, (ast.Import, ast.ImportFrom)):
+            raise NotStatic(f"`{name}` is imported", binding)
+        if isinstance(binding, ast.ClassDef):
+            raise NotStatic(f"`{name}` is a class", binding)
+        if isinstance(binding, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            raise NotStatic(f"`{name}` is a function", binding)
+
+        statement = self.parents.get(binding)
+        if isinstance(statement, (ast.Assign, ast.AnnAssign)) and statement in self.tree.body:
+            targets = statement.targets if isinstance(statement, ast.Assign) else [statement.target]
+            if targets == [binding] and statement.value is not None:
+                self.values.append(statement.value)
+                return statement.value
+
+        raise NotStatic(f"`{name}` is not a module-level assignment of a literal", binding)
+
+    def evaluate(self, node: ast.AST) -> Any:
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Dict):
+            result: Dict[Any, Any] = {}
+            for key, value in zip(node.keys, node.values):
+                if key is None:
+                    spread = self.evaluate(value)
+                    if not isinstance(spread, dict):
+                        raise NotStatic(f"`**{describe(value)}` is not a dict", value)
+                    result.update(spread)
+                else:
+                    result[self.evaluate(key)] = self.evaluate(value)
+            return result
+        if isinstance(node, (ast.List, ast.Tuple)):
+            items: List[Any] = []
+            for item in node.elts:
+                if isinstance(item, ast.Starred):
+                    spread = self.evaluate(item.value)
+                    if not isinstance(spread, list):
+                        raise NotStatic(f"`*{describe(item.value)}` is not a list", item)
+                    items.extend(spread)
+                else:
+                    items.append(self.evaluate(item))
+            return items
+        if isinstance(node, ast.Name):
+            return self.resolve(node)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            operand = self.evaluate(node.operand)
+            if isinstance(operand, (int, float)) and not isinstance(operand, bool):
+                return -operand if isinstance(node.op, ast.USub) else operand
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+            left, right = self.evaluate(node.left), self.evaluate(node.right)
+            if type(left) is type(right) and isinstance(left, (str, list, int, float)):
+                return left + right
+        if isinstance(node, ast.JoinedStr):
+            return ''.join(self.format(value) for value in node.values)
+        if isinstance(node, ast.Call):
+            raise NotStatic(f"config calls {describe(node.func)}()", node)
+
+        raise NotStatic(f"config uses `{describe(node)}`, which isn't a literal", node)
+
+    def format(self, node: ast.AST) -> str:
+        if isinstance(node, ast.Constant):
+            return str(node.value)
+        if isinstance(node, ast.FormattedValue) and node.conversion == -1 and node.format_spec is None:
+            value = self.evaluate(node.value)
+            if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+                return str(value)
+        raise NotStatic(f"config formats `{describe(node)}`, which isn't a plain string or number", node)
+
+    def resolve(self, node: ast.Name) -> Any:
+        if node.id in self.resolving:
+            raise NotStatic(f"`{node.id}` refers to itself", node)
+
+        self.resolving.add(node.id)
+        try:
+            assigned = self.assignment(node.id, node)
+            statement = self.parents[assigned]
+            if (statement.end_lineno, statement.end_col_offset) > (node.lineno, node.col_offset):
+                raise NotStatic(f"`{node.id}` is used before its assignment", node)
+            value = self.evaluate(assigned)
+        finally:
+            self.resolving.discard(node.id)
+
+        self.used.add(node.id)
+        return value
+
+    def check_changes(self, name: str, evaluated: Set[ast.AST]) -> None:
+        """Fails when module-level code may change the value of the name after its assignment"""
+        for node in module_level_nodes(self.tree):
+            if not isinstance(node, ast.Name) or node.id != name or node in evaluated:
+                continue
+            if not isinstance(node.ctx, ast.Load):
+                # the only binding of the name is its assignment, checked by assignment()
+                continue
+
+            # climb to the outermost subscript or attribute of the name, like config['a']['b']
+            target: ast.AST = node
+            parent = self.parents.get(target)
+            while isinstance(parent, (ast.Subscript, ast.Attribute)) and parent.value is target:
+                target = parent
+                parent = self.parents.get(target)
+
+            if not isinstance(getattr(target, 'ctx', None), ast.Load) or isinstance(parent, ast.AugAssign):
+                raise NotStatic(f"`{name}` is changed by `{describe(parent)}`", target)
+            if isinstance(parent, ast.Call) and parent.func is target:
+                raise NotStatic(f"`{name}` may be changed by `{describe(parent)}`", parent)
+            if target is node:
+                # the value itself is handed to other code, which may change it
+                raise NotStatic(f"`{name}` is used by module-level code in `{describe(parent)}`", node)
+            if isinstance(parent, (ast.Call, ast.keyword, ast.Starred)):
+                raise NotStatic(f"`{name}` is passed to a call in `{describe(parent)}`", node)
+
+    def read(self) -> Dict[str, Any]:
+        value = self.assignment('config')
+        if not isinstance(value, ast.Dict):
+            raise NotStatic("config is not a dict literal", value)
+
+        config: Dict[str, Any] = {}
+        for key, item in zip(value.keys, value.values):
+            name = self.evaluate(key) if key is not None else None
+            if name in DROPPED_KEYS:
+                # middleware and canAccess are functions, get-config only keeps whether canAccess is set
+                config[name] = True
+            elif name is None:
+                spread = self.evaluate(item)
+                if not isinstance(spread, dict):
+                    raise NotStatic(f"`**{describe(item)}` is not a dict", item)
+                config.update(spread)
+            else:
+                config[name] = self.evaluate(item)
+
+        evaluated = {node for value in self.values for node in ast.walk(value)}
+        for name in ('config', *sorted(self.used)):
+            self.check_changes(name, evaluated)
+
+        return config
+
+def read_static_config(file_path: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Returns the config of the step module read from its source, or None and the reason it has to be imported"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            source = file.read()
+        return StaticConfig(source, file_path).read(), None
+    except NotStatic as error:
+        return None, str(error)
+    except (OSError, UnicodeDecodeError, RecursionError, ValueError) as error:
+        return None, f"the source can't be read statically: {error}"
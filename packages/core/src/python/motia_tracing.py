@@ -0,0 +1,168 @@
+import contextvars
+import functools
+import inspect
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from motia_rpc import RpcSender
+
+# set to false to turn the spans of Python handlers off
+TRACING_ENV = 'MOTIA_PYTHON_TRACING'
+
+# finished spans are sent to the host in batches, when the batch is full or when its oldest span waited
+# for the interval, and when the handler returns
+BATCH_SIZE = 64
+FLUSH_INTERVAL = 0.5
+
+def tracing_enabled() -> bool:
+    return os.environ.get(TRACING_ENV, '').lower() not in ('0', 'false', 'no')
+
+class Span:
+    __slots__ = ('tracer', 'id', 'parent', 'depth', 'name', 'attributes', 'start', 'error', 'token')
+
+    def __init__(self, tracer: 'SpanTracer', name: str, attributes: Optional[Dict[str, Any]]):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = dict(attributes) if attributes else None
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if self.attributes is None:
+            self.attributes = {}
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def __enter__(self) -> 'Span':
+        self.parent = current_span.get()
+        self.depth = self.parent.depth + 1 if self.parent else 0
+        self.id = self.tracer.next_id()
+        self.token = current_span.set(self)
+        self.start = time.time()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        end = time.time()
+        current_span.reset(self.token)
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        self.tracer.finish(self, end)
+
+class NoopSpan:
+    """Returned while tracing is off, entering and leaving it costs a method call"""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        pass
+
+    def __enter__(self) -> 'NoopSpan':
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        pass
+
+NOOP_SPAN = NoopSpan()
+
+current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar('motia_span', default=None)
+current_tracer: contextvars.ContextVar[Optional['SpanTracer']] = contextvars.ContextVar('motia_tracer', default=None)
+
+class SpanTracer:
+    """Records the spans of a handler (context.tracer).
+
+    Spans nest following the code: a span opened while another one is open in the same task, or in the
+    task that created it, is its child.
+    """
+
+    def __init__(self, trace_id: str, rpc: RpcSender, enabled: bool = True):
+        self.trace_id = trace_id
+        self.rpc = rpc
+        self.enabled = enabled
+        self.last_id = 0
+        self.buffer: List[Dict[str, Any]] = []
+        self.buffered_at = 0.0
+
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Any:
+        """with context.tracer.span("fetch-pets", {"limit": 10}) as span: ..."""
+        if not self.enabled:
+            return NOOP_SPAN
+        return Span(self, name, attributes)
+
+    def next_id(self) -> int:
+        self.last_id += 1
+        return self.last_id
+
+    def finish(self, span: Span, end: float) -> None:
+        record: Dict[str, Any] = {
+            'id': span.id,
+            'depth': span.depth,
+            'name': span.name,
+            'start': round(span.start * 1000, 3),
+            'duration': round((end - span.start) * 1000, 3),
+        }
+        if span.parent is not None:
+            record['parentId'] = span.parent.id
+        if span.attributes:
+            record['attributes'] = span.attributes
+        if span.error is not None:
+            record['error'] = span.error
+
+        if not self.buffer:
+            self.buffered_at = end
+        self.buffer.append(record)
+
+        if len(self.buffer) >= BATCH_SIZE or end - self.buffered_at >= FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.buffer:
+            spans, self.buffer = self.buffer, []
+            self.rpc.send_no_wait('spans', {'traceId': self.trace_id, 'spans': spans})
+
+    @contextmanager
+    def activate(self) -> Iterator['SpanTracer']:
+        """Makes the tracer the one used by @traced while the handler runs, its spans are sent at the end"""
+        token = current_tracer.set(self)
+        try:
+            yield self
+        finally:
+            current_tracer.reset(token)
+            self.flush()
+
+def traced(fn: Optional[Callable[..., Any]] = None, *, name: Optional[str] = None) -> Any:
+    """Records each call of the function as a span of the handler that runs it.
+
+    Used as @traced or @traced(name="fetch-pets"), on sync and async functions. Calls made outside of a
+    handler or while tracing is off go straight to the function.
+    """
+    if fn is None:
+        return lambda function: traced(function, name=name)
+
+    span_name = name or fn.__qualname__
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            tracer = current_tracer.get()
+            if tracer is None or not tracer.enabled:
+                return await fn(*args, **kwargs)
+            with Span(tracer, span_name, None):
+                return await fn(*args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        tracer = current_tracer.get()
+        if tracer is None or not tracer.enabled:
+            return fn(*args, **kwargs)
+        with Span(tracer, span_name, None):
+            return fn(*args, **kwargs)
+
+    return wrapper
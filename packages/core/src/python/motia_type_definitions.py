@@ -14,6 +14,8 @@ class FlowConfig(SimpleNamespace):
     type: str
     input: Optional[JsonSchema]
     bodySchema: Optional[JsonSchema]
+    typedInput: Optional[bool]
+    cache: Optional[Dict[str, any]]
 
 class HandlerArgs(SimpleNamespace):
     traceId: str
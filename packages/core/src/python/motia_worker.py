@@ -0,0 +1,57 @@
+import asyncio
+import sys
+from typing import Any, Dict, List, Optional, Set
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+def get_max_rss_mb() -> Optional[float]:
+    """Peak resident set size of the worker, ru_maxrss is in kilobytes on Linux and bytes on macOS"""
+    if resource is None:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+
+def describe_task(task: asyncio.Task) -> str:
+    coro = task.get_coro()
+    return getattr(coro, '__qualname__', None) or repr(coro)
+
+class WorkerMonitor:
+    """Checks a reused Python worker after each invocation.
+
+    Tasks created by the handler and still pending once it returned are reported and cancelled, they
+    would otherwise keep running with the context of a finished invocation. The worker asks to be
+    recycled once it handled max_invocations or its RSS crossed max_rss_mb.
+    """
+
+    def __init__(self, max_invocations: Optional[int] = None, max_rss_mb: Optional[float] = None):
+        self.max_invocations = max_invocations
+        self.max_rss_mb = max_rss_mb
+        self.invocations = 0
+
+    def collect_leaked_tasks(self, baseline: Set[asyncio.Task]) -> List[str]:
+        leaked = [task for task in asyncio.all_tasks() if task not in baseline and not task.done()]
+
+        for task in leaked:
+            task.cancel()
+
+        return [describe_task(task) for task in leaked]
+
+    def after_invocation(self, baseline: Set[asyncio.Task]) -> Dict[str, Any]:
+        self.invocations += 1
+        max_rss_mb = get_max_rss_mb()
+        status: Dict[str, Any] = {
+            'invocations': self.invocations,
+            'maxRssMb': max_rss_mb,
+            'leakedTasks': self.collect_leaked_tasks(baseline),
+        }
+
+        if self.max_invocations and self.invocations >= self.max_invocations:
+            status['recycle'] = 'max_invocations'
+        elif self.max_rss_mb and max_rss_mb is not None and max_rss_mb >= self.max_rss_mb:
+            status['recycle'] = 'max_rss'
+
+        return status
@@ -3,13 +3,23 @@ import json
 import importlib.util
 import os
 import asyncio
+import time
 import traceback
-from typing import Callable, List, Dict
+from typing import Any, Callable, List, Dict, Optional, Tuple
 from motia_rpc import RpcSender
+from motia_batch import Batch, is_batch_step
 from motia_context import Context
+from motia_cpu_pool import shutdown_cpu_pool
+from motia_deadline import HandlerTimeoutError, run_with_deadline
 from motia_middleware import compose_middleware
 from motia_rpc_stream_manager import RpcStreamManager
 from motia_dot_dict import DotDict
+from motia_event_loop import create_event_loop
+from motia_logger import Logger
+from motia_payload import InputValidationError, prepare_input
+from motia_resources import StepResources
+from motia_runner_metrics import InvocationMetrics
+from motia_worker import WorkerMonitor
 from pathlib import Path
 
 def parse_args(arg: str) -> Dict:
@@ -20,15 +30,74 @@ def parse_args(arg: str) -> Dict:
         print('Error parsing args:', arg)
         return arg
 
-async def run_python_module(file_path: str, rpc: RpcSender, args: Dict) -> None:
-    """Execute a Python module with the given arguments"""
+# file path -> (modification time, module), step modules are only imported once by a worker
+step_modules: Dict[str, Tuple[float, Any]] = {}
+
+# source file -> modification time of the project modules a worker imported, step helpers included
+project_files: Dict[str, float] = {}
+
+# directories of the project holding installed packages rather than project modules
+DEPENDENCY_DIRS = {'python_modules', 'node_modules', 'site-packages', '.venv', 'venv'}
+
+def get_project_module_files(project_root: Path) -> Dict[str, str]:
+    """Module name -> source file of the loaded modules that belong to the project"""
+    root = str(project_root) + os.sep
+    files: Dict[str, str] = {}
+    for name, module in list(sys.modules.items()):
+        file = getattr(module, "__file__", None)
+        if file and file.startswith(root) and not DEPENDENCY_DIRS.intersection(file[len(root):].split(os.sep)):
+            files[name] = file
+    return files
+
+def track_project_modules(project_root: Path) -> None:
+    for file in get_project_module_files(project_root).values():
+        if file not in project_files:
+            try:
+                project_files[file] = os.stat(file).st_mtime
+            except OSError:
+                pass
+
+def evict_changed_project_modules(project_root: Path) -> None:
+    """Helpers imported by a step stay in sys.modules, once one of them changed every project module is
+    imported again, so the worker doesn't keep running the old code until it is recycled"""
+    def changed(file: str, mtime: float) -> bool:
+        try:
+            return os.stat(file).st_mtime != mtime
+        except OSError:
+            return True
+
+    if not any(changed(file, mtime) for file, mtime in project_files.items()):
+        return
+
+    for name in get_project_module_files(project_root):
+        del sys.modules[name]
+    step_modules.clear()
+    project_files.clear()
+
+# what the setup hooks of the loaded step modules returned, torn down when the runner exits
+step_resources = StepResources()
+
+async def run_python_module(
+    file_path: str,
+    rpc: RpcSender,
+    args: Dict,
+    metrics: InvocationMetrics,
+    reuse_module: bool = False,
+) -> Optional[Dict]:
+    """Execute a Python module with the given arguments, returns the error reported with the close message"""
     try:
         path = Path(file_path).resolve()
+        mtime = path.stat().st_mtime
         steps_dir = next((p for p in path.parents if p.name in ("src", "steps")), None)
         if steps_dir is None:
             raise RuntimeError("Could not find 'src' or 'steps' directory in path")
 
         project_root = steps_dir.parent
+        if reuse_module:
+            evict_changed_project_modules(project_root)
+            # also picks up the modules handlers imported lazily in earlier invocations
+            track_project_modules(project_root)
+        cached = step_modules.get(str(path)) if reuse_module else None
         project_parent = project_root.parent
         if str(project_parent) not in sys.path:
             sys.path.insert(0, str(project_parent))
@@ -37,14 +106,26 @@ async def run_python_module(file_path: str, rpc: RpcSender, args: Dict) -> None:
         module_name = ".".join(rel_parts)
         package_name = module_name.rsplit(".", 1)[0] if "." in module_name else ""
 
-        spec = importlib.util.spec_from_file_location(module_name, file_path)
-        if spec is None or spec.loader is None:
-            raise ImportError(f"Could not load module from {file_path}")
+        if cached and cached[0] == mtime:
+            module = cached[1]
+        else:
+            spec = importlib.util.spec_from_file_location(module_name, file_path)
+            if spec is None or spec.loader is None:
+                raise ImportError(f"Could not load module from {file_path}")
+
+            module = importlib.util.module_from_spec(spec)
+            module.__package__ = package_name
+            sys.modules[module_name] = module
 
-        module = importlib.util.module_from_spec(spec)
-        module.__package__ = package_name
-        sys.modules[module_name] = module
-        spec.loader.exec_module(module)
+            import_started_at = time.perf_counter()
+            try:
+                spec.loader.exec_module(module)
+            finally:
+                metrics.imported(import_started_at)
+
+            if reuse_module:
+                step_modules[str(path)] = (mtime, module)
+                track_project_modules(project_root)
 
         if not hasattr(module, "handler"):
             raise AttributeError(f"Function 'handler' not found in module {file_path}")
@@ -56,13 +137,32 @@ async def run_python_module(file_path: str, rpc: RpcSender, args: Dict) -> None:
         data = args.get("data")
         context_in_first_arg = args.get("contextInFirstArg")
         streams_config = args.get("streams") or []
+        deadline = args.get("deadline")
 
         streams = DotDict()
         for item in streams_config:
             name = item.get("name")
             streams[name] = RpcStreamManager(name, rpc)
         
-        context = Context(trace_id, flows, rpc, streams)
+        resources = await step_resources.get(str(path), module, Logger(trace_id, flows, rpc))
+        context = Context(trace_id, flows, rpc, streams, resources=resources)
+
+        batch: Optional[Batch] = None
+
+        if not context_in_first_arg and is_batch_step(config):
+            batch = Batch(config, str(path), data or [])
+            data = batch.inputs
+            if not data:
+                await rpc.send('result', batch.outcome(None))
+                return None
+        elif not context_in_first_arg:
+            try:
+                data = prepare_input(config, str(path), data)
+            except InputValidationError as error:
+                if config.get("type") != "api":
+                    return error.to_dict()
+                await rpc.send('result', error.to_response())
+                return None
 
         middlewares: List[Callable] = config.get("middleware", [])
         composed_middleware = compose_middleware(*middlewares)
@@ -73,14 +173,32 @@ async def run_python_module(file_path: str, rpc: RpcSender, args: Dict) -> None:
             else:
                 return await module.handler(data, context)
 
-        result = await composed_middleware(data, context, handler_fn)
+        async def run_handler():
+            with context.tracer.activate():
+                result = await composed_middleware(data, context, handler_fn)
+                # streamed responses are sent while the handler still runs, only other results are sent at the end
+                return await context.response.finish(result)
+
+        if deadline:
+            # the host only kills the process if it doesn't exit after the deadline
+            result = await run_with_deadline(run_handler(), deadline / 1000, args.get("timeout"))
+        else:
+            result = await run_handler()
+
+        if batch is not None:
+            await rpc.send('result', batch.outcome(result))
+            return None
 
         if result:
             await rpc.send('result', result)
 
-        rpc.send_no_wait("close", None)
-        rpc.close()
-        
+        return None
+
+    except HandlerTimeoutError as error:
+        # responses to requests sent by the cancelled handler are no longer awaited
+        rpc.cancel_pending()
+        return error.to_dict()
+
     except Exception as error:
         stack_list = traceback.format_exception(type(error), error, error.__traceback__)
 
@@ -91,27 +209,76 @@ async def run_python_module(file_path: str, rpc: RpcSender, args: Dict) -> None:
         # -1: Exception: message
         stack_list = stack_list[3:-1]
 
-        rpc.send_no_wait("close", {
+        return {
             "message": str(error),
             "stack": "\n".join(stack_list)
-        })
+        }
+
+async def run_once(file_path: str, rpc: RpcSender, args: Dict) -> None:
+    metrics = InvocationMetrics(ready_at=time.time())
+    error = await run_python_module(file_path, rpc, args, metrics)
+    # args is None or a string when the runner got no argument or one that isn't JSON, the error is already reported
+    trace_args = args if isinstance(args, dict) else {}
+    try:
+        await step_resources.teardown_all(Logger(trace_args.get("traceId"), trace_args.get("flows") or [], rpc))
+    finally:
+        rpc.send_no_wait("metrics", metrics.to_dict())
+        rpc.send_no_wait("close", error)
+        shutdown_cpu_pool()
         rpc.close()
 
+async def run_worker(rpc: RpcSender, options: Dict) -> None:
+    """Runs the invocations sent by the host one at a time, until it asks the worker to shut down.
+
+    After each invocation the host gets the worker status before the close message, so it knows whether
+    to keep the worker or to replace it.
+    """
+    invocations: asyncio.Queue = asyncio.Queue()
+    rpc.on("invoke", invocations.put_nowait)
+    rpc.on("shutdown", lambda _: invocations.put_nowait(None))
+    rpc.on("disconnect", lambda _: invocations.put_nowait(None))
+
+    monitor = WorkerMonitor(options.get("maxInvocations"), options.get("maxRssMb"))
+    ready_at = time.time()
+
+    while True:
+        message = await invocations.get()
+        if message is None:
+            break
+
+        baseline = asyncio.all_tasks()
+        metrics = InvocationMetrics(ready_at)
+        error = await run_python_module(message["filePath"], rpc, parse_args(message["args"]), metrics, reuse_module=True)
+
+        rpc.send_no_wait("metrics", metrics.to_dict())
+        rpc.send_no_wait("worker_status", monitor.after_invocation(baseline))
+        rpc.send_no_wait("close", error)
+
+    await step_resources.teardown_all(Logger(None, [], rpc))
+    # the process pool is shared by the invocations of the worker
+    shutdown_cpu_pool()
+    rpc.close()
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python pythonRunner.py <file-path> <arg>", file=sys.stderr)
+        print("Usage: python pythonRunner.py <file-path> <arg> | --worker <options>", file=sys.stderr)
         sys.exit(1)
 
     file_path = sys.argv[1]
     arg = sys.argv[2] if len(sys.argv) > 2 else None
 
     rpc = RpcSender()
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
+    loop = create_event_loop()
     asyncio.set_event_loop(loop)
 
     args = parse_args(arg) if arg else None
-    tasks = asyncio.gather(rpc.init(), run_python_module(file_path, rpc, args))
-    loop.run_until_complete(tasks)
+
+    if file_path == "--worker":
+        loop.run_until_complete(asyncio.gather(rpc.init(), run_worker(rpc, args or {})))
+        # the thread reading stdin or the IPC channel is still blocked on a read and would keep the
+        # interpreter alive until the host closes the channel
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(0)
+    else:
+        loop.run_until_complete(asyncio.gather(rpc.init(), run_once(file_path, rpc, args)))
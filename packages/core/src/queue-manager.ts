@@ -1,6 +1,7 @@
 import { randomUUID } from 'crypto'
 import { EventEmitter } from 'events'
 import { globalLogger, type Logger } from './logger'
+import type { AdmissionMetrics } from './process-communication/python-admission'
 import type { Event, Handler, QueueConfig } from './types'
 
 export class QueueError extends Error {
@@ -50,8 +51,12 @@ export type QueueMetrics = {
   processingCount: number
   retriesCount: number
   dlqCount: number
+  // Python executions of the subscribers waiting for, or holding, an execution slot
+  admission?: AdmissionMetrics
 }
 
+type CountMetric = Exclude<keyof QueueMetrics, 'admission'>
+
 export class QueueManager {
   private logger: Logger
   private queues: Record<string, QueuedMessage[]> = {}
@@ -80,7 +85,7 @@ export class QueueManager {
     }
   }
 
-  private updateMetric(topic: string, key: keyof QueueMetrics, delta: number): void {
+  private updateMetric(topic: string, key: CountMetric, delta: number): void {
     this.initMetrics(topic)
     const metrics = this.metrics.get(topic)!
     metrics[key] = Math.max(0, metrics[key] + delta)
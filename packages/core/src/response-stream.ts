@@ -0,0 +1,49 @@
+import type { Response } from 'express'
+
+/**
+ * Receives the response of a handler streaming its body, written to the client as it comes
+ */
+export interface ResponseStream {
+  start(status: number, headers: Record<string, string>): void
+  /**
+   * Resolves once the chunk was handed to the socket, so handlers can't produce faster than the client reads
+   */
+  write(chunk: Buffer | string): Promise<void>
+  end(): void
+}
+
+export const createResponseStream = (res: Response): ResponseStream => ({
+  start(status, headers) {
+    Object.entries(headers).forEach(([key, value]) => res.setHeader(key, value))
+    // without a content-length the body is sent with chunked transfer encoding
+    res.status(status).flushHeaders()
+  },
+
+  write(chunk) {
+    return new Promise((resolve, reject) => {
+      if (res.destroyed || res.writableEnded) {
+        return reject(new Error('Response closed by the client'))
+      }
+
+      if (res.write(chunk)) {
+        return resolve()
+      }
+
+      const onDrain = () => {
+        res.off('close', onClose)
+        resolve()
+      }
+      const onClose = () => {
+        res.off('drain', onDrain)
+        reject(new Error('Response closed by the client'))
+      }
+
+      res.once('drain', onDrain)
+      res.once('close', onClose)
+    })
+  },
+
+  end() {
+    res.end()
+  },
+})
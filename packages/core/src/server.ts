@@ -12,6 +12,7 @@ import { type CronManager, setupCronHandlers } from './cron-handler'
 import { analyticsEndpoint } from './endpoints/analytics-endpoint'
 import { flowsConfigEndpoint } from './endpoints/flows-config-endpoint'
 import { flowsEndpoint } from './endpoints/flows-endpoint'
+import { metricsEndpoint } from './endpoints/metrics-endpoint'
 import { stepEndpoint } from './endpoints/step-endpoint'
 import { generateTraceId } from './generate-trace-id'
 import { isApiStep } from './guards'
@@ -22,6 +23,8 @@ import type { Motia } from './motia'
 import type { Tracer } from './observability'
 import { createTracerFactory } from './observability/tracer'
 import { Printer } from './printer'
+import { shutdownPythonWorkerPool } from './process-communication/python-worker-pool'
+import { createResponseStream } from './response-stream'
 import { runStreamCanAccess } from './run-stream-can-access'
 import { createSocketServer } from './socket-server'
 import { createStepHandlers, type MotiaEventManager } from './step-handlers'
@@ -296,11 +299,17 @@ export const createServer = (
           result = await step.handler(data, context)
         } else {
           const tracer = await motia.tracerFactory.createTracer(traceId, step, logger)
-          result = await callStepFile<ApiResponse>({ data, step, logger, tracer, traceId }, motia)
+          const response = createResponseStream(res)
+          result = await callStepFile<ApiResponse>({ data, step, logger, tracer, traceId, response }, motia)
         }
 
         trackEvent('api_call_success', { stepName })
 
+        if (res.headersSent) {
+          // the handler streamed the response
+          return
+        }
+
         if (!result) {
           console.log('no result')
           res.status(500).json({ error: 'Internal server error' })
@@ -327,6 +336,14 @@ export const createServer = (
         })
         logger.error('[API] Internal server error', { error })
         console.log(error)
+
+        if (res.headersSent) {
+          // the status of a streamed response was already sent, closing the connection without the last chunk
+          // tells the client the body is incomplete
+          res.destroy()
+          return
+        }
+
         res.status(500).json({ error: 'Internal server error' })
       }
     }
@@ -431,6 +448,7 @@ export const createServer = (
   flowsConfigEndpoint(app, process.cwd(), lockedData)
   analyticsEndpoint(app, process.cwd())
   stepEndpoint(app, lockedData)
+  metricsEndpoint(app)
 
   server.on('error', (error: NodeJS.ErrnoException) => {
     if (error.code !== 'EADDRINUSE') {
@@ -450,6 +468,7 @@ export const createServer = (
     if (adapters?.eventAdapter) {
       await adapters.eventAdapter.shutdown()
     }
+    shutdownPythonWorkerPool()
   }
 
   return { app, server, socketServer, close, removeRoute, addRoute, cronManager, motiaEventManager, motia, printer }
@@ -0,0 +1,216 @@
+import crypto from 'crypto'
+import { getRuntimeMetrics } from './observability/runtime-metrics'
+import type { Event, InternalStateManager, StepCacheConfig } from './types'
+
+export type CachedEmit = Pick<Event, 'topic' | 'data' | 'messageGroupId'>
+
+export type CachedResult<TData = unknown> = {
+  result?: TData
+  emits: CachedEmit[]
+  // epoch ms
+  expiresAt: number
+  // cache key of the entry, so expired entries can be found in the group
+  key?: string
+}
+
+export type StepCacheMetrics = {
+  hits: number
+  misses: number
+  // executions that waited for an identical one already running instead of running again
+  shared: number
+}
+
+export type StepCacheLookup<TData> = {
+  entry: CachedResult<TData>
+  // false when the result comes from this execution, its emits already went out
+  cached: boolean
+}
+
+const CACHE_GROUP_PREFIX = 'motia:step-cache:'
+const DEFAULT_MAX_ENTRIES = 1000
+
+export const getStepCacheGroup = (step: string) => `${CACHE_GROUP_PREFIX}${step}`
+
+const stableStringify = (value: unknown): string => {
+  if (Array.isArray(value)) {
+    return `[${value.map(stableStringify).join(',')}]`
+  }
+  if (value && typeof value === 'object') {
+    const entries = Object.keys(value)
+      .sort()
+      .filter((key) => (value as Record<string, unknown>)[key] !== undefined)
+      .map((key) => `${JSON.stringify(key)}:${stableStringify((value as Record<string, unknown>)[key])}`)
+    return `{${entries.join(',')}}`
+  }
+  return JSON.stringify(value) ?? 'null'
+}
+
+const getPath = (data: unknown, path: string): unknown =>
+  path.split('.').reduce<unknown>((value, key) => (value as Record<string, unknown> | undefined)?.[key], data)
+
+/**
+ * Hash of the input fields the result depends on (the whole input when the config has no key), key order
+ * doesn't change it
+ */
+export const getCacheKey = (config: StepCacheConfig, data: unknown): string => {
+  const fields = typeof config.key === 'string' ? [config.key] : config.key
+  const value = fields ? fields.map((path) => getPath(data, path)) : data
+
+  return crypto.createHash('sha256').update(stableStringify(value)).digest('hex')
+}
+
+/**
+ * Results of the steps with a cache config, with the events they emitted, kept in the state adapter until
+ * their ttl. Identical executions that arrive while one is running wait for its result instead of running too.
+ *
+ * Every write deletes the expired entries of the step and, over maxEntries, the ones closest to expiring, so
+ * distinct inputs don't grow the state without bounds.
+ */
+export class StepCache {
+  private inflight = new Map<string, Promise<StepCacheLookup<unknown>>>()
+  private metrics = new Map<string, StepCacheMetrics>()
+  // cache key -> expiresAt of the entries of each step, read from the state adapter on the first write
+  private entries = new Map<string, Promise<Map<string, number>>>()
+
+  async run<TData>(
+    state: InternalStateManager,
+    step: string,
+    config: StepCacheConfig,
+    data: unknown,
+    execute: (emits: CachedEmit[]) => Promise<TData | undefined>,
+  ): Promise<StepCacheLookup<TData>> {
+    const key = getCacheKey(config, data)
+    const flightKey = `${step}:${key}`
+    const metrics = this.getStepMetrics(step)
+    const running = this.inflight.get(flightKey) as Promise<StepCacheLookup<TData>> | undefined
+
+    if (running) {
+      metrics.shared++
+
+      try {
+        const { entry } = await running
+        return { entry, cached: true }
+      } catch {
+        // the failure belongs to the other execution, this one gets its own attempt
+        metrics.misses++
+        return { entry: { result: await execute([]), emits: [], expiresAt: 0 }, cached: false }
+      }
+    }
+
+    const lookup = this.lookup(state, step, config, key, execute)
+    this.inflight.set(flightKey, lookup)
+
+    try {
+      return await lookup
+    } finally {
+      this.inflight.delete(flightKey)
+    }
+  }
+
+  getMetrics(): Record<string, StepCacheMetrics> {
+    return Object.fromEntries(Array.from(this.metrics, ([step, metrics]) => [step, { ...metrics }]))
+  }
+
+  private async lookup<TData>(
+    state: InternalStateManager,
+    step: string,
+    config: StepCacheConfig,
+    key: string,
+    execute: (emits: CachedEmit[]) => Promise<TData | undefined>,
+  ): Promise<StepCacheLookup<TData>> {
+    const group = getStepCacheGroup(step)
+    const metrics = this.getStepMetrics(step)
+    const stored = await state.get<CachedResult<TData>>(group, key)
+
+    if (stored && stored.expiresAt > Date.now()) {
+      metrics.hits++
+      return { entry: stored, cached: true }
+    }
+
+    if (stored) {
+      await state.delete(group, key)
+    }
+
+    metrics.misses++
+
+    const emits: CachedEmit[] = []
+    const result = await execute(emits)
+    const entry: CachedResult<TData> = { result, emits, expiresAt: Date.now() + config.ttl * 1000, key }
+
+    await state.set(group, key, entry)
+
+    const entries = await this.getEntries(state, step)
+    entries.set(key, entry.expiresAt)
+    await this.prune(state, step, entries, config.maxEntries ?? DEFAULT_MAX_ENTRIES)
+
+    return { entry, cached: false }
+  }
+
+  private getEntries(state: InternalStateManager, step: string): Promise<Map<string, number>> {
+    let entries = this.entries.get(step)
+
+    if (!entries) {
+      entries = state
+        .getGroup<CachedResult>(getStepCacheGroup(step))
+        .then((stored) => new Map(stored.flatMap(({ key, expiresAt }) => (key ? [[key, expiresAt] as const] : []))))
+        .catch((error) => {
+          this.entries.delete(step)
+          throw error
+        })
+      this.entries.set(step, entries)
+    }
+
+    return entries
+  }
+
+  /**
+   * Deletes the expired entries, then the ones closest to expiring until the step has maxEntries
+   */
+  private async prune(
+    state: InternalStateManager,
+    step: string,
+    entries: Map<string, number>,
+    maxEntries: number,
+  ): Promise<void> {
+    const now = Date.now()
+    const live: Array<[string, number]> = []
+    const evicted: string[] = []
+
+    entries.forEach((expiresAt, key) => (expiresAt > now ? live.push([key, expiresAt]) : evicted.push(key)))
+
+    if (live.length > maxEntries) {
+      live.sort(([, a], [, b]) => a - b)
+      evicted.push(...live.slice(0, live.length - maxEntries).map(([key]) => key))
+    }
+
+    evicted.forEach((key) => entries.delete(key))
+    await Promise.all(evicted.map((key) => state.delete(getStepCacheGroup(step), key)))
+  }
+
+  private getStepMetrics(step: string): StepCacheMetrics {
+    let metrics = this.metrics.get(step)
+    if (!metrics) {
+      metrics = { hits: 0, misses: 0, shared: 0 }
+      this.metrics.set(step, metrics)
+    }
+    return metrics
+  }
+}
+
+let stepCache: StepCache | undefined
+
+export const getStepCache = (): StepCache => {
+  if (!stepCache) {
+    const cache = new StepCache()
+
+    getRuntimeMetrics().collect('step-cache', (metrics) => {
+      Object.entries(cache.getMetrics()).forEach(([step, { hits, misses, shared }]) => {
+        metrics.set('motia_step_cache_lookups_total', { step, result: 'hit' }, hits)
+        metrics.set('motia_step_cache_lookups_total', { step, result: 'miss' }, misses)
+        metrics.set('motia_step_cache_lookups_total', { step, result: 'shared' }, shared)
+      })
+    })
+    stepCache = cache
+  }
+  return stepCache
+}
@@ -1,11 +1,14 @@
 import type { ChildProcess } from 'child_process'
+import type { Readable } from 'stream'
+import { type BinaryMessage, BinaryFrameReader } from './process-communication/binary-frames'
 import type {
   MessageCallback,
   RpcHandler,
   RpcProcessorInterface,
 } from './process-communication/rpc-processor-interface'
+import type { RpcRecorder } from './process-communication/rpc-recording'
 
-export type RpcMessage = {
+export type RpcMessage = BinaryMessage & {
   type: 'rpc_request'
   id: string | undefined
   method: string
@@ -16,9 +19,19 @@ export class RpcProcessor implements RpcProcessorInterface {
   private handlers: Record<string, RpcHandler<any, any>> = {}
 
   private messageCallback?: MessageCallback<any>
+  private recorder?: RpcRecorder
   private isClosed = false
+  private binaryFrames?: BinaryFrameReader
+  // messages waiting for their binary frames, the following ones wait behind them to keep the order
+  private decoding?: Promise<void>
 
-  constructor(private child: ChildProcess) {}
+  constructor(private child: ChildProcess) {
+    const binaryPipe = child.stdio[4] as Readable | null | undefined
+
+    if (binaryPipe) {
+      this.binaryFrames = new BinaryFrameReader(binaryPipe)
+    }
+  }
 
   handler<TInput, TOutput = unknown>(method: string, handler: RpcHandler<TInput, TOutput>) {
     this.handlers[method] = handler
@@ -28,6 +41,10 @@ export class RpcProcessor implements RpcProcessorInterface {
     this.messageCallback = callback
   }
 
+  record(recorder?: RpcRecorder): void {
+    this.recorder = recorder
+  }
+
   async handle(method: string, input: unknown) {
     const handler = this.handlers[method]
     if (!handler) {
@@ -44,24 +61,28 @@ export class RpcProcessor implements RpcProcessorInterface {
         result: error ? undefined : result,
         error: error ? String(error) : undefined,
       }
+      this.recorder?.response(id, result, error)
       this.child.send(responseMessage)
     }
   }
 
   async init() {
     this.child.on('message', (msg: any) => {
-      // Call generic message callback if registered
-      if (this.messageCallback) {
-        this.messageCallback(msg)
+      if (!this.decoding && !msg?.frames) {
+        return this.dispatch(msg)
       }
 
-      // Handle RPC requests specifically
-      if (msg && msg.type === 'rpc_request') {
-        const { id, method, args } = msg as RpcMessage
-        this.handle(method, args)
-          .then((result) => this.response(id, result, null))
-          .catch((error) => this.response(id, null, error))
-      }
+      const binaryFrames = this.binaryFrames
+      const decoding = (this.decoding ?? Promise.resolve())
+        .then(() => (binaryFrames && msg.frames ? binaryFrames.decode(msg) : msg))
+        .then((decoded) => this.dispatch(decoded))
+        .finally(() => {
+          if (this.decoding === decoding) {
+            this.decoding = undefined
+          }
+        })
+
+      this.decoding = decoding
     })
 
     this.child.on('exit', () => {
@@ -75,9 +96,26 @@ export class RpcProcessor implements RpcProcessorInterface {
     })
   }
 
+  private dispatch(msg: any) {
+    // Call generic message callback if registered
+    if (this.messageCallback) {
+      this.messageCallback(msg)
+    }
+
+    // Handle RPC requests specifically
+    if (msg && msg.type === 'rpc_request') {
+      const { id, method, args } = msg as RpcMessage
+      this.recorder?.request(id, method, args)
+      this.handle(method, args)
+        .then((result) => this.response(id, result, null))
+        .catch((error) => this.response(id, null, error))
+    }
+  }
+
   close() {
     this.isClosed = true
     this.messageCallback = undefined
+    this.recorder = undefined
     this.handlers = {}
   }
 }
@@ -1,12 +1,14 @@
 import type { ChildProcess } from 'child_process'
 import readline from 'readline'
+import { type BinaryMessage, decodeBinary } from './process-communication/binary-frames'
 import type {
   MessageCallback,
   RpcHandler,
   RpcProcessorInterface,
 } from './process-communication/rpc-processor-interface'
+import type { RpcRecorder } from './process-communication/rpc-recording'
 
-export type RpcMessage = {
+export type RpcMessage = BinaryMessage & {
   type: 'rpc_request'
   id: string | undefined
   method: string
@@ -17,6 +19,7 @@ export class RpcStdinProcessor implements RpcProcessorInterface {
   private handlers: Record<string, RpcHandler<any, any>> = {}
 
   private messageCallback?: MessageCallback<any>
+  private recorder?: RpcRecorder
   private isClosed = false
   private rl?: readline.Interface
 
@@ -30,6 +33,10 @@ export class RpcStdinProcessor implements RpcProcessorInterface {
     this.messageCallback = callback
   }
 
+  record(recorder?: RpcRecorder): void {
+    this.recorder = recorder
+  }
+
   async handle(method: string, input: unknown) {
     const handler = this.handlers[method]
     if (!handler) {
@@ -46,6 +53,7 @@ export class RpcStdinProcessor implements RpcProcessorInterface {
         result: error ? undefined : result,
         error: error ? String(error) : undefined,
       }
+      this.recorder?.response(id, result, error)
       const messageStr = JSON.stringify(responseMessage)
       this.child.stdin.write(messageStr + '\n')
     }
@@ -69,8 +77,11 @@ export class RpcStdinProcessor implements RpcProcessorInterface {
 
           // Handle RPC requests specifically
           if (msg && msg.type === 'rpc_request') {
-            const { id, method, args } = msg as RpcMessage
-            this.handle(method, args)
+            const { id, method, args, binary } = msg as RpcMessage
+            // bytes are embedded as base64 in the messages of the runner
+            const input = binary ? decodeBinary(args) : args
+            this.recorder?.request(id, method, input)
+            this.handle(method, input)
               .then((result) => this.response(id, result, null))
               .catch((error) => this.response(id, null, error))
           }
@@ -95,6 +106,7 @@ export class RpcStdinProcessor implements RpcProcessorInterface {
   close() {
     this.isClosed = true
     this.messageCallback = undefined
+    this.recorder = undefined
     this.handlers = {}
     if (this.rl) {
       this.rl.removeAllListeners()
@@ -1,10 +1,15 @@
 import type { EventAdapter, SubscriptionHandle } from './adapters/interfaces/event-adapter.interface'
 import { callStepFile } from './call-step-file'
+import { type BatchFailures, EventBatcher } from './event-batcher'
+import { generateTraceId } from './generate-trace-id'
 import { getQueueConfigWithDefaults } from './infrastructure-validator/defaults'
 import { validateInfrastructureConfig } from './infrastructure-validator/validations'
-import { globalLogger } from './logger'
+import { globalLogger, type Logger } from './logger'
 import type { Motia } from './motia'
-import type { Event, EventConfig, Step } from './types'
+import type { Tracer } from './observability'
+import { getRuntimeMetrics } from './observability/runtime-metrics'
+import type { TraceError } from './observability/types'
+import type { Event, EventBatchConfig, EventConfig, Step } from './types'
 import { validateEventInput } from './validate-event-input'
 
 export type MotiaEventManager = {
@@ -12,9 +17,20 @@ export type MotiaEventManager = {
   removeHandler: (step: Step<EventConfig>) => void
 }
 
+type BatchItem = { event: Event; logger: Logger; tracer: Tracer }
+
+// what Python handlers of batch steps report, the errors of the inputs that failed by their position
+type BatchResult = { failed?: Record<string, TraceError> }
+
+const toTraceError = (error: unknown): TraceError => {
+  const { message, code, stack } = (error ?? {}) as Partial<TraceError>
+  return typeof message === 'string' ? { message, code, stack } : { message: String(error) }
+}
+
 export const createStepHandlers = (motia: Motia, eventAdapter: EventAdapter): MotiaEventManager => {
   const eventSteps = motia.lockedData.eventSteps()
   const handlerMap = new Map<string, Array<SubscriptionHandle>>()
+  const batcherMap = new Map<string, Array<EventBatcher<BatchItem>>>()
 
   globalLogger.debug(`[step handler] creating step handlers for ${eventSteps.length} steps`)
 
@@ -23,6 +39,45 @@ export const createStepHandlers = (motia: Motia, eventAdapter: EventAdapter): Mo
     return rest
   }
 
+  /**
+   * The events of a batch run in one execution with its own trace, the trace of each event ends with the outcome
+   * of its input
+   */
+  const createBatcher = (step: Step<EventConfig>, topic: string, batch: EventBatchConfig) =>
+    new EventBatcher<BatchItem>(batch, async (items) => {
+      const { config } = step
+      const traceId = generateTraceId()
+      const logger = motia.loggerFactory.create({ traceId, flows: config.flows ?? [], stepName: config.name })
+      const tracer = await motia.tracerFactory.createTracer(traceId, step, logger)
+      const data = items.map(({ event }) => event.data)
+      let result: BatchResult | undefined
+
+      getRuntimeMetrics().inc('motia_event_batches_total', { step: config.name })
+      getRuntimeMetrics().inc('motia_event_batch_items_total', { step: config.name }, items.length)
+
+      try {
+        result = await callStepFile<BatchResult>(
+          { step, data, traceId, tracer, logger, infrastructure: config.infrastructure, topic },
+          motia,
+        )
+      } catch (error) {
+        items.forEach((item) => item.tracer.end(toTraceError(error)))
+        throw error
+      }
+
+      const failures: BatchFailures = {}
+      Object.entries(result?.failed ?? {}).forEach(([index, error]) => {
+        failures[Number(index)] = Object.assign(new Error(error.message), error)
+      })
+
+      items.forEach((item, index) => {
+        item.logger.debug('[step handler] event processed in a batch', { batchTraceId: traceId, size: items.length })
+        item.tracer.end(index in failures ? toTraceError(failures[index]) : undefined)
+      })
+
+      return failures
+    })
+
   const createHandler = (step: Step<EventConfig>) => {
     const { config, filePath } = step
     const { subscribes, name } = config
@@ -52,8 +107,19 @@ export const createStepHandlers = (motia: Motia, eventAdapter: EventAdapter): Mo
 
     const queueConfig = getQueueConfigWithDefaults(config.infrastructure)
     const handlers: Array<SubscriptionHandle> = []
+    const batchers: Array<EventBatcher<BatchItem>> = []
+
+    if (config.batch && queueConfig.type === 'standard') {
+      // adapters have to deliver enough events at once to fill a batch
+      queueConfig.concurrency = Math.max(queueConfig.concurrency ?? 0, config.batch.maxSize)
+    }
 
     subscribes.forEach(async (subscribe) => {
+      const batcher = config.batch ? createBatcher(step, subscribe, config.batch) : undefined
+      if (batcher) {
+        batchers.push(batcher)
+      }
+
       const handler = async (event: Event) => {
         const { data, traceId, flows } = event
 
@@ -69,8 +135,15 @@ export const createStepHandlers = (motia: Motia, eventAdapter: EventAdapter): Mo
 
         validateEventInput(step, event, motia)
 
+        if (batcher) {
+          return batcher.add({ event, logger, tracer })
+        }
+
         // Continue execution even if validation failed
-        await callStepFile({ step, data, traceId, tracer, logger, infrastructure: config.infrastructure }, motia)
+        await callStepFile(
+          { step, data, traceId, tracer, logger, infrastructure: config.infrastructure, topic: subscribe },
+          motia,
+        )
       }
 
       const subscriptionHandle = await eventAdapter.subscribe(subscribe, name, handler, queueConfig)
@@ -78,6 +151,7 @@ export const createStepHandlers = (motia: Motia, eventAdapter: EventAdapter): Mo
     })
 
     handlerMap.set(filePath, handlers)
+    batcherMap.set(filePath, batchers)
   }
 
   const removeHandler = (step: Step<EventConfig>) => {
@@ -95,6 +169,10 @@ export const createStepHandlers = (motia: Motia, eventAdapter: EventAdapter): Mo
       })
       handlerMap.delete(filePath)
     }
+
+    // the events already gathered still run with the step they were delivered to
+    batcherMap.get(filePath)?.forEach((batcher) => batcher.flush())
+    batcherMap.delete(filePath)
   }
 
   eventSteps.forEach(createHandler)
@@ -43,6 +43,21 @@ const emits = z.array(
   ]),
 )
 
+const cacheSchema = z
+  .object({
+    ttl: z.number().positive(),
+    key: z.union([z.string(), z.array(z.string())]).optional(),
+    maxEntries: z.number().int().min(1).optional(),
+  })
+  .strict()
+
+const batchSchema = z
+  .object({
+    maxSize: z.number().int().min(1),
+    maxWaitMs: z.number().min(0),
+  })
+  .strict()
+
 const noopSchema = z
   .object({
     type: z.literal('noop'),
@@ -64,6 +79,9 @@ const eventSchema = z
     virtualEmits: emits.optional(),
     virtualSubscribes: z.array(z.string()).optional(),
     input: z.union([jsonSchema, z.object({}), z.null()]).optional(),
+    typedInput: z.boolean().optional(),
+    cache: cacheSchema.optional(),
+    batch: batchSchema.optional(),
     flows: z.array(z.string()).optional(),
     includeFiles: z.array(z.string()).optional(),
     infrastructure: infrastructureSchema.optional(),
@@ -85,6 +103,7 @@ const apiSchema = z
     middleware: z.array(z.any()).optional(),
     queryParams: z.array(z.object({ name: z.string(), description: z.string().optional() })).optional(),
     bodySchema: z.union([jsonSchema, z.object({}), z.null()]).optional(),
+    typedInput: z.boolean().optional(),
     responseSchema: z.record(z.string(), jsonSchema).optional(),
   })
   .strict()
@@ -39,6 +39,14 @@ export type HandlerConfig = {
   ram: number
   cpu?: number
   timeout: number
+  /**
+   * Executions of a Python step allowed at once
+   */
+  concurrency?: number
+  /**
+   * Share of the Python execution slots the step gets when other steps are waiting for one too, 1 by default
+   */
+  weight?: number
 }
 
 export type QueueConfig =
@@ -61,6 +69,32 @@ export type InfrastructureConfig = {
   queue?: Partial<QueueConfig>
 }
 
+export type StepCacheConfig = {
+  /**
+   * Seconds a result is served from the cache
+   */
+  ttl: number
+  /**
+   * Input fields the result depends on, as dot paths ('user.id'), the whole input when not set
+   */
+  key?: string | string[]
+  /**
+   * Entries kept for the step, the ones closest to expiring are evicted first (1000 by default)
+   */
+  maxEntries?: number
+}
+
+export type EventBatchConfig = {
+  /**
+   * Events given to the handler at once at most
+   */
+  maxSize: number
+  /**
+   * How long the first event of a batch waits for the others, in milliseconds
+   */
+  maxWaitMs: number
+}
+
 export type EventConfig = {
   type: 'event'
   name: string
@@ -70,6 +104,21 @@ export type EventConfig = {
   virtualEmits?: Emit[]
   virtualSubscribes?: string[]
   input?: StepSchemaInput
+  /**
+   * Python steps get an instance of the model of their input (the body for API steps) instead of a dict,
+   * invalid input is rejected before the handler runs.
+   */
+  typedInput?: boolean
+  /**
+   * For steps whose result only depends on their input: identical input within the ttl gets the result
+   * and the emits of the first execution instead of running the handler again.
+   */
+  cache?: StepCacheConfig
+  /**
+   * The handler gets a list with the input of up to maxSize events of a topic. Python handlers can return a list
+   * with a result for each input, inputs whose result is an exception are retried on their own.
+   */
+  batch?: EventBatchConfig
   flows?: string[]
   /**
    * Files to include in the step bundle.
@@ -113,6 +162,11 @@ export interface ApiRouteConfig {
   flows?: string[]
   middleware?: ApiMiddleware<any, any, any>[]
   bodySchema?: StepSchemaInput
+  /**
+   * Python steps get an instance of the model of their input (the body for API steps) instead of a dict,
+   * invalid input is rejected before the handler runs.
+   */
+  typedInput?: boolean
   responseSchema?: Record<number, StepSchemaInput>
   queryParams?: QueryParam[]
   /**
@@ -0,0 +1,95 @@
+/**
+ * Benchmarks the Python bundle optimizations: bundle size and cold start import time of the dependencies
+ * as installed by uv, compared with the same tree pruned and precompiled to bytecode.
+ *
+ * Requires uv and an interpreter matching MOTIA_PYTHON_VERSION (3.13 by default).
+ *
+ * Usage: pnpm tsx benchmarks/python-bundle.bench.ts [requirements] [modules] [runs]
+ *   pnpm tsx benchmarks/python-bundle.bench.ts pydantic,requests pydantic,requests 5
+ */
+import { spawnSync } from 'child_process'
+import fs from 'fs'
+import os from 'os'
+import path from 'path'
+import { Archiver } from '../src/cloud/build/builders/archiver'
+import { BundleOptimizer } from '../src/cloud/build/builders/python/bundle-optimizer'
+import { getDirectorySize } from '../src/cloud/build/builders/python/dependency-cache'
+import { UvPackager } from '../src/cloud/build/builders/python/uv-packager'
+
+const requirements = (process.argv[2] ?? 'pydantic,requests').split(',')
+const modules = (process.argv[3] ?? 'pydantic,requests').split(',')
+const runs = Number(process.argv[4] ?? 5)
+
+const median = (values: number[]) => values.sort((a, b) => a - b)[Math.floor(values.length / 2)]
+const toMB = (size: number) => (size / 1024 / 1024).toFixed(2)
+
+const coldStart = (python: string, cwd: string): number => {
+  const code = `import time; t = time.perf_counter(); import ${modules.join(', ')}; print((time.perf_counter() - t) * 1000)`
+
+  return median(
+    Array.from({ length: runs }, () => {
+      // bytecode is never written, so every run of the plain tree compiles the sources like a cold start would
+      const result = spawnSync(python, ['-c', code], {
+        cwd,
+        env: { ...process.env, PYTHONDONTWRITEBYTECODE: '1' },
+        encoding: 'utf-8',
+      })
+
+      if (result.status !== 0) {
+        throw new Error(result.stderr)
+      }
+
+      return Number(result.stdout.trim())
+    }),
+  )
+}
+
+const compressedSize = async (dir: string, outfile: string) => {
+  const archive = new Archiver(outfile)
+  archive.appendDirectory(dir, '/')
+  return (await archive.finalize()).compressedSize
+}
+
+const main = async () => {
+  const packager = new UvPackager()
+  const python = await packager.findPython()
+
+  if (!python) {
+    throw new Error(`No Python ${packager.config.pythonVersion} interpreter found, install it with uv python install`)
+  }
+
+  const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'motia-python-bundle-'))
+  const plainDir = path.join(dir, 'plain')
+  const optimizedDir = path.join(dir, 'optimized')
+
+  try {
+    fs.mkdirSync(plainDir)
+    fs.writeFileSync(path.join(dir, 'requirements.txt'), requirements.join('\n'))
+    await packager.packageDependencies(plainDir, path.join(dir, 'requirements.txt'))
+    fs.cpSync(plainDir, optimizedDir, { recursive: true })
+
+    const optimizer = new BundleOptimizer(python)
+    await optimizer.optimize(optimizedDir, { prune: true })
+
+    const { compiledFiles, prunedFiles } = optimizer.getStats()
+
+    console.table([
+      {
+        layout: 'plain',
+        'uncompressed (MB)': toMB(getDirectorySize(plainDir)),
+        'compressed (MB)': toMB(await compressedSize(plainDir, path.join(dir, 'plain.zip'))),
+        'cold start (ms)': coldStart(python, plainDir).toFixed(1),
+      },
+      {
+        layout: `optimized (${compiledFiles} compiled, ${prunedFiles} pruned)`,
+        'uncompressed (MB)': toMB(getDirectorySize(optimizedDir)),
+        'compressed (MB)': toMB(await compressedSize(optimizedDir, path.join(dir, 'optimized.zip'))),
+        'cold start (ms)': coldStart(python, optimizedDir).toFixed(1),
+      },
+    ])
+  } finally {
+    fs.rmSync(dir, { recursive: true, force: true })
+  }
+}
+
+main()
@@ -0,0 +1,80 @@
+/**
+ * Benchmarks the import extraction of the Python build: the ANTLR grammar parsing one file at a time against
+ * extract_imports.py parsing every file in one batch with the stdlib `ast` module.
+ *
+ * Every tenth file uses syntax the ANTLR grammar doesn't support (`match` statements, PEP 695 generics).
+ *
+ * Usage: pnpm tsx benchmarks/python-imports.bench.ts [fileCounts] [linesPerFile]
+ *   pnpm tsx benchmarks/python-imports.bench.ts 100,1000 400
+ */
+import fs from 'fs'
+import os from 'os'
+import path from 'path'
+import { batchExtractImports } from '../src/cloud/build/builders/python/python-data/batch-extract-imports'
+import { getImportsFromFile } from '../src/cloud/build/builders/python/python-data/get-dependencies-from-file'
+
+const python = process.env.PYTHON ?? 'python3'
+const fileCounts = (process.argv[2] ?? '100,1000').split(',').map(Number)
+const linesPerFile = Number(process.argv[3] ?? 400)
+
+const createFile = (index: number): string => {
+  const lines = ['import os', 'import json', 'from typing import Any', `from .module${index + 1} import helper`]
+
+  for (let i = 0; lines.length < linesPerFile; i++) {
+    lines.push(`def function_${i}(value: Any, items: list[int]) -> dict:`)
+    lines.push(`    result = {"index": ${i}, "items": [item * 2 for item in items if item % 2 == 0]}`)
+    lines.push('    return json.loads(json.dumps(result))')
+    lines.push('')
+  }
+
+  if (index % 10 === 0) {
+    lines.push('class Box[T]:', '    value: T', '')
+    lines.push('match os.name:', "    case 'nt':", '        pass')
+  }
+
+  return lines.join('\n')
+}
+
+const results = fileCounts.map((count) => {
+  const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'motia-python-imports-'))
+
+  try {
+    const files = Array.from({ length: count }, (_, index) => {
+      const file = path.join(dir, `module${index}.py`)
+      fs.writeFileSync(file, createFile(index))
+      return file
+    })
+
+    let antlrErrors = 0
+    const antlrStart = performance.now()
+
+    for (const file of files) {
+      try {
+        getImportsFromFile(fs.readFileSync(file, 'utf-8'), file)
+      } catch (_error) {
+        antlrErrors++
+      }
+    }
+
+    const antlrTime = performance.now() - antlrStart
+    const astStart = performance.now()
+    const astResults = batchExtractImports(python, files)
+    const astTime = performance.now() - astStart
+
+    if (!astResults) {
+      throw new Error(`Could not run ${python}`)
+    }
+
+    return {
+      files: count,
+      'ANTLR (ms)': antlrTime.toFixed(0),
+      'ANTLR errors': antlrErrors,
+      'ast batch (ms)': astTime.toFixed(0),
+      'ast errors': Object.values(astResults).filter((result) => result.error).length,
+    }
+  } finally {
+    fs.rmSync(dir, { recursive: true, force: true })
+  }
+})
+
+console.table(results)
@@ -0,0 +1,108 @@
+/**
+ * Benchmarks the generated Python router bundle: cold start (importing router.py) and route matching
+ * latency as the number of routes grows.
+ *
+ * Usage: pnpm tsx benchmarks/python-router.bench.ts [routeCounts] [runs]
+ *   pnpm tsx benchmarks/python-router.bench.ts 10,100,1000 5
+ */
+import { spawnSync } from 'child_process'
+import fs from 'fs'
+import os from 'os'
+import path from 'path'
+import { type PythonRouterRoute, renderPythonRouter } from '../src/cloud/build/builders/python/render-router'
+
+const python = process.env.PYTHON ?? 'python3'
+const routeCounts = (process.argv[2] ?? '10,100,1000').split(',').map(Number)
+const runs = Number(process.argv[3] ?? 5)
+
+// Every step pays some imports at load time, like a real step importing pydantic or an SDK would
+const stepTemplate = (index: number) => `import json
+import decimal
+import email.mime.multipart
+import http.client
+import xml.dom.minidom
+
+config = {"type": "api", "name": "Route${index}", "path": "/resource${index}/:id", "method": "GET", "emits": []}
+
+async def handler(req, context):
+    return {"status": 200, "body": {"id": req["pathParams"]["id"]}}
+`
+
+const createProject = (count: number): { dir: string; samplePaths: string[] } => {
+  const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'motia-python-router-'))
+  const stepsDir = path.join(dir, 'steps')
+  const routes: PythonRouterRoute[] = []
+  const samplePaths: string[] = []
+
+  fs.mkdirSync(stepsDir)
+  fs.writeFileSync(path.join(stepsDir, '__init__.py'), '')
+
+  for (let i = 0; i < count; i++) {
+    fs.writeFileSync(path.join(stepsDir, `route${i}_step.py`), stepTemplate(i))
+
+    const isParam = i % 2 === 0
+    routes.push({
+      stepName: `Route${i}`,
+      method: 'GET',
+      path: isParam ? `/resource${i}/:id` : `/resource${i}/list`,
+      moduleName: `steps.route${i}_step`,
+    })
+    samplePaths.push(isParam ? `/resource${i}/abc` : `/resource${i}/list`)
+  }
+
+  fs.writeFileSync(path.join(dir, 'router.py'), renderPythonRouter(routes))
+
+  return { dir, samplePaths }
+}
+
+const runPython = (cwd: string, code: string, env: Record<string, string> = {}): number => {
+  const result = spawnSync(python, ['-c', code], {
+    cwd,
+    env: { ...process.env, PYTHONDONTWRITEBYTECODE: '1', ...env },
+    encoding: 'utf-8',
+  })
+
+  if (result.status !== 0) {
+    throw new Error(result.stderr)
+  }
+
+  return Number(result.stdout.trim())
+}
+
+const median = (values: number[]) => values.sort((a, b) => a - b)[Math.floor(values.length / 2)]
+
+const coldStart = (cwd: string, env: Record<string, string> = {}) => {
+  const code = 'import time; t = time.perf_counter(); import router; print((time.perf_counter() - t) * 1000)'
+  return median(Array.from({ length: runs }, () => runPython(cwd, code, env)))
+}
+
+const matchLatency = (cwd: string, samplePaths: string[]) => {
+  const code = `
+import time, router
+paths = ${JSON.stringify(samplePaths)}
+iterations = max(1, 200000 // len(paths))
+t = time.perf_counter()
+for _ in range(iterations):
+    for p in paths:
+        router.match_route('GET', p)
+print((time.perf_counter() - t) * 1e9 / (iterations * len(paths)))
+`
+  return runPython(cwd, code)
+}
+
+const results = routeCounts.map((count) => {
+  const { dir, samplePaths } = createProject(count)
+
+  try {
+    return {
+      routes: count,
+      'cold start lazy (ms)': coldStart(dir).toFixed(2),
+      'cold start warmup (ms)': coldStart(dir, { MOTIA_ROUTER_WARMUP: 'true' }).toFixed(2),
+      'match (ns/op)': matchLatency(dir, samplePaths).toFixed(0),
+    }
+  } finally {
+    fs.rmSync(dir, { recursive: true, force: true })
+  }
+})
+
+console.table(results)
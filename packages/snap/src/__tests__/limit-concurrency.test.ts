@@ -0,0 +1,38 @@
+import { limitConcurrency } from '../utils/limit-concurrency'
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms))
+
+describe('limitConcurrency', () => {
+  test('never runs more tasks than the limit at once', async () => {
+    const limit = limitConcurrency(2)
+    let active = 0
+    let maxActive = 0
+
+    const results = await Promise.all(
+      [1, 2, 3, 4, 5].map((value) =>
+        limit(async () => {
+          active++
+          maxActive = Math.max(maxActive, active)
+          await sleep(5)
+          active--
+          return value * 2
+        }),
+      ),
+    )
+
+    expect(results).toEqual([2, 4, 6, 8, 10])
+    expect(maxActive).toBe(2)
+  })
+
+  test('keeps running queued tasks after a failure', async () => {
+    const limit = limitConcurrency(1)
+
+    const failed = limit(async () => {
+      throw new Error('failed')
+    })
+    const succeeded = limit(async () => 'ok')
+
+    await expect(failed).rejects.toThrow('failed')
+    await expect(succeeded).resolves.toBe('ok')
+  })
+})
@@ -122,6 +122,18 @@ program
     }),
   )
 
+program
+  .command('replay <recording>')
+  .description('Run a Python step again against an RPC recording and compare its outputs and timing')
+  .option('--no-real-timing', 'Answer the requests of the step right away instead of after the recorded time')
+  .action(
+    wrapAction(async (recording: string, options: any) => {
+      const { replay } = await import('./replay')
+      const matches = await replay(recording, { baseDir: process.cwd(), realTiming: options.realTiming })
+      process.exit(matches ? 0 : 1)
+    }),
+  )
+
 program
   .command('emit')
   .description('Emit an event to the Motia server')
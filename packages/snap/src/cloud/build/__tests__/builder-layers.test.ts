@@ -0,0 +1,42 @@
+import type { Step } from '@motiadev/core'
+import type { BuildListener } from '../../new-deployment/listeners/listener.types'
+import { Builder } from '../builder'
+
+describe('Builder layers', () => {
+  const createStep = (name: string): Step =>
+    ({
+      filePath: `/project/steps/${name}_step.py`,
+      version: '1',
+      config: { type: 'event', name, subscribes: ['test'], emits: [] },
+    }) as unknown as Step
+
+  test('has no layers config when dependencies are vendored', () => {
+    const builder = new Builder('/project', {} as BuildListener)
+
+    expect(builder.getLayersConfig()).toBeUndefined()
+  })
+
+  test('shares a layer between the bundles using it', () => {
+    const builder = new Builder('/project', {} as BuildListener)
+    const layerPath = 'python/layers/abc.zip'
+
+    for (const name of ['a', 'b']) {
+      builder.registerStep({
+        entrypointPath: `/steps/${name}_step.py`,
+        bundlePath: `${name}.zip`,
+        step: createStep(name),
+        type: 'python',
+      })
+    }
+
+    builder.registerLayer({ layerPath, bundlePath: 'a.zip', type: 'python', requirements: ['pydantic'] })
+    builder.registerLayer({ layerPath, bundlePath: 'b.zip', type: 'python', requirements: ['pydantic'] })
+    builder.registerLayer({ layerPath, bundlePath: 'router-python.zip', type: 'python', requirements: ['pydantic'] })
+
+    expect(builder.getLayersConfig()).toEqual({
+      [layerPath]: { type: 'python', requirements: ['pydantic'], usedBy: ['a.zip', 'b.zip', 'router-python.zip'] },
+    })
+    expect(builder.stepsConfig['a.zip'].layer).toBe(layerPath)
+    expect(builder.stepsConfig['b.zip'].layer).toBe(layerPath)
+  })
+})
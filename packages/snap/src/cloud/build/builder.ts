@@ -8,6 +8,19 @@ export type BuildStepConfig = {
   entrypointPath: string
   config: StepConfig
   filePath: string
+  /**
+   * Path of the dependency layer the bundle depends on, only set when dependencies are packaged in layers
+   */
+  layer?: string
+}
+
+export type BuildLayerConfig = {
+  type: StepType
+  requirements: string[]
+  /**
+   * Step and router bundles that depend on this layer
+   */
+  usedBy: string[]
 }
 
 export type BuildStreamConfig = {
@@ -18,10 +31,12 @@ export type BuildStreamConfig = {
 export type BuildStepsConfig = Record<string, BuildStepConfig>
 export type BuildStreamsConfig = Record<string, BuildStreamConfig>
 export type BuildRoutersConfig = Partial<Record<StepType, string>>
+export type BuildLayersConfig = Record<string, BuildLayerConfig>
 export type StepsConfigFile = {
   steps: BuildStepsConfig
   streams: BuildStreamsConfig
   routers: BuildRoutersConfig
+  layers?: BuildLayersConfig
 }
 
 export interface RouterBuildResult {
@@ -33,12 +48,17 @@ export interface RouterBuildResult {
 export interface StepBuilder {
   build(step: Step): Promise<void>
   buildApiSteps(steps: Step<ApiRouteConfig>[]): Promise<RouterBuildResult>
+  /**
+   * Called once after all steps and routers are built
+   */
+  finalize?(): Promise<void>
 }
 
 export class Builder {
   public readonly stepsConfig: BuildStepsConfig
   public readonly streamsConfig: BuildStreamsConfig
   public routersConfig: BuildRoutersConfig
+  public readonly layersConfig: BuildLayersConfig
   public readonly stepCompressedSizes: Map<string, number> = new Map()
   public readonly stepUncompressedSizes: Map<string, number> = new Map()
   public readonly routerCompressedSizes: Map<string, number> = new Map()
@@ -53,6 +73,7 @@ export class Builder {
     this.stepsConfig = {}
     this.streamsConfig = {}
     this.routersConfig = {}
+    this.layersConfig = {}
   }
 
   registerBuilder(type: string, builder: StepBuilder) {
@@ -77,6 +98,27 @@ export class Builder {
     }
   }
 
+  registerLayer(args: { layerPath: string; bundlePath: string; type: StepType; requirements: string[] }) {
+    const layer = (this.layersConfig[args.layerPath] ??= {
+      type: args.type,
+      requirements: args.requirements,
+      usedBy: [],
+    })
+
+    layer.usedBy.push(args.bundlePath)
+
+    if (this.stepsConfig[args.bundlePath]) {
+      this.stepsConfig[args.bundlePath].layer = args.layerPath
+    }
+  }
+
+  /**
+   * Returns the layers config, undefined when dependencies are vendored in each bundle
+   */
+  getLayersConfig(): BuildLayersConfig | undefined {
+    return Object.keys(this.layersConfig).length > 0 ? this.layersConfig : undefined
+  }
+
   recordStepSize(step: Step, compressedSize: number, uncompressedSize: number) {
     this.stepCompressedSizes.set(step.filePath, compressedSize)
     this.stepUncompressedSizes.set(step.filePath, uncompressedSize)
@@ -125,6 +167,12 @@ export class Builder {
     }
   }
 
+  async finalize(): Promise<void> {
+    for (const builder of this.builders.values()) {
+      await builder.finalize?.()
+    }
+  }
+
   private determineStepType(step: Step): string {
     if (step.config.type === 'noop') {
       return 'noop'
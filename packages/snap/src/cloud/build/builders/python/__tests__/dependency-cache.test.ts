@@ -0,0 +1,86 @@
+import { jest } from '@jest/globals'
+import fs from 'fs'
+import os from 'os'
+import path from 'path'
+import { DependencyCache } from '../dependency-cache'
+
+const config = { pythonVersion: '3.13', platform: 'x86_64-manylinux2014', onlyBinary: true }
+
+const writeFile = (size: number) => async (targetDir: string) => {
+  fs.writeFileSync(path.join(targetDir, 'module.py'), 'x'.repeat(size))
+}
+
+describe('DependencyCache', () => {
+  let tmpDir: string
+
+  beforeEach(() => {
+    tmpDir = fs.mkdtempSync(path.join(os.tmpdir(), 'motia-dependency-cache-'))
+  })
+
+  afterEach(() => {
+    fs.rmSync(tmpDir, { recursive: true, force: true })
+  })
+
+  test('keys on the requirement set and the install target', () => {
+    const cache = new DependencyCache(tmpDir)
+    const key = cache.getKey('pydantic>=2.6.1\nrequests', config)
+
+    expect(cache.getKey('requests\npydantic>=2.6.1\n', config)).toBe(key)
+    expect(cache.getKey('requests', config)).not.toBe(key)
+    expect(cache.getKey('pydantic>=2.6.1\nrequests', { ...config, pythonVersion: '3.12' })).not.toBe(key)
+    expect(cache.getKey('pydantic>=2.6.1\nrequests', { ...config, platform: 'aarch64-manylinux2014' })).not.toBe(key)
+    expect(cache.getKey('pydantic>=2.6.1\nrequests', { ...config, onlyBinary: false })).not.toBe(key)
+  })
+
+  test('installs once and reuses the tree in following builds', async () => {
+    const install = jest.fn(writeFile(10))
+    const key = new DependencyCache(tmpDir).getKey('requests', config)
+
+    const first = await new DependencyCache(tmpDir).getOrInstall(key, install)
+    const secondCache = new DependencyCache(tmpDir)
+    const second = await secondCache.getOrInstall(key, install)
+
+    expect(second).toBe(first)
+    expect(fs.readFileSync(path.join(second, 'module.py'), 'utf-8')).toBe('x'.repeat(10))
+    expect(install).toHaveBeenCalledTimes(1)
+    expect(secondCache.getStats()).toEqual(expect.objectContaining({ hits: 1, misses: 0 }))
+  })
+
+  test('does not keep failed installs', async () => {
+    const cache = new DependencyCache(tmpDir)
+
+    await expect(
+      cache.getOrInstall('broken', async () => {
+        throw new Error('uv failed')
+      }),
+    ).rejects.toThrow('uv failed')
+
+    expect(fs.readdirSync(tmpDir)).toEqual([])
+  })
+
+  test('evicts least recently used entries above the size limit', async () => {
+    const cache = new DependencyCache(tmpDir, 250)
+
+    await cache.getOrInstall('old', writeFile(100))
+    await new Promise((resolve) => setTimeout(resolve, 5))
+    await cache.getOrInstall('recent', writeFile(100))
+    await new Promise((resolve) => setTimeout(resolve, 5))
+
+    const buildStartedAt = Date.now()
+    await cache.getOrInstall('current', writeFile(100))
+
+    cache.evict(buildStartedAt)
+
+    expect(fs.readdirSync(tmpDir).sort()).toEqual(['current', 'recent'])
+    expect(cache.getStats()).toEqual(expect.objectContaining({ evicted: 1, size: 200 }))
+  })
+
+  test('never evicts entries used by the current build', async () => {
+    const cache = new DependencyCache(tmpDir, 50)
+
+    await cache.getOrInstall('current', writeFile(100))
+    cache.evict(0)
+
+    expect(fs.readdirSync(tmpDir)).toEqual(['current'])
+  })
+})
@@ -0,0 +1,43 @@
+import { createRouteTree, getParamNames } from '../route-tree'
+
+describe('createRouteTree', () => {
+  test('builds a segment trie with static and param nodes', () => {
+    const tree = createRouteTree([
+      { method: 'GET', path: '/pets/:id' },
+      { method: 'post', path: '/pets' },
+      { method: 'GET', path: '/pets/new' },
+    ])
+
+    expect(tree).toEqual({
+      static: {
+        pets: {
+          static: { new: { static: {}, routes: { GET: 2 } } },
+          param: { static: {}, routes: { GET: 0 } },
+          routes: { POST: 1 },
+        },
+      },
+      routes: {},
+    })
+  })
+
+  test('shares the param node between routes with different param names', () => {
+    const tree = createRouteTree([
+      { method: 'GET', path: '/pets/:id' },
+      { method: 'GET', path: '/pets/{petId}/orders' },
+    ])
+
+    expect(tree.static.pets.param?.routes).toEqual({ GET: 0 })
+    expect(tree.static.pets.param?.static.orders.routes).toEqual({ GET: 1 })
+  })
+
+  test('registers the root path on the root node', () => {
+    expect(createRouteTree([{ method: 'GET', path: '/' }]).routes).toEqual({ GET: 0 })
+  })
+})
+
+describe('getParamNames', () => {
+  test('returns the param names in path order', () => {
+    expect(getParamNames('/users/:userId/orders/{orderId}')).toEqual(['userId', 'orderId'])
+    expect(getParamNames('/users')).toEqual([])
+  })
+})
@@ -0,0 +1,123 @@
+import { spawn } from 'child_process'
+import fs from 'fs'
+import { globSync } from 'glob'
+import path from 'path'
+import { getDirectorySize } from './dependency-cache'
+
+/**
+ * Files installed by uv that can never be imported. Directories are not pruned by name, packages like
+ * botocore.docs or numpy.testing are imported by the library itself.
+ */
+export const defaultPrunePatterns = [
+  '**/__pycache__/**',
+  '**/*.pyi',
+  '**/*.{c,h,cpp,pyx,pxd}',
+  '**/*.dist-info/{RECORD,INSTALLER,REQUESTED,direct_url.json}',
+]
+
+/**
+ * Files matching the prune patterns that are kept anyway, extended with MOTIA_PYTHON_PRUNE_ALLOWLIST
+ * (comma separated glob patterns relative to site-packages)
+ */
+export const defaultPruneAllowlist = [
+  '**/*.dist-info/licenses/**',
+  '**/*.dist-info/LICENSE*',
+  ...(process.env.MOTIA_PYTHON_PRUNE_ALLOWLIST?.split(',')
+    .map((pattern) => pattern.trim())
+    .filter(Boolean) ?? []),
+]
+
+export type BundleOptimizerStats = {
+  compiledFiles: number
+  prunedFiles: number
+  sizeBefore: number
+  sizeAfter: number
+}
+
+/**
+ * Slims Python bundles: prunes files that are not needed at runtime and precompiles the code to bytecode
+ * for the target python version, so cold starts don't compile every module again.
+ *
+ * Bytecode is written in unchecked-hash mode, the interpreter loads it without checking the source mtime,
+ * which is meaningless once the bundle is extracted. When no interpreter matching the target version is
+ * available, python is undefined and only pruning is done.
+ */
+export class BundleOptimizer {
+  private readonly stats: BundleOptimizerStats = { compiledFiles: 0, prunedFiles: 0, sizeBefore: 0, sizeAfter: 0 }
+
+  constructor(
+    readonly python: string | undefined,
+    private readonly allowlist: string[] = defaultPruneAllowlist,
+  ) {}
+
+  async optimize(dir: string, options: { prune: boolean }): Promise<void> {
+    this.stats.sizeBefore += getDirectorySize(dir)
+
+    if (options.prune) {
+      this.prune(dir)
+    }
+
+    await this.compile(dir)
+
+    this.stats.sizeAfter += getDirectorySize(dir)
+  }
+
+  prune(dir: string): number {
+    const files = globSync(defaultPrunePatterns, { cwd: dir, nodir: true, dot: true, ignore: this.allowlist })
+
+    for (const file of files) {
+      fs.rmSync(path.join(dir, file), { force: true })
+    }
+
+    this.stats.prunedFiles += files.length
+
+    return files.length
+  }
+
+  async compile(dir: string): Promise<number> {
+    if (!this.python) {
+      return 0
+    }
+
+    // compileall exits with 1 when a file can't be compiled (e.g. python 2 leftovers in some packages),
+    // those files are kept as source and fail at import time like they would without bytecode
+    await runCompileAll(this.python, dir)
+
+    const files = countCompiledFiles(dir)
+
+    this.stats.compiledFiles += files
+
+    return files
+  }
+
+  getStats(): BundleOptimizerStats {
+    return { ...this.stats }
+  }
+}
+
+/**
+ * Source files with bytecode next to them, files compileall failed on have none
+ */
+const countCompiledFiles = (dir: string): number => {
+  const bytecode = new Set(
+    globSync('**/__pycache__/*.pyc', { cwd: dir, nodir: true }).map((file) => {
+      const [name] = path.basename(file).split('.')
+      return path.join(path.dirname(path.dirname(file)), name)
+    }),
+  )
+
+  return globSync('**/*.py', { cwd: dir, nodir: true }).filter((file) =>
+    bytecode.has(path.join(path.dirname(file), path.basename(file, '.py'))),
+  ).length
+}
+
+const runCompileAll = (python: string, dir: string): Promise<void> => {
+  const args = ['-m', 'compileall', '-q', '-j', '0', '--invalidation-mode', 'unchecked-hash', dir]
+
+  return new Promise((resolve, reject) => {
+    const child = spawn(python, args, { stdio: 'ignore' })
+
+    child.on('close', () => resolve())
+    child.on('error', (error) => reject(new Error(`Failed to spawn ${python}: ${error.message}`)))
+  })
+}
@@ -0,0 +1,177 @@
+import { createHash } from 'crypto'
+import fs from 'fs'
+import path from 'path'
+import type { UvPackageConfig } from './uv-packager'
+
+// Bump when the layout of an installed entry changes
+const CACHE_VERSION = 1
+const METADATA_FILE = 'metadata.json'
+const TREE_DIR = 'site-packages'
+
+export const defaultDependencyCacheMaxBytes = (Number(process.env.MOTIA_PYTHON_DEPS_CACHE_MAX_MB) || 2048) * 1024 * 1024
+
+type EntryMetadata = {
+  size: number
+  lastUsed: number
+}
+
+export type DependencyCacheStats = {
+  hits: number
+  misses: number
+  evicted: number
+  size: number
+}
+
+export const getDirectorySize = (dir: string): number => {
+  let size = 0
+
+  for (const entry of fs.readdirSync(dir, { withFileTypes: true })) {
+    const entryPath = path.join(dir, entry.name)
+
+    if (entry.isDirectory()) {
+      size += getDirectorySize(entryPath)
+    } else if (entry.isFile()) {
+      size += fs.statSync(entryPath).size
+    }
+  }
+
+  return size
+}
+
+/**
+ * Content-addressed cache of `uv pip install --target` trees, persisted between builds.
+ *
+ * Entries are keyed on the requirement subset of the step, the target python version, the platform
+ * and the only-binary flag, so an entry is only reused when uv would install exactly the same thing.
+ * Bundles archive the cached tree directly, nothing is copied into the dist folder.
+ *
+ * The cache is bounded in size, least recently used entries are evicted after each build.
+ */
+export class DependencyCache {
+  private readonly stats: DependencyCacheStats = { hits: 0, misses: 0, evicted: 0, size: 0 }
+
+  constructor(
+    private readonly cacheDir: string,
+    private readonly maxBytes: number = defaultDependencyCacheMaxBytes,
+  ) {}
+
+  /**
+   * `variant` identifies the post-processing applied to the installed tree, e.g. pruning and bytecode
+   */
+  getKey(requirementsContent: string, config: UvPackageConfig, variant?: string): string {
+    const requirements = requirementsContent
+      .split('\n')
+      .map((line) => line.trim().toLowerCase())
+      .filter(Boolean)
+      .sort()
+
+    return createHash('sha256')
+      .update(
+        JSON.stringify({
+          version: CACHE_VERSION,
+          requirements,
+          pythonVersion: config.pythonVersion,
+          platform: config.platform,
+          onlyBinary: !!config.onlyBinary,
+          variant,
+        }),
+      )
+      .digest('hex')
+      .substring(0, 32)
+  }
+
+  /**
+   * Returns the directory with the installed dependencies, installing them on a cache miss
+   */
+  async getOrInstall(key: string, install: (targetDir: string, workDir: string) => Promise<void>): Promise<string> {
+    const entryDir = path.join(this.cacheDir, key)
+    const treeDir = path.join(entryDir, TREE_DIR)
+    const metadata = this.readMetadata(entryDir)
+
+    if (metadata) {
+      this.stats.hits++
+      this.writeMetadata(entryDir, { ...metadata, lastUsed: Date.now() })
+      return treeDir
+    }
+
+    this.stats.misses++
+
+    // install in a temporary folder and move it in place once complete, so an interrupted
+    // install (or another build running at the same time) never leaves a partial entry
+    const tmpDir = path.join(this.cacheDir, `${key}.tmp-${process.pid}-${Date.now()}`)
+    const tmpTreeDir = path.join(tmpDir, TREE_DIR)
+
+    try {
+      fs.mkdirSync(tmpTreeDir, { recursive: true })
+      await install(tmpTreeDir, tmpDir)
+      this.writeMetadata(tmpDir, { size: getDirectorySize(tmpTreeDir), lastUsed: Date.now() })
+
+      if (this.readMetadata(entryDir)) {
+        // another build installed the same entry meanwhile
+        fs.rmSync(tmpDir, { recursive: true, force: true })
+        return treeDir
+      }
+
+      fs.rmSync(entryDir, { recursive: true, force: true })
+      fs.renameSync(tmpDir, entryDir)
+    } catch (error) {
+      fs.rmSync(tmpDir, { recursive: true, force: true })
+
+      if (this.readMetadata(entryDir)) {
+        return treeDir
+      }
+
+      throw error
+    }
+
+    return treeDir
+  }
+
+  /**
+   * Removes the least recently used entries until the cache fits in maxBytes,
+   * entries used after `keepUsedSince` (the current build) are never evicted
+   */
+  evict(keepUsedSince: number): void {
+    if (!fs.existsSync(this.cacheDir)) {
+      return
+    }
+
+    const entries = fs
+      .readdirSync(this.cacheDir, { withFileTypes: true })
+      .filter((entry) => entry.isDirectory() && !entry.name.includes('.tmp-'))
+      .map((entry) => path.join(this.cacheDir, entry.name))
+      .map((dir) => ({ dir, metadata: this.readMetadata(dir) }))
+      .sort((a, b) => (a.metadata?.lastUsed ?? 0) - (b.metadata?.lastUsed ?? 0))
+
+    let size = entries.reduce((total, entry) => total + (entry.metadata?.size ?? 0), 0)
+
+    for (const entry of entries) {
+      const isIncomplete = !entry.metadata
+      const isUsed = (entry.metadata?.lastUsed ?? 0) >= keepUsedSince
+
+      if (isIncomplete || (size > this.maxBytes && !isUsed)) {
+        fs.rmSync(entry.dir, { recursive: true, force: true })
+        size -= entry.metadata?.size ?? 0
+        this.stats.evicted += entry.metadata ? 1 : 0
+      }
+    }
+
+    this.stats.size = size
+  }
+
+  getStats(): DependencyCacheStats {
+    return { ...this.stats }
+  }
+
+  private readMetadata(entryDir: string): EntryMetadata | undefined {
+    try {
+      return JSON.parse(fs.readFileSync(path.join(entryDir, METADATA_FILE), 'utf-8'))
+    } catch (_error) {
+      return undefined
+    }
+  }
+
+  private writeMetadata(entryDir: string, metadata: EntryMetadata): void {
+    fs.writeFileSync(path.join(entryDir, METADATA_FILE), JSON.stringify(metadata))
+  }
+}
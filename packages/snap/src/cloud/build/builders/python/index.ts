@@ -1,27 +1,59 @@
 import type { ApiRouteConfig, Step } from '@motiadev/core'
 import fs from 'fs'
+import { globSync } from 'glob'
+import os from 'os'
 import path from 'path'
-import { fileURLToPath } from 'url'
-import { activatePythonVenv, getSitePackagesPath } from '../../../../utils/activate-python-env'
-import { distDir } from '../../../new-deployment/constants'
-import type { BuildListener } from '../../../new-deployment/listeners/listener.types'
+import { activatePythonVenv, getSitePackagesPath, getVenvPythonPath } from '../../../../utils/activate-python-env'
+import { type ConcurrencyLimit, limitConcurrency } from '../../../../utils/limit-concurrency'
+import { buildCacheDir, distDir } from '../../../new-deployment/constants'
+import type { BuildListener, BuildStats } from '../../../new-deployment/listeners/listener.types'
 import type { Builder, RouterBuildResult, StepBuilder } from '../../builder'
-import { Archiver } from '../archiver'
+import { type ArchiveResult, Archiver } from '../archiver'
 import { includeStaticFiles } from '../include-static-files'
-import { extractPythonData } from './python-data/extract-python-data'
-import { readRequirements } from './python-data/read-requirements'
+import { BundleOptimizer, defaultPruneAllowlist, defaultPrunePatterns } from './bundle-optimizer'
+import { DependencyCache } from './dependency-cache'
+import { PythonAnalysisPool } from './python-data/analysis-pool'
+import { batchExtractImports, toPythonImports } from './python-data/batch-extract-imports'
+import { loadDependencyIndex, resolveDependenciesMap } from './python-data/dependency-index'
+import { getContentKey, type ParseCacheEntries, PythonParseCache } from './python-data/parse-cache'
+import { type Requirements, readRequirements } from './python-data/read-requirements'
 import { resolveDepNames } from './python-data/resolve-dep-names'
+import { renderPythonRouter } from './render-router'
 import { UvPackager } from './uv-packager'
 
+const defaultConcurrency = Math.max(1, Math.min(os.cpus().length, 8))
+
+type DependencyLayer = ArchiveResult & { path: string; requirements: string[] }
+
 export class PythonBuilder implements StepBuilder {
   private packager: UvPackager
+  private parseCache: PythonParseCache
+  private analysisPool: PythonAnalysisPool
+  private limit: ConcurrencyLimit
+  private dependencyCache: DependencyCache
+  private projectRequirements?: { requirements: Requirements; dependenciesMap: Record<string, string> }
+  // dependency cache key -> directory with the installed dependencies
+  private readonly dependencyInstalls: Map<string, Promise<string>> = new Map()
+  // dependency cache key -> layer archive, only used when packaging dependencies in layers
+  private readonly dependencyLayers: Map<string, Promise<DependencyLayer>> = new Map()
+  private readonly useLayers = process.env.MOTIA_PYTHON_DEPENDENCY_LAYERS === 'true'
+  private readonly optimize = process.env.MOTIA_PYTHON_OPTIMIZE === 'true'
+  private optimizer?: Promise<BundleOptimizer>
+  private readonly buildStartedAt = Date.now()
+  private astStats?: { files: number; errors: number; timeMs: number }
 
   constructor(
     private readonly builder: Builder,
     private readonly listener: BuildListener,
   ) {
+    const concurrency = Number(process.env.MOTIA_BUILD_CONCURRENCY) || defaultConcurrency
+
     activatePythonVenv({ baseDir: this.builder.projectDir })
     this.packager = new UvPackager()
+    this.parseCache = new PythonParseCache(path.join(buildCacheDir, 'python-imports.json'))
+    this.dependencyCache = new DependencyCache(path.join(buildCacheDir, 'python-dependencies'))
+    this.analysisPool = new PythonAnalysisPool(this.parseCache, concurrency)
+    this.limit = limitConcurrency(concurrency)
   }
 
   async buildApiSteps(steps: Step<ApiRouteConfig>[]): Promise<RouterBuildResult> {
@@ -35,12 +67,21 @@ export class PythonBuilder implements StepBuilder {
       const routerTemplate = this.createRouterTemplate(steps)
       archive.append(routerTemplate, 'router.py')
 
-      await this.generatePackage(bundleDir, 'router.py', archive, routerTemplate)
+      const layer = await this.generatePackage(bundleDir, 'router.py', archive, routerTemplate)
 
       includeStaticFiles(steps, this.builder, archive)
 
       const { compressedSize, uncompressedSize } = await archive.finalize()
 
+      if (layer) {
+        this.builder.registerLayer({
+          layerPath: layer.path,
+          bundlePath: zipName,
+          type: 'python',
+          requirements: layer.requirements,
+        })
+      }
+
       return { compressedSize, uncompressedSize, path: zipName }
     } catch (error) {
       throw new Error(`Failed to build Python API router: ${error}`)
@@ -52,10 +93,17 @@ export class PythonBuilder implements StepBuilder {
   async build(step: Step): Promise<void> {
     const entrypointPath = step.filePath.replace(this.builder.projectDir, '')
     const bundlePath = path.join('python', entrypointPath.replace(/(.*)\.py$/, '$1.zip'))
+
+    this.builder.registerStep({ entrypointPath, bundlePath, step, type: 'python' })
+
+    // steps are built concurrently, bounded by MOTIA_BUILD_CONCURRENCY
+    await this.limit(() => this.buildStep(step, entrypointPath, bundlePath))
+  }
+
+  private async buildStep(step: Step, entrypointPath: string, bundlePath: string): Promise<void> {
     const bundleDir = path.join(distDir, 'python', entrypointPath.replace(/(.*)\.py$/, '$1'))
     const outfile = path.join(distDir, bundlePath)
 
-    this.builder.registerStep({ entrypointPath, bundlePath, step, type: 'python' })
     this.listener.onBuildStart(step)
 
     try {
@@ -63,13 +111,24 @@ export class PythonBuilder implements StepBuilder {
       fs.mkdirSync(bundleDir, { recursive: true })
       const archive = new Archiver(outfile)
 
-      await this.generatePackage(bundleDir, entrypointPath, archive)
+      const layer = await this.generatePackage(bundleDir, entrypointPath, archive, undefined, step)
 
       // Include static files
       includeStaticFiles([step], this.builder, archive)
 
       const { compressedSize, uncompressedSize } = await archive.finalize()
-      this.builder.recordStepSize(step, compressedSize, uncompressedSize)
+
+      if (layer) {
+        this.builder.registerLayer({
+          layerPath: layer.path,
+          bundlePath,
+          type: 'python',
+          requirements: layer.requirements,
+        })
+      }
+
+      // the layer is extracted next to the bundle at runtime, it counts towards the size limit of the step
+      this.builder.recordStepSize(step, compressedSize, uncompressedSize + (layer?.uncompressedSize ?? 0))
       this.listener.onBuildEnd(step, compressedSize)
     } catch (err) {
       this.listener.onBuildError(step, err as Error)
@@ -79,13 +138,245 @@ export class PythonBuilder implements StepBuilder {
     }
   }
 
-  private async generatePackage(bundleDir: string, entrypointPath: string, archive: Archiver, fileContent?: string) {
-    const requirementsFile = path.join(this.builder.projectDir, 'requirements.txt')
-    const requirements = readRequirements(requirementsFile)
-    const sitePackagesPath = getSitePackagesPath({ baseDir: this.builder.projectDir })
-    const dependenciesMap = resolveDepNames(Object.keys(requirements), sitePackagesPath)
+  async finalize(): Promise<void> {
+    await this.analysisPool.close()
+    this.parseCache.save()
+    // bundles are finalized at this point, entries used by this build are kept
+    this.dependencyCache.evict(this.buildStartedAt)
+
+    const { hits, misses, parseTimeMs } = this.parseCache.getStats()
+    const dependencyStats = this.dependencyCache.getStats()
+    const layerStats = await this.getLayerStats()
+    const optimizerStats = await this.getOptimizerStats()
+
+    this.listener.onBuildStats('python', {
+      'Files analyzed': String(hits + misses),
+      'Files parsed with ANTLR': String(misses),
+      'Parse cache hit rate': `${(this.parseCache.getHitRate() * 100).toFixed(1)}%`,
+      'Parse time': `${parseTimeMs.toFixed(0)} ms`,
+      ...(this.astStats
+        ? {
+            'Files parsed with ast': `${this.astStats.files} (${this.astStats.errors} with syntax errors)`,
+            'ast parse time': `${this.astStats.timeMs.toFixed(0)} ms`,
+          }
+        : {}),
+      'Dependency cache hits': String(dependencyStats.hits),
+      'Dependency installs': String(dependencyStats.misses),
+      'Dependency cache size': `${(dependencyStats.size / 1024 / 1024).toFixed(1)} MB`,
+      ...layerStats,
+      ...optimizerStats,
+    })
+  }
+
+  private async getOptimizerStats(): Promise<BuildStats> {
+    if (!this.optimizer) {
+      return {}
+    }
+
+    const optimizer = await this.optimizer
+    const { compiledFiles, prunedFiles, sizeBefore, sizeAfter } = optimizer.getStats()
+    const toMB = (size: number) => (size / 1024 / 1024).toFixed(1)
+
+    return {
+      Bytecode: optimizer.python
+        ? `${compiledFiles} files`
+        : `skipped, no Python ${this.packager.config.pythonVersion} interpreter found`,
+      'Pruned files': String(prunedFiles),
+      'Optimized size': `${toMB(sizeBefore)} MB -> ${toMB(sizeAfter)} MB`,
+    }
+  }
+
+  private getOptimizer(): Promise<BundleOptimizer> {
+    this.optimizer ??= this.packager.findPython().then((python) => new BundleOptimizer(python))
+    return this.optimizer
+  }
+
+  /**
+   * Cache key of the dependencies, optimized installs are cached separately from plain ones
+   */
+  private async getDependencyKey(requirementsContent: string): Promise<string> {
+    if (!this.optimize) {
+      return this.dependencyCache.getKey(requirementsContent, this.packager.config)
+    }
+
+    const optimizer = await this.getOptimizer()
+    const variant = JSON.stringify({
+      bytecode: !!optimizer.python,
+      patterns: defaultPrunePatterns,
+      allowlist: defaultPruneAllowlist,
+    })
+
+    return this.dependencyCache.getKey(requirementsContent, this.packager.config, variant)
+  }
+
+  /**
+   * Compares the layers with the per-step layout, where every bundle vendors its own copy of the dependencies
+   */
+  private async getLayerStats(): Promise<BuildStats> {
+    if (!this.useLayers) {
+      return {}
+    }
+
+    const layers = await Promise.all(this.dependencyLayers.values())
+    const layersConfig = this.builder.layersConfig
+    let compressedSaved = 0
+    let uncompressedSaved = 0
+
+    for (const layer of layers) {
+      const copies = Math.max(0, (layersConfig[layer.path]?.usedBy.length ?? 0) - 1)
+
+      compressedSaved += copies * layer.compressedSize
+      uncompressedSaved += copies * layer.uncompressedSize
+    }
+
+    return {
+      'Dependency layers': String(layers.length),
+      'Layer savings (compressed)': `${(compressedSaved / 1024 / 1024).toFixed(1)} MB`,
+      'Layer savings (uncompressed)': `${(uncompressedSaved / 1024 / 1024).toFixed(1)} MB`,
+    }
+  }
+
+  private getProjectRequirements() {
+    if (!this.projectRequirements) {
+      const requirementsFile = path.join(this.builder.projectDir, 'requirements.txt')
+      const requirements = readRequirements(requirementsFile)
+      const sitePackagesPath = getSitePackagesPath({ baseDir: this.builder.projectDir })
+      const index = loadDependencyIndex({
+        python: getVenvPythonPath({ baseDir: this.builder.projectDir }),
+        sitePackagesDir: sitePackagesPath,
+        cacheFile: path.join(buildCacheDir, 'python-dependency-index.json'),
+      })
+      const dependenciesMap = index
+        ? resolveDependenciesMap(index, Object.keys(requirements))
+        : resolveDepNames(Object.keys(requirements), sitePackagesPath)
+
+      this.projectRequirements = { requirements, dependenciesMap }
+      this.extractProjectImports()
+    }
+
+    return this.projectRequirements
+  }
+
+  /**
+   * Extracts the imports of every project file not in the parse cache with the Python `ast` module,
+   * in one batch before the analysis starts. Files with syntax errors (or any file when the venv
+   * interpreter can't be run) are left to the ANTLR parser, which reports the error.
+   */
+  private extractProjectImports(): void {
+    const files = globSync('**/*.py', {
+      cwd: this.builder.projectDir,
+      absolute: true,
+      ignore: ['python_modules/**', 'node_modules/**', 'dist/**', '.motia/**', '**/__pycache__/**'],
+    })
+    const keys: Record<string, string> = {}
+
+    for (const file of files) {
+      const key = getContentKey(fs.readFileSync(file, 'utf-8'))
+
+      if (!this.parseCache.has(key)) {
+        keys[file] = key
+      }
+    }
+
+    if (Object.keys(keys).length === 0) {
+      return
+    }
+
+    const start = performance.now()
+    const results = batchExtractImports(getVenvPythonPath({ baseDir: this.builder.projectDir }), Object.keys(keys))
+
+    if (!results) {
+      return
+    }
+
+    const entries: ParseCacheEntries = {}
+    let errors = 0
+
+    for (const [file, result] of Object.entries(results)) {
+      if (result.imports) {
+        entries[keys[file]] = toPythonImports(result.imports)
+      } else {
+        errors++
+      }
+    }
+
+    this.parseCache.add(entries)
+    this.astStats = { files: Object.keys(results).length, errors, timeMs: performance.now() - start }
+  }
+
+  /**
+   * Installs the dependencies once per requirement set, steps sharing the same requirements
+   * (including the ones being built concurrently) reuse the same install. Installs are kept in
+   * the build cache so following builds only run uv when the requirements or target change
+   */
+  private async installDependencies(requirementsContent: string): Promise<string> {
+    const key = await this.getDependencyKey(requirementsContent)
+    let install = this.dependencyInstalls.get(key)
+
+    if (!install) {
+      install = this.dependencyCache.getOrInstall(key, async (targetDir, workDir) => {
+        const requirementsFile = path.join(workDir, 'requirements.txt')
+
+        fs.writeFileSync(requirementsFile, requirementsContent)
+        await this.packager.packageDependencies(targetDir, requirementsFile)
+
+        if (this.optimize) {
+          await (await this.getOptimizer()).optimize(targetDir, { prune: true })
+        }
+      })
+
+      // failed installs are not cached so the error is reported for every step depending on them
+      install.catch(() => this.dependencyInstalls.delete(key))
+      this.dependencyInstalls.set(key, install)
+    }
+
+    return install
+  }
+
+  /**
+   * Archives the dependencies once per requirement set, bundles only reference the layer
+   */
+  private async createDependencyLayer(requirementsContent: string, dependenciesDir: string): Promise<DependencyLayer> {
+    const key = await this.getDependencyKey(requirementsContent)
+    let layer = this.dependencyLayers.get(key)
+
+    if (!layer) {
+      const layerPath = path.join('python', 'layers', `${key}.zip`)
+
+      fs.mkdirSync(path.join(distDir, 'python', 'layers'), { recursive: true })
+
+      const archive = new Archiver(path.join(distDir, layerPath))
+      archive.appendDirectory(dependenciesDir, '/')
+
+      layer = archive.finalize().then((result) => ({
+        ...result,
+        path: layerPath,
+        requirements: requirementsContent.split('\n'),
+      }))
+
+      layer.catch(() => this.dependencyLayers.delete(key))
+      this.dependencyLayers.set(key, layer)
+    }
+
+    return layer
+  }
+
+  /**
+   * Copies the files of the entrypoint to the bundle, dependencies are either vendored in the
+   * bundle or packaged in a shared layer, which is returned
+   */
+  private async generatePackage(
+    bundleDir: string,
+    entrypointPath: string,
+    archive: Archiver,
+    fileContent?: string,
+    step?: Step,
+  ): Promise<DependencyLayer | undefined> {
+    let layer: DependencyLayer | undefined
+
+    const { requirements, dependenciesMap } = this.getProjectRequirements()
 
-    const { externalDependencies, files } = extractPythonData(
+    const { externalDependencies, files } = await this.analysisPool.analyze(
       this.builder.projectDir,
       entrypointPath,
       dependenciesMap,
@@ -103,20 +394,38 @@ export class PythonBuilder implements StepBuilder {
       }
     }
 
+    if (this.optimize) {
+      // project files are only compiled, everything in the bundle was reached from the entrypoint
+      await (await this.getOptimizer()).optimize(bundleDir, { prune: false })
+    }
+
     const dependencies = Object.values(externalDependencies)
 
     if (dependencies.length > 0) {
-      // create requirements.txt
-      const requirementsContent = Object.values(externalDependencies)
+      // create requirements.txt, many imported modules can be provided by the same requirement
+      const requirementsContent = Array.from(new Set(dependencies))
         .map((dependency) => requirements[dependency])
         .join('\n')
 
       fs.writeFileSync(path.join(bundleDir, 'requirements.txt'), requirementsContent)
-      await this.packager.packageDependencies(bundleDir)
+
+      if (step) {
+        this.listener.onBuildProgress(step, 'Installing dependencies')
+      }
+
+      const dependenciesDir = await this.installDependencies(requirementsContent)
+
+      if (this.useLayers) {
+        layer = await this.createDependencyLayer(requirementsContent, dependenciesDir)
+      } else {
+        archive.appendDirectory(dependenciesDir, '/')
+      }
     }
 
     // zip entire folder
     archive.appendDirectory(bundleDir, '/')
+
+    return layer
   }
 
   private cleanup(bundleDir: string): void {
@@ -130,27 +439,14 @@ export class PythonBuilder implements StepBuilder {
   }
 
   private createRouterTemplate(steps: Step<ApiRouteConfig>[]): string {
-    const imports = steps
-      .map(
-        (step, index) =>
-          `from ${this.getModuleName(step)} import handler as route${index}_handler, config as route${index}_config`,
-      )
-      .join('\n')
-
-    const routerPaths = steps
-      .map((step, index) => {
-        const method = step.config.method.toUpperCase()
-        const path = step.config.path
-        return `    '${method} ${path}': RouterPath('${step.config.name}', '${step.config.method.toLowerCase()}', route${index}_handler, route${index}_config)`
-      })
-      .join(',\n')
-
-    const __dirname = path.dirname(fileURLToPath(import.meta.url))
-
-    return fs
-      .readFileSync(path.join(__dirname, 'router_template.py'), 'utf-8')
-      .replace('# {{imports}}', imports)
-      .replace('    # {{router paths}}', routerPaths)
+    return renderPythonRouter(
+      steps.map((step) => ({
+        stepName: step.config.name,
+        method: step.config.method,
+        path: step.config.path,
+        moduleName: this.getModuleName(step),
+      })),
+    )
   }
 
   private getModuleName(step: Step): string {
@@ -0,0 +1,59 @@
+import { type ExtractedImport, toPythonImports } from '../batch-extract-imports'
+import { getDependenciesFromFile } from '../get-dependencies-from-file'
+import { PythonParseCache } from '../parse-cache'
+
+const extracted = (module: string | null, overrides: Partial<ExtractedImport> = {}): ExtractedImport => ({
+  module,
+  level: 0,
+  names: [],
+  line: 1,
+  conditional: false,
+  typeChecking: false,
+  ...overrides,
+})
+
+describe('toPythonImports', () => {
+  test('keeps the relative level as leading dots', () => {
+    const imports = [extracted('os'), extracted('utils.db', { level: 2, names: ['connect'] })]
+
+    expect(toPythonImports(imports)).toEqual([{ module: 'os' }, { module: '..utils.db' }])
+  })
+
+  test('marks conditional and type checking imports as optional', () => {
+    const imports = [extracted('ujson', { conditional: true }), extracted('steps.api_step', { typeChecking: true })]
+
+    expect(toPythonImports(imports)).toEqual([
+      { module: 'ujson', optional: true },
+      { module: 'steps.api_step', optional: true },
+    ])
+  })
+
+  test('resolves names imported from the package itself as optional submodules', () => {
+    expect(toPythonImports([extracted(null, { level: 1, names: ['models', 'helper'] })])).toEqual([
+      { module: '.models', optional: true },
+      { module: '.helper', optional: true },
+    ])
+  })
+})
+
+describe('getDependenciesFromFile with extracted imports', () => {
+  test('reports project dependencies that are only imported optionally', () => {
+    const content =
+      'from . import models\nfrom .models import User\ntry:\n    import ujson\n    from .compat import dumps\nexcept ImportError:\n    pass'
+    const cache = new PythonParseCache()
+
+    cache.getImports(content, () =>
+      toPythonImports([
+        extracted(null, { level: 1, names: ['models'] }),
+        extracted('models', { level: 1, names: ['User'] }),
+        extracted('ujson', { conditional: true }),
+        extracted('compat', { level: 1, names: ['dumps'], conditional: true }),
+      ]),
+    )
+
+    const deps = getDependenciesFromFile(content, 'test.py', {}, cache)
+
+    expect(Array.from(deps.projectDependencies)).toEqual(['.models', 'ujson', '.compat'])
+    expect(Array.from(deps.optionalDependencies)).toEqual(['ujson', '.compat'])
+  })
+})
@@ -0,0 +1,89 @@
+import fs from 'fs'
+import os from 'os'
+import path from 'path'
+import { fileURLToPath } from 'url'
+import {
+  type DependencyIndex,
+  getVenvFingerprint,
+  loadDependencyIndex,
+  resolveDependenciesMap,
+} from '../dependency-index'
+import { PythonError } from '../python-errors'
+
+const __filename = fileURLToPath(import.meta.url)
+const __dirname = path.dirname(__filename)
+
+const sitePackagesDir = path.join(__dirname, 'site-packages')
+
+const index: DependencyIndex = {
+  httpx: { name: 'httpx', version: '0.28.1', imports: ['httpx'], requires: ['anyio', 'certifi', 'idna'] },
+  anyio: { name: 'anyio', version: '4.9.0', imports: ['anyio'], requires: ['idna', 'sniffio'] },
+  certifi: { name: 'certifi', version: '2025.1.31', imports: ['certifi'], requires: [] },
+  idna: { name: 'idna', version: '3.10', imports: ['idna'], requires: [] },
+  pymongo: { name: 'pymongo', version: '4.15.1', imports: ['bson', 'gridfs', 'pymongo'], requires: ['dnspython'] },
+  dnspython: { name: 'dnspython', version: '2.7.0', imports: ['dns'], requires: [] },
+  'scikit-learn': { name: 'scikit-learn', version: '1.7.2', imports: ['sklearn'], requires: [] },
+  'google-cloud-storage': { name: 'google-cloud-storage', version: '3.1.0', imports: ['google'], requires: [] },
+  six: { name: 'six', version: '1.17.0', imports: ['six'], requires: [] },
+}
+
+describe('resolveDependenciesMap', () => {
+  test('maps the import names of each requirement', () => {
+    expect(resolveDependenciesMap(index, ['scikit_learn', 'pymongo'])).toEqual({
+      sklearn: 'scikit_learn',
+      bson: 'pymongo',
+      gridfs: 'pymongo',
+      pymongo: 'pymongo',
+      dns: 'pymongo',
+    })
+  })
+
+  test('resolves namespace packages and single module distributions', () => {
+    expect(resolveDependenciesMap(index, ['google-cloud-storage', 'six'])).toEqual({
+      google: 'google-cloud-storage',
+      six: 'six',
+    })
+  })
+
+  test('maps transitive requirements to the requirement pulling them in', () => {
+    expect(resolveDependenciesMap(index, ['httpx', 'idna'])).toEqual({
+      httpx: 'httpx',
+      anyio: 'httpx',
+      certifi: 'httpx',
+      idna: 'idna',
+    })
+  })
+
+  test('throws when a requirement is not installed', () => {
+    expect(() => resolveDependenciesMap(index, ['missing-package'])).toThrow(PythonError)
+  })
+})
+
+describe('loadDependencyIndex', () => {
+  let tmpDir: string
+
+  beforeEach(() => {
+    tmpDir = fs.mkdtempSync(path.join(os.tmpdir(), 'motia-dependency-index-'))
+  })
+
+  afterEach(() => {
+    fs.rmSync(tmpDir, { recursive: true, force: true })
+  })
+
+  test('reuses the cached index while the venv does not change', () => {
+    const cacheFile = path.join(tmpDir, 'index.json')
+    const fingerprint = getVenvFingerprint(sitePackagesDir)
+
+    fs.writeFileSync(cacheFile, JSON.stringify({ version: 1, fingerprint, distributions: index }))
+
+    expect(loadDependencyIndex({ python: path.join(tmpDir, 'no-python'), sitePackagesDir, cacheFile })).toEqual(index)
+  })
+
+  test('returns undefined when the venv changed and the index cannot be built', () => {
+    const cacheFile = path.join(tmpDir, 'index.json')
+
+    fs.writeFileSync(cacheFile, JSON.stringify({ version: 1, fingerprint: 'stale', distributions: index }))
+
+    expect(loadDependencyIndex({ python: path.join(tmpDir, 'no-python'), sitePackagesDir, cacheFile })).toBeUndefined()
+  })
+})
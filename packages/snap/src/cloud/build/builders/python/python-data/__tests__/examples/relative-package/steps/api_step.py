@@ -0,0 +1,12 @@
+from . import services
+
+try:
+    from .compat import json
+except ImportError:
+    import json
+
+config = {"type": "api", "name": "Relative package", "path": "/relative", "method": "GET", "emits": []}
+
+
+async def handler(req, context):
+    return {"status": 200, "body": services.send(json.dumps({}))}
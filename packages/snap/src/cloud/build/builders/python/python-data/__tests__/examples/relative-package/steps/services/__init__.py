@@ -0,0 +1,3 @@
+from .mailer import send
+
+__all__ = ["send"]
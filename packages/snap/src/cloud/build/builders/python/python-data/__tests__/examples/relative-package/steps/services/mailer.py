@@ -0,0 +1,2 @@
+def send(message: str) -> str:
+    return message
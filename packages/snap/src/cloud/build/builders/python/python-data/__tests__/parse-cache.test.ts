@@ -0,0 +1,101 @@
+import { jest } from '@jest/globals'
+import fs from 'fs'
+import os from 'os'
+import path from 'path'
+import { getDependenciesFromFile, type PythonImport } from '../get-dependencies-from-file'
+import { getContentKey, PythonParseCache } from '../parse-cache'
+
+const imports = (...modules: string[]): PythonImport[] => modules.map((module) => ({ module }))
+
+describe('PythonParseCache', () => {
+  let tmpDir: string
+
+  beforeEach(() => {
+    tmpDir = fs.mkdtempSync(path.join(os.tmpdir(), 'motia-parse-cache-'))
+  })
+
+  afterEach(() => {
+    fs.rmSync(tmpDir, { recursive: true, force: true })
+  })
+
+  test('parses each content only once', () => {
+    const cache = new PythonParseCache()
+    const parse = jest.fn(() => imports('os'))
+
+    expect(cache.getImports('import os', parse)).toEqual(imports('os'))
+    expect(cache.getImports('import os', parse)).toEqual(imports('os'))
+    expect(parse).toHaveBeenCalledTimes(1)
+    expect(cache.getStats()).toEqual(expect.objectContaining({ hits: 1, misses: 1 }))
+    expect(cache.getHitRate()).toBe(0.5)
+  })
+
+  test('persists entries between builds and only re-parses changed content', () => {
+    const cacheFile = path.join(tmpDir, 'python-imports.json')
+    const firstBuild = new PythonParseCache(cacheFile)
+
+    firstBuild.getImports('import os', () => imports('os'))
+    firstBuild.getImports('import sys', () => imports('sys'))
+    firstBuild.save()
+
+    const secondBuild = new PythonParseCache(cacheFile)
+    const parse = jest.fn(() => imports('json'))
+
+    expect(secondBuild.getImports('import os', parse)).toEqual(imports('os'))
+    expect(secondBuild.getImports('import json', parse)).toEqual(imports('json'))
+    expect(parse).toHaveBeenCalledTimes(1)
+  })
+
+  test('drops entries not used in the last build', () => {
+    const cacheFile = path.join(tmpDir, 'python-imports.json')
+    const firstBuild = new PythonParseCache(cacheFile)
+
+    firstBuild.getImports('import os', () => imports('os'))
+    firstBuild.save()
+
+    const secondBuild = new PythonParseCache(cacheFile)
+    secondBuild.getImports('import sys', () => imports('sys'))
+    secondBuild.save()
+
+    const parse = jest.fn(() => imports('os'))
+    new PythonParseCache(cacheFile).getImports('import os', parse)
+
+    expect(parse).toHaveBeenCalledTimes(1)
+  })
+
+  test('ignores a corrupted cache file', () => {
+    const cacheFile = path.join(tmpDir, 'python-imports.json')
+    fs.writeFileSync(cacheFile, '{ invalid')
+
+    const cache = new PythonParseCache(cacheFile)
+
+    expect(cache.getImports('import os', () => imports('os'))).toEqual(imports('os'))
+  })
+
+  test('only persists added entries once an analysis uses them', () => {
+    const cacheFile = path.join(tmpDir, 'python-imports.json')
+    const cache = new PythonParseCache(cacheFile)
+    const parse = jest.fn(() => imports('sys'))
+
+    cache.add({ [getContentKey('import os')]: imports('os'), [getContentKey('import json')]: imports('json') })
+
+    expect(cache.getImports('import os', parse)).toEqual(imports('os'))
+    expect(parse).not.toHaveBeenCalled()
+
+    cache.save()
+
+    expect(new PythonParseCache(cacheFile).has(getContentKey('import os'))).toBe(true)
+    expect(new PythonParseCache(cacheFile).has(getContentKey('import json'))).toBe(false)
+  })
+
+  test('is used by getDependenciesFromFile', () => {
+    const cache = new PythonParseCache()
+    const content = 'import os\nimport requests\nfrom .local import x'
+
+    const first = getDependenciesFromFile(content, 'a.py', { requests: 'requests' }, cache)
+    const second = getDependenciesFromFile(content, 'b.py', { requests: 'requests' }, cache)
+
+    expect(second).toEqual(first)
+    expect(Array.from(second.externalDependencies)).toEqual(['requests'])
+    expect(cache.getStats()).toEqual(expect.objectContaining({ hits: 1, misses: 1 }))
+  })
+})
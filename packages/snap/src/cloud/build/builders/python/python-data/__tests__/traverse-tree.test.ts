@@ -0,0 +1,50 @@
+import fs from 'fs'
+import path from 'path'
+import { fileURLToPath } from 'url'
+import { type ExtractedImport, toPythonImports } from '../batch-extract-imports'
+import { PythonParseCache } from '../parse-cache'
+import { type TraverseTreeResult, traverseTree } from '../traverse-tree'
+
+const __filename = fileURLToPath(import.meta.url)
+const __dirname = path.dirname(__filename)
+
+const extracted = (module: string | null, overrides: Partial<ExtractedImport> = {}): ExtractedImport => ({
+  module,
+  level: 0,
+  names: [],
+  line: 1,
+  conditional: false,
+  typeChecking: false,
+  ...overrides,
+})
+
+describe('traverseTree', () => {
+  test('follows relative imports of package directories and skips optional ones that are missing', () => {
+    const rootDir = path.join(__dirname, './examples/relative-package')
+    const content = fs.readFileSync(path.join(rootDir, 'steps/api_step.py'), 'utf8')
+    const cache = new PythonParseCache()
+    const result: TraverseTreeResult = {
+      standardLibDependencies: new Set(),
+      externalDependencies: new Set(),
+      files: new Set(),
+    }
+
+    // from . import services / try: from .compat import json / except ImportError: import json
+    cache.getImports(content, () =>
+      toPythonImports([
+        extracted(null, { level: 1, names: ['services'] }),
+        extracted('compat', { level: 1, names: ['json'], conditional: true }),
+        extracted('json', { conditional: true }),
+      ]),
+    )
+
+    traverseTree(rootDir, '/steps/api_step.py', result, {}, undefined, cache)
+
+    expect(Array.from(result.files)).toEqual([
+      '/steps/api_step.py',
+      '/steps/services/__init__.py',
+      '/steps/services/mailer.py',
+    ])
+    expect(Array.from(result.standardLibDependencies)).toEqual(['json'])
+  })
+})
@@ -0,0 +1,171 @@
+import fs from 'fs'
+import path from 'path'
+import { fileURLToPath } from 'url'
+import { Worker } from 'worker_threads'
+import { extractPythonData, type PythonResult } from './extract-python-data'
+import type { PythonImport } from './get-dependencies-from-file'
+import type { ParseCacheEntries, ParseCacheStats, PythonParseCache } from './parse-cache'
+import { PythonError } from './python-errors'
+
+export type AnalysisWorkerData = {
+  entries: ParseCacheEntries
+}
+
+export type AnalysisRequest = {
+  id: number
+  rootDir: string
+  filePath: string
+  dependenciesMap: Record<string, string>
+  fileContent?: string
+  // entries parsed by the other workers since the last request of this worker
+  entries?: ParseCacheEntries
+}
+
+export type AnalysisResponse = {
+  id: number
+  result?: PythonResult
+  error?: { message: string; filePath?: string }
+  entries: ParseCacheEntries
+  stats: ParseCacheStats
+}
+
+type PendingAnalysis = {
+  request: AnalysisRequest
+  resolve: (result: PythonResult) => void
+  reject: (error: Error) => void
+}
+
+const __dirname = path.dirname(fileURLToPath(import.meta.url))
+const workerPath = path.join(__dirname, 'analysis-worker.mjs')
+
+/**
+ * Runs extractPythonData (ANTLR parsing) in worker threads so the analysis of several steps doesn't
+ * block the event loop while other steps are copying files, installing dependencies or zipping.
+ *
+ * Each worker keeps its own parse cache seeded with the entries of the build cache, the entries used
+ * by each analysis are merged back into the build cache so they are persisted and counted in the stats.
+ * Files parsed by one worker are sent to the others with their next request, so no file is parsed twice
+ * unless two workers reach it at the same time.
+ *
+ * When the compiled worker is not available (running from sources) the analysis runs inline.
+ */
+export class PythonAnalysisPool {
+  private readonly workers: Worker[] = []
+  private readonly idleWorkers: Worker[] = []
+  private readonly queue: PendingAnalysis[] = []
+  private readonly running: Map<Worker, PendingAnalysis> = new Map()
+  // entries parsed by the workers in this build, in order, each worker has been sent the first synced ones
+  private readonly parsedEntries: Array<{ key: string; imports: PythonImport[]; worker: Worker }> = []
+  private readonly synced: Map<Worker, number> = new Map()
+  private nextId = 0
+
+  constructor(
+    private readonly parseCache: PythonParseCache,
+    private readonly size: number,
+  ) {}
+
+  analyze(
+    rootDir: string,
+    filePath: string,
+    dependenciesMap: Record<string, string>,
+    fileContent?: string,
+  ): Promise<PythonResult> {
+    if (this.size <= 1 || !fs.existsSync(workerPath)) {
+      return Promise.resolve().then(() =>
+        extractPythonData(rootDir, filePath, dependenciesMap, fileContent, this.parseCache),
+      )
+    }
+
+    return new Promise<PythonResult>((resolve, reject) => {
+      const request: AnalysisRequest = { id: this.nextId++, rootDir, filePath, dependenciesMap, fileContent }
+
+      this.queue.push({ request, resolve, reject })
+      this.dispatch()
+    })
+  }
+
+  async close(): Promise<void> {
+    await Promise.all(this.workers.map((worker) => worker.terminate()))
+    this.workers.length = 0
+    this.idleWorkers.length = 0
+    this.synced.clear()
+  }
+
+  private dispatch(): void {
+    while (this.queue.length > 0) {
+      const worker = this.idleWorkers.pop() ?? this.createWorker()
+
+      if (!worker) {
+        return
+      }
+
+      const pending = this.queue.shift()!
+      this.running.set(worker, pending)
+      worker.postMessage({ ...pending.request, entries: this.getUnsyncedEntries(worker) })
+    }
+  }
+
+  private getUnsyncedEntries(worker: Worker): ParseCacheEntries {
+    const entries = this.parsedEntries
+      .slice(this.synced.get(worker) ?? 0)
+      .filter((entry) => entry.worker !== worker)
+      .map(({ key, imports }) => [key, imports] as const)
+
+    this.synced.set(worker, this.parsedEntries.length)
+
+    return Object.fromEntries(entries)
+  }
+
+  private createWorker(): Worker | undefined {
+    if (this.workers.length >= this.size) {
+      return undefined
+    }
+
+    const workerData: AnalysisWorkerData = { entries: this.parseCache.getEntries() }
+    const worker = new Worker(workerPath, { workerData })
+
+    // the entries parsed so far are all in the build cache the worker was seeded with
+    this.synced.set(worker, this.parsedEntries.length)
+
+    // the pool must not keep the CLI alive, workers are terminated in close()
+    worker.unref()
+
+    worker.on('message', (response: AnalysisResponse) => {
+      const pending = this.running.get(worker)
+
+      this.running.delete(worker)
+      Object.entries(response.entries).forEach(([key, imports]) => {
+        if (!this.parseCache.has(key)) {
+          this.parsedEntries.push({ key, imports, worker })
+        }
+      })
+      this.parseCache.merge(response.entries, response.stats)
+      this.idleWorkers.push(worker)
+
+      if (pending) {
+        if (response.error) {
+          const { message, filePath } = response.error
+          pending.reject(filePath ? new PythonError(message, filePath) : new Error(message))
+        } else {
+          pending.resolve(response.result!)
+        }
+      }
+
+      this.dispatch()
+    })
+
+    worker.on('error', (error) => {
+      const pending = this.running.get(worker)
+
+      this.running.delete(worker)
+      this.synced.delete(worker)
+      this.workers.splice(this.workers.indexOf(worker), 1)
+      pending?.reject(error)
+      this.dispatch()
+    })
+
+    this.workers.push(worker)
+
+    return worker
+  }
+}
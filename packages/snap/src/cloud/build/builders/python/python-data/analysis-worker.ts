@@ -0,0 +1,29 @@
+import { parentPort, workerData } from 'worker_threads'
+import type { AnalysisRequest, AnalysisResponse, AnalysisWorkerData } from './analysis-pool'
+import { extractPythonData } from './extract-python-data'
+import { PythonParseCache } from './parse-cache'
+import { PythonError } from './python-errors'
+
+const { entries } = workerData as AnalysisWorkerData
+const parseCache = new PythonParseCache(undefined, entries)
+
+parentPort?.on('message', (request: AnalysisRequest) => {
+  const { id, rootDir, filePath, dependenciesMap, fileContent, entries: parsedEntries } = request
+  let response: AnalysisResponse
+
+  if (parsedEntries) {
+    parseCache.add(parsedEntries)
+  }
+
+  try {
+    const result = extractPythonData(rootDir, filePath, dependenciesMap, fileContent, parseCache)
+    response = { id, result, ...parseCache.drain() }
+  } catch (error) {
+    const err = error as Error
+    const errorFilePath = error instanceof PythonError ? error.filePath : undefined
+
+    response = { id, error: { message: err.message, filePath: errorFilePath }, ...parseCache.drain() }
+  }
+
+  parentPort?.postMessage(response)
+})
@@ -0,0 +1,55 @@
+import { spawnSync } from 'child_process'
+import path from 'path'
+import { fileURLToPath } from 'url'
+import type { PythonImport } from './get-dependencies-from-file'
+
+export type ExtractedImport = {
+  module: string | null // null for `from . import name`
+  level: number
+  names: string[]
+  line: number
+  conditional: boolean
+  typeChecking: boolean
+}
+
+export type ExtractedFile =
+  | { imports: ExtractedImport[]; error?: undefined }
+  | { imports?: undefined; error: { message: string; line: number | null; offset: number | null } }
+
+/**
+ * Converts the imports extracted by extract_imports.py to the modules followed by traverseTree
+ */
+export const toPythonImports = (imports: ExtractedImport[]): PythonImport[] => {
+  return imports.flatMap(({ module, level, names, conditional, typeChecking }) => {
+    const dots = '.'.repeat(level)
+
+    if (!module) {
+      // each name is either a submodule or a name defined in the package __init__.py
+      return names.map((name) => ({ module: `${dots}${name}`, optional: true }))
+    }
+
+    return [{ module: `${dots}${module}`, ...(conditional || typeChecking ? { optional: true } : {}) }]
+  })
+}
+
+/**
+ * Extracts the imports of all the files in a single Python process (parsing in parallel worker processes)
+ * with the stdlib `ast` module, which is faster than the ANTLR grammar and supports the syntax of the
+ * interpreter running it.
+ *
+ * Returns undefined when the interpreter can't be run, callers fall back to the ANTLR parser.
+ */
+export const batchExtractImports = (python: string, files: string[]): Record<string, ExtractedFile> | undefined => {
+  const __dirname = path.dirname(fileURLToPath(import.meta.url))
+  const result = spawnSync(python, [path.join(__dirname, 'extract_imports.py')], {
+    input: JSON.stringify(files),
+    encoding: 'utf-8',
+    maxBuffer: 256 * 1024 * 1024,
+  })
+
+  if (result.status !== 0 || !result.stdout) {
+    return undefined
+  }
+
+  return JSON.parse(result.stdout)
+}
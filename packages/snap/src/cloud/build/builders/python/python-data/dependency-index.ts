@@ -0,0 +1,138 @@
+import { spawnSync } from 'child_process'
+import { createHash } from 'crypto'
+import fs from 'fs'
+import path from 'path'
+import { fileURLToPath } from 'url'
+import { PythonError } from './python-errors'
+
+// Bump when the index format changes so indexes from previous builds are ignored
+const INDEX_VERSION = 1
+
+export type DistributionInfo = {
+  name: string
+  version: string
+  imports: string[]
+  requires: string[] // normalized distribution names
+}
+
+/**
+ * Normalized distribution name -> distribution installed in the virtual environment
+ */
+export type DependencyIndex = Record<string, DistributionInfo>
+
+type DependencyIndexFile = {
+  version: number
+  fingerprint: string
+  distributions: DependencyIndex
+}
+
+export const normalizeDistributionName = (name: string): string => name.replace(/[-_.]+/g, '-').toLowerCase()
+
+/**
+ * Identifies the set of installed distributions, installing, upgrading or removing a package changes
+ * the name of its metadata folder
+ */
+export const getVenvFingerprint = (sitePackagesDir: string): string => {
+  const metadataFolders = fs
+    .readdirSync(sitePackagesDir)
+    .filter((folder) => folder.endsWith('.dist-info') || folder.endsWith('.egg-info'))
+    .sort()
+
+  return createHash('sha256').update(sitePackagesDir).update(metadataFolders.join('\n')).digest('hex')
+}
+
+/**
+ * Indexes the distributions of the virtual environment with dependency_index.py, run by the venv interpreter.
+ * The index is cached by venv fingerprint, so the script only runs again when packages change.
+ *
+ * Returns undefined when the script can't be run, callers fall back to scanning site-packages.
+ */
+export const loadDependencyIndex = (args: {
+  python: string
+  sitePackagesDir: string
+  cacheFile?: string
+}): DependencyIndex | undefined => {
+  const { python, sitePackagesDir, cacheFile } = args
+  const fingerprint = getVenvFingerprint(sitePackagesDir)
+
+  if (cacheFile && fs.existsSync(cacheFile)) {
+    try {
+      const content: DependencyIndexFile = JSON.parse(fs.readFileSync(cacheFile, 'utf-8'))
+
+      if (content.version === INDEX_VERSION && content.fingerprint === fingerprint) {
+        return content.distributions
+      }
+    } catch (_error) {
+      // Ignore corrupted cache, the index is built again
+    }
+  }
+
+  const __dirname = path.dirname(fileURLToPath(import.meta.url))
+  const result = spawnSync(python, [path.join(__dirname, 'dependency_index.py')], {
+    encoding: 'utf-8',
+    maxBuffer: 64 * 1024 * 1024,
+  })
+
+  if (result.status !== 0 || !result.stdout) {
+    return undefined
+  }
+
+  const { distributions } = JSON.parse(result.stdout) as { distributions: DependencyIndex }
+
+  if (cacheFile) {
+    const content: DependencyIndexFile = { version: INDEX_VERSION, fingerprint, distributions }
+
+    fs.mkdirSync(path.dirname(cacheFile), { recursive: true })
+    fs.writeFileSync(cacheFile, JSON.stringify(content))
+  }
+
+  return distributions
+}
+
+/**
+ * Resolves the import names provided by each requirement, including the ones of its transitive
+ * requirements: a step importing `anyio` is satisfied by `httpx` in requirements.txt.
+ *
+ * Modules provided directly by a requirement always map to it, transitive ones map to the first
+ * requirement that pulls them in.
+ *
+ * @returns a map of the import name to the requirement name
+ */
+export const resolveDependenciesMap = (index: DependencyIndex, depNames: string[]): Record<string, string> => {
+  const result: Record<string, string> = {}
+
+  for (const depName of depNames) {
+    const distribution = index[normalizeDistributionName(depName)]
+
+    if (!distribution) {
+      throw new PythonError(`Could not find dependency name in site-packages: ${depName}`, depName)
+    }
+
+    distribution.imports.forEach((importName) => {
+      result[importName] = depName
+    })
+  }
+
+  for (const depName of depNames) {
+    const visited = new Set<string>([normalizeDistributionName(depName)])
+    const queue = [...index[normalizeDistributionName(depName)].requires]
+
+    while (queue.length > 0) {
+      const name = queue.shift() as string
+      const distribution = index[name]
+
+      // requirements for other platforms or python versions are not installed
+      if (visited.has(name) || !distribution) {
+        continue
+      }
+
+      visited.add(name)
+      distribution.imports.forEach((importName) => {
+        result[importName] ??= depName
+      })
+      queue.push(...distribution.requires)
+    }
+  }
+
+  return result
+}
@@ -0,0 +1,81 @@
+"""Prints the distributions installed in the running environment as JSON.
+
+Run by the Python builder with the interpreter of the project virtual environment, it maps each
+distribution to the top-level names it makes importable and to the distributions it requires, so
+the builder can tell which requirement provides every imported module in a single pass.
+"""
+import json
+import re
+import sys
+from importlib import metadata
+from typing import Dict, List
+
+_NAME = re.compile(r'^\s*([A-Za-z0-9][A-Za-z0-9._-]*)')
+_EXTRA_MARKER = re.compile(r';.*\bextra\s*==')
+
+
+def normalize(name: str) -> str:
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
+def get_requires(dist: metadata.Distribution) -> List[str]:
+    requires = []
+
+    for requirement in dist.requires or []:
+        # optional features are only installed when the extra is requested, they can't be relied on
+        if _EXTRA_MARKER.search(requirement):
+            continue
+
+        match = _NAME.match(requirement)
+        if match:
+            requires.append(normalize(match.group(1)))
+
+    return requires
+
+
+def get_imports() -> Dict[str, List[str]]:
+    """Distribution name -> top-level import names, namespace packages and single modules included"""
+    imports: Dict[str, List[str]] = {}
+
+    if hasattr(metadata, 'packages_distributions'):
+        for import_name, dist_names in metadata.packages_distributions().items():
+            for dist_name in dist_names:
+                imports.setdefault(normalize(dist_name), []).append(import_name)
+        return imports
+
+    # python < 3.10
+    for dist in metadata.distributions():
+        top_level = (dist.read_text('top_level.txt') or '').split()
+        if not top_level:
+            top_level = list({
+                file.parts[0] if len(file.parts) > 1 else file.name.split('.')[0]
+                for file in dist.files or []
+                if file.suffix == '.py' and '.dist-info' not in file.parts[0]
+            })
+        imports.setdefault(normalize(dist.metadata['Name']), []).extend(top_level)
+
+    return imports
+
+
+def main() -> None:
+    imports = get_imports()
+    distributions = {}
+
+    for dist in metadata.distributions():
+        name = dist.metadata['Name']
+        if not name:
+            continue
+
+        key = normalize(name)
+        distributions[key] = {
+            'name': name,
+            'version': dist.version,
+            'imports': sorted(set(imports.get(key, [])) - {'__pycache__'}),
+            'requires': get_requires(dist),
+        }
+
+    json.dump({'distributions': distributions}, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
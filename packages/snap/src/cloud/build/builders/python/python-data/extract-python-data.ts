@@ -1,3 +1,4 @@
+import type { PythonParseCache } from './parse-cache'
 import type { Requirements } from './read-requirements'
 import { type TraverseTreeResult, traverseTree } from './traverse-tree'
 
@@ -13,6 +14,7 @@ export const extractPythonData = (
   dependenciesMap: Record<string, string>,
   // optional
   fileContent?: string, // used on files that are not on the file system
+  parseCache?: PythonParseCache,
 ): PythonResult => {
   const result: TraverseTreeResult = {
     standardLibDependencies: new Set(),
@@ -20,7 +22,7 @@ export const extractPythonData = (
     files: new Set(),
   }
 
-  traverseTree(rootDir, filePath, result, dependenciesMap, fileContent)
+  traverseTree(rootDir, filePath, result, dependenciesMap, fileContent, parseCache)
 
   const resultDependencies: Requirements = {}
 
@@ -0,0 +1,91 @@
+"""Extracts the imports of many Python files at once with the stdlib `ast` module.
+
+Reads a JSON list of file paths from stdin and prints, for each file, either its imports or its syntax
+error. Files are parsed in parallel worker processes when there are enough of them to pay off.
+
+Each import has the module (None for `from . import x`), its relative level, the imported names and
+whether it is conditional (inside a try/if block) or only done for type checkers (`if TYPE_CHECKING:`).
+"""
+import ast
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List
+
+# below this, starting worker processes costs more than parsing the files
+PARALLEL_THRESHOLD = 32
+
+
+def _is_type_checking(test: ast.expr) -> bool:
+    if isinstance(test, ast.Name):
+        return test.id == 'TYPE_CHECKING'
+    if isinstance(test, ast.Attribute):
+        return test.attr == 'TYPE_CHECKING'
+    return False
+
+
+# statement lists that can hold imports, expressions are never visited which keeps the walk cheap
+_BODIES = ('body', 'orelse', 'finalbody', 'handlers', 'cases')
+
+
+class ImportCollector:
+    def __init__(self) -> None:
+        self.imports: List[Dict[str, Any]] = []
+
+    def _add(self, node: ast.stmt, module: Any, level: int, names: List[str], flags: Dict[str, bool]) -> None:
+        self.imports.append({'module': module, 'level': level, 'names': names, 'line': node.lineno, **flags})
+
+    def collect(self, nodes: List[Any], conditional: bool = False, type_checking: bool = False) -> None:
+        flags = {'conditional': conditional, 'typeChecking': type_checking}
+
+        for node in nodes:
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    self._add(node, alias.name, 0, [], flags)
+            elif isinstance(node, ast.ImportFrom):
+                names = [alias.name for alias in node.names]
+                self._add(node, node.module, node.level or 0, names, flags)
+            elif isinstance(node, ast.If) and _is_type_checking(node.test):
+                self.collect(node.body, conditional, True)
+                self.collect(node.orelse, True, type_checking)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.With, ast.AsyncWith)):
+                self.collect(node.body, conditional, type_checking)
+            else:
+                # if/try/match/loops: the import may not run
+                for field in _BODIES:
+                    children = getattr(node, field, None)
+                    if children:
+                        self.collect(children, True, type_checking)
+
+
+def extract(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, 'rb') as file:
+            tree = ast.parse(file.read(), filename=path)
+    except SyntaxError as error:
+        return {'error': {'message': error.msg, 'line': error.lineno, 'offset': error.offset}}
+    except (OSError, ValueError) as error:
+        return {'error': {'message': str(error), 'line': None, 'offset': None}}
+
+    collector = ImportCollector()
+    collector.collect(tree.body)
+
+    return {'imports': collector.imports}
+
+
+def main() -> None:
+    paths: List[str] = json.load(sys.stdin)
+    workers = min(os.cpu_count() or 1, max(1, len(paths) // PARALLEL_THRESHOLD))
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(extract, paths, chunksize=PARALLEL_THRESHOLD))
+    else:
+        results = [extract(path) for path in paths]
+
+    json.dump(dict(zip(paths, results)), sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
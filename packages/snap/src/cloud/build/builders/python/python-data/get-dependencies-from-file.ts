@@ -3,6 +3,7 @@ import { createVisitor } from 'python-ast'
 import { Python3Lexer } from 'python-ast/dist/parser/Python3Lexer.js'
 import { Python3Parser } from 'python-ast/dist/parser/Python3Parser.js'
 import { STANDARD_LIB_MODULES } from './constants'
+import type { PythonParseCache } from './parse-cache'
 import { PythonCompilationError } from './python-errors'
 
 function parse(source: string, sourceName: string) {
@@ -26,17 +27,26 @@ function parse(source: string, sourceName: string) {
   return parser.file_input()
 }
 
+export type PythonImport = {
+  module: string // relative imports keep their leading dots
+  /**
+   * Conditional or type checking only import, the build doesn't fail when it can't be resolved
+   */
+  optional?: boolean
+}
+
 export type Dependencies = {
   standardLibDependencies: Set<string>
   externalDependencies: Set<string>
   projectDependencies: Set<string>
+  optionalDependencies: Set<string> // project dependencies that are only imported optionally
 }
 
-export const getDependenciesFromFile = (
-  content: string,
-  path: string,
-  externalDependenciesMap: Record<string, string>,
-): Dependencies => {
+/**
+ * Parses the file with the ANTLR grammar and returns every imported module, relative imports keep their
+ * leading dots. Used when the imports were not extracted ahead with the Python `ast` module.
+ */
+export const getImportsFromFile = (content: string, path: string): PythonImport[] => {
   const result = parse(content + '\n', path)
   const modulesSet = new Set<string>()
 
@@ -66,23 +76,41 @@ export const getDependenciesFromFile = (
     },
   }).visit(result)
 
+  return Array.from(modulesSet).map((module) => ({ module }))
+}
+
+export const getDependenciesFromFile = (
+  content: string,
+  path: string,
+  externalDependenciesMap: Record<string, string>,
+  parseCache?: PythonParseCache,
+): Dependencies => {
+  const imports = parseCache
+    ? parseCache.getImports(content, () => getImportsFromFile(content, path))
+    : getImportsFromFile(content, path)
+
   const dependencies: Dependencies = {
     standardLibDependencies: new Set(),
     externalDependencies: new Set(),
     projectDependencies: new Set(),
+    optionalDependencies: new Set(),
   }
+  const requiredModules = new Set(imports.filter(({ optional }) => !optional).map(({ module }) => module))
 
-  for (const module of modulesSet) {
+  for (const { module } of imports) {
     const [moduleName] = module.split('.')
+    const relative = module[0] === '.'
 
-    if (module[0] === '.') {
-      dependencies.projectDependencies.add(module)
-    } else if (STANDARD_LIB_MODULES.has(module)) {
+    if (!relative && STANDARD_LIB_MODULES.has(module)) {
       dependencies.standardLibDependencies.add(module)
-    } else if (externalDependenciesMap[module] || externalDependenciesMap[moduleName]) {
+    } else if (!relative && (externalDependenciesMap[module] || externalDependenciesMap[moduleName])) {
       dependencies.externalDependencies.add(module)
     } else {
       dependencies.projectDependencies.add(module)
+
+      if (!requiredModules.has(module)) {
+        dependencies.optionalDependencies.add(module)
+      }
     }
   }
 
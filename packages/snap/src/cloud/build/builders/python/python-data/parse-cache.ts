@@ -0,0 +1,154 @@
+import { createHash } from 'crypto'
+import fs from 'fs'
+import path from 'path'
+import type { PythonImport } from './get-dependencies-from-file'
+
+// Bump when the import extraction changes so stale entries from previous builds are ignored
+const CACHE_VERSION = 2
+
+type ParseCacheFile = {
+  version: number
+  entries: ParseCacheEntries
+}
+
+export type ParseCacheStats = {
+  hits: number
+  misses: number
+  parseTimeMs: number
+}
+
+export type ParseCacheEntries = Record<string, PythonImport[]>
+
+export const getContentKey = (content: string): string => createHash('sha256').update(content).digest('hex')
+
+/**
+ * Caches the imports found in each Python file, keyed by the hash of the file content.
+ *
+ * The same module is often reached from many steps (and again from the API router), with the cache
+ * it is only parsed once per build. When a cache file is given, entries are persisted between builds
+ * so only files whose content changed are parsed again.
+ */
+export class PythonParseCache {
+  private readonly entries: Map<string, PythonImport[]> = new Map()
+  private readonly usedKeys: Set<string> = new Set()
+  private readonly stats: ParseCacheStats = { hits: 0, misses: 0, parseTimeMs: 0 }
+
+  constructor(
+    private readonly cacheFile?: string,
+    entries?: ParseCacheEntries,
+  ) {
+    if (entries) {
+      Object.entries(entries).forEach(([key, imports]) => this.entries.set(key, imports))
+    }
+
+    if (cacheFile && fs.existsSync(cacheFile)) {
+      try {
+        const content: ParseCacheFile = JSON.parse(fs.readFileSync(cacheFile, 'utf-8'))
+
+        if (content.version === CACHE_VERSION) {
+          Object.entries(content.entries).forEach(([key, imports]) => this.entries.set(key, imports))
+        }
+      } catch (_error) {
+        // Ignore corrupted cache, it will be rewritten on save
+      }
+    }
+  }
+
+  getImports(content: string, parse: () => PythonImport[]): PythonImport[] {
+    const key = getContentKey(content)
+    const cached = this.entries.get(key)
+
+    this.usedKeys.add(key)
+
+    if (cached) {
+      this.stats.hits++
+      return cached
+    }
+
+    const start = performance.now()
+    const imports = parse()
+
+    this.stats.parseTimeMs += performance.now() - start
+    this.stats.misses++
+    this.entries.set(key, imports)
+
+    return imports
+  }
+
+  has(key: string): boolean {
+    return this.entries.has(key)
+  }
+
+  /**
+   * Adds entries parsed ahead of the analysis, they are only persisted if an analysis uses them
+   */
+  add(entries: ParseCacheEntries): void {
+    Object.entries(entries).forEach(([key, imports]) => this.entries.set(key, imports))
+  }
+
+  getEntries(): ParseCacheEntries {
+    return Object.fromEntries(this.entries)
+  }
+
+  /**
+   * Returns the entries used since the last call along with the stats of that period, used to report
+   * the work done by an analysis worker back to the cache owned by the main thread
+   */
+  drain(): { entries: ParseCacheEntries; stats: ParseCacheStats } {
+    const entries = this.getUsedEntries()
+    const stats = this.getStats()
+
+    this.usedKeys.clear()
+    Object.assign(this.stats, { hits: 0, misses: 0, parseTimeMs: 0 })
+
+    return { entries, stats }
+  }
+
+  merge(entries: ParseCacheEntries, stats: ParseCacheStats): void {
+    Object.entries(entries).forEach(([key, imports]) => {
+      this.entries.set(key, imports)
+      this.usedKeys.add(key)
+    })
+
+    this.stats.hits += stats.hits
+    this.stats.misses += stats.misses
+    this.stats.parseTimeMs += stats.parseTimeMs
+  }
+
+  getStats(): ParseCacheStats {
+    return { ...this.stats }
+  }
+
+  getHitRate(): number {
+    const total = this.stats.hits + this.stats.misses
+    return total === 0 ? 0 : this.stats.hits / total
+  }
+
+  /**
+   * Persists the entries used in this build, entries of files that no longer exist are dropped
+   */
+  save(): void {
+    if (!this.cacheFile) {
+      return
+    }
+
+    const content: ParseCacheFile = { version: CACHE_VERSION, entries: this.getUsedEntries() }
+
+    fs.mkdirSync(path.dirname(this.cacheFile), { recursive: true })
+    fs.writeFileSync(this.cacheFile, JSON.stringify(content))
+  }
+
+  private getUsedEntries(): ParseCacheEntries {
+    const entries: ParseCacheEntries = {}
+
+    this.usedKeys.forEach((key) => {
+      const imports = this.entries.get(key)
+
+      if (imports) {
+        entries[key] = imports
+      }
+    })
+
+    return entries
+  }
+}
@@ -2,6 +2,7 @@ import fs from 'fs'
 import path from 'path'
 import { convertImportToPath } from './convert-import-path'
 import { getDependenciesFromFile } from './get-dependencies-from-file'
+import type { PythonParseCache } from './parse-cache'
 import { PythonFileNotFoundError, PythonImportNotFoundError } from './python-errors'
 
 export type TraverseTreeResult = {
@@ -10,6 +11,16 @@ export type TraverseTreeResult = {
   files: Set<string> // relative to rootDir
 }
 
+/**
+ * Path of the module file, a package directory resolves to its __init__.py
+ */
+const resolveModulePath = (baseDir: string, pythonPath: string): string => {
+  const modulePath = path.resolve(baseDir, `${pythonPath}.py`)
+  const packagePath = path.resolve(baseDir, pythonPath, '__init__.py')
+
+  return !fs.existsSync(modulePath) && fs.existsSync(packagePath) ? packagePath : modulePath
+}
+
 export const traverseTree = (
   rootDir: string,
   filePath: string,
@@ -17,6 +28,7 @@ export const traverseTree = (
   dependenciesMap: Record<string, string>,
   // optional
   fileContent?: string,
+  parseCache?: PythonParseCache,
 ): void => {
   const fileAbsolutePath = path.join(rootDir, filePath)
 
@@ -31,7 +43,7 @@ export const traverseTree = (
   }
 
   const content = fileContent || fs.readFileSync(fileAbsolutePath, 'utf8')
-  const dependencies = getDependenciesFromFile(content, filePath, dependenciesMap)
+  const dependencies = getDependenciesFromFile(content, filePath, dependenciesMap, parseCache)
 
   result.files.add(filePath)
 
@@ -45,24 +57,29 @@ export const traverseTree = (
   for (const dependency of dependencies.projectDependencies) {
     const pythonPath = convertImportToPath(dependency)
     const fileFolder = path.dirname(fileAbsolutePath)
-    const dependencyFilePath = path.resolve(fileFolder, `${pythonPath}.py`)
+    const dependencyFilePath = resolveModulePath(fileFolder, pythonPath)
     const dependencyPath = dependencyFilePath.replace(rootDir, '')
 
     if (!result.files.has(dependencyPath)) {
       try {
-        traverseTree(rootDir, dependencyPath, result, dependenciesMap)
+        traverseTree(rootDir, dependencyPath, result, dependenciesMap, undefined, parseCache)
       } catch (error) {
         if (error instanceof PythonFileNotFoundError) {
           if (dependency[0] !== '.') {
             // try root folder
             try {
-              const rootDependencyFilePath = path.resolve(rootDir, `${pythonPath}.py`).replace(rootDir, '')
-              return traverseTree(rootDir, rootDependencyFilePath, result, dependenciesMap)
+              const rootDependencyFilePath = resolveModulePath(rootDir, pythonPath).replace(rootDir, '')
+              return traverseTree(rootDir, rootDependencyFilePath, result, dependenciesMap, undefined, parseCache)
             } catch (_error) {
               // let it throw
             }
           }
 
+          if (dependencies.optionalDependencies.has(dependency)) {
+            // e.g. a fallback inside try/except ImportError, or a name defined in the package __init__.py
+            continue
+          }
+
           throw new PythonImportNotFoundError(filePath, dependency)
         }
 
@@ -0,0 +1,38 @@
+import fs from 'fs'
+import path from 'path'
+import { fileURLToPath } from 'url'
+import { createRouteTree, getParamNames } from './route-tree'
+
+export type PythonRouterRoute = {
+  stepName: string
+  method: string
+  path: string
+  moduleName: string
+}
+
+/**
+ * Renders router.py from router_template.py.
+ *
+ * Step modules are not imported by the router at load time, they are imported on the first request
+ * hitting the route (or upfront with MOTIA_ROUTER_WARMUP=true). Routes are matched through a segment
+ * trie built here, so path params are supported and no matching work is done at cold start.
+ */
+export const renderPythonRouter = (routes: PythonRouterRoute[]): string => {
+  const imports = routes.map((route) => `    import ${route.moduleName}`).join('\n')
+
+  const routerPaths = routes
+    .map((route) => {
+      const args = [route.stepName, route.method.toLowerCase(), route.path, route.moduleName, getParamNames(route.path)]
+      return `    RouterPath(${args.map((arg) => JSON.stringify(arg)).join(', ')})`
+    })
+    .join(',\n')
+
+  const routeTree = createRouteTree(routes)
+  const __dirname = path.dirname(fileURLToPath(import.meta.url))
+
+  return fs
+    .readFileSync(path.join(__dirname, 'router_template.py'), 'utf-8')
+    .replace('    # {{imports}}', imports)
+    .replace('    # {{routes}}', routerPaths)
+    .replace('# {{route tree}}', `route_tree = ${JSON.stringify(routeTree)}`)
+}
@@ -0,0 +1,69 @@
+export type RouteTreeEntry = {
+  method: string
+  path: string
+}
+
+/**
+ * A segment trie node. Static children are matched before the path param child.
+ * `routes` maps an HTTP method to the index of the route in the router table.
+ */
+export type RouteTreeNode = {
+  static: Record<string, RouteTreeNode>
+  param?: RouteTreeNode
+  routes: Record<string, number>
+}
+
+const createNode = (): RouteTreeNode => ({ static: {}, routes: {} })
+
+export const splitPath = (routePath: string): string[] => routePath.split('/').filter(Boolean)
+
+/**
+ * Returns the name of the path param if the segment is a param (`:id` or `{id}`)
+ */
+export const getParamName = (segment: string): string | undefined => {
+  if (segment.startsWith(':')) {
+    return segment.substring(1)
+  }
+
+  const match = /^\{(.+)\}$/.exec(segment)
+
+  return match ? match[1] : undefined
+}
+
+/**
+ * Returns the path param names of a route, in the order they appear in the path
+ */
+export const getParamNames = (routePath: string): string[] => {
+  return splitPath(routePath)
+    .map(getParamName)
+    .filter((name): name is string => !!name)
+}
+
+/**
+ * Builds a segment trie for the given routes, the index of the route in the array is stored in the leaf.
+ * Param names are not stored in the tree so routes like `/pets/:id` and `/pets/:petId/orders` can share
+ * the same param node, they are resolved from the route itself once it matches.
+ *
+ * The tree only contains plain objects, strings and numbers so it can be embedded as a Python literal.
+ */
+export const createRouteTree = (routes: RouteTreeEntry[]): RouteTreeNode => {
+  const root = createNode()
+
+  routes.forEach((route, index) => {
+    let node = root
+
+    for (const segment of splitPath(route.path)) {
+      if (getParamName(segment)) {
+        node.param ??= createNode()
+        node = node.param
+      } else {
+        node.static[segment] ??= createNode()
+        node = node.static[segment]
+      }
+    }
+
+    node.routes[route.method.toUpperCase()] = index
+  })
+
+  return root
+}
@@ -1,15 +1,92 @@
-from typing import Dict, Callable, Any, Literal
-# from steps.api_step import handler as route0_handler, config as route0_config
-# {{imports}}
+import importlib
+import os
+from types import ModuleType
+from typing import TYPE_CHECKING, Dict, Callable, Any, Literal, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    # Step modules are imported lazily by RouterPath, these imports are never executed
+    # but they let the build resolve the files each route depends on
+    pass
+    # import steps.api_step
+    # {{imports}}
 
 class RouterPath:
-    def __init__(self, step_name: str, method: Literal['get', 'post', 'put', 'delete', 'patch', 'options', 'head'], handler: Callable, config: Dict[str, Any]):
+    """Route entry, the step module is only imported when the route is hit for the first time"""
+
+    def __init__(self, step_name: str, method: Literal['get', 'post', 'put', 'delete', 'patch', 'options', 'head'], path: str, module_name: str, param_names: List[str]):
         self.step_name = step_name
         self.method = method
-        self.handler = handler
-        self.config = config
+        self.path = path
+        self.module_name = module_name
+        self.param_names = param_names
+        self._module: Optional[ModuleType] = None
+
+    def load(self) -> ModuleType:
+        if self._module is None:
+            self._module = importlib.import_module(self.module_name)
+        return self._module
+
+    @property
+    def handler(self) -> Callable:
+        return self.load().handler
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        return self.load().config
+
+routes: List[RouterPath] = [
+    # RouterPath("Parallel Merge Python", "post", "/api/parallel-merge/:id", "steps.api_step", ["id"])
+    # {{routes}}
+]
+
+# Segment trie precompiled at build time, leaves hold the index of the route in `routes`
+route_tree: Dict[str, Any] = {'static': {}, 'routes': {}}
+# {{route tree}}
+
+router_paths: Dict[str, RouterPath] = {f'{route.method.upper()} {route.path}': route for route in routes}
+
+def _match_node(node: Dict[str, Any], segments: List[str], index: int, method: str, params: List[str]) -> Optional[int]:
+    if index == len(segments):
+        return node['routes'].get(method)
+
+    child = node['static'].get(segments[index])
+    if child is not None:
+        found = _match_node(child, segments, index + 1, method, params)
+        if found is not None:
+            return found
+
+    param = node.get('param')
+    if param is not None:
+        params.append(segments[index])
+        found = _match_node(param, segments, index + 1, method, params)
+        if found is not None:
+            return found
+        params.pop()
+
+    return None
+
+def match_route(method: str, path: str) -> Optional[Tuple[RouterPath, Dict[str, str]]]:
+    """Returns the route matching the request and its path params, or None when nothing matches"""
+    method = method.upper()
+    path = path.split('?', 1)[0]
+
+    route = router_paths.get(f'{method} {path}')
+    if route is not None and not route.param_names:
+        return route, {}
+
+    params: List[str] = []
+    index = _match_node(route_tree, [segment for segment in path.split('/') if segment], 0, method, params)
+
+    if index is None:
+        return None
+
+    route = routes[index]
+    return route, dict(zip(route.param_names, params))
+
+def warmup() -> None:
+    """Imports every step module upfront instead of on the first request"""
+    for route in routes:
+        route.load()
 
-router_paths: Dict[str, RouterPath] = {
-    # 'POST /api/parallel-merge/python': RouterPath('Parallel Merge Python', 'post', route0_handler, route0_config)
-    # {{router paths}}
-}
+if os.environ.get('MOTIA_ROUTER_WARMUP') == 'true':
+    warmup()
@@ -14,10 +14,9 @@ export const defaultUvConfig: UvPackageConfig = {
 }
 
 export class UvPackager {
-  constructor(private readonly config: UvPackageConfig = defaultUvConfig) {}
+  constructor(public readonly config: UvPackageConfig = defaultUvConfig) {}
 
-  async packageDependencies(cwd: string): Promise<void> {
-    const requirementsFile = path.join(cwd, 'requirements.txt')
+  async packageDependencies(cwd: string, requirementsFile: string = path.join(cwd, 'requirements.txt')): Promise<void> {
     const args = [
       'pip',
       'install',
@@ -38,6 +37,18 @@ export class UvPackager {
     await this.runCommand('uv', args, { cwd })
   }
 
+  /**
+   * Returns the path of an interpreter matching the target python version, if one is installed
+   */
+  async findPython(): Promise<string | undefined> {
+    try {
+      const output = await this.runCommand('uv', ['python', 'find', this.config.pythonVersion || '3.13'])
+      return output.trim() || undefined
+    } catch (_error) {
+      return undefined
+    }
+  }
+
   private async runCommand(
     command: string,
     args: string[],
@@ -73,6 +73,7 @@ export const deployEndpoints = (server: MotiaServer, lockedData: LockedData) =>
             steps: builder.stepsConfig,
             streams: builder.streamsConfig,
             routers: builder.routersConfig,
+            layers: builder.getLayersConfig(),
           })
         } catch (error: any) {
           console.error('Deployment failed:', error)
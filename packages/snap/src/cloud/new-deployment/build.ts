@@ -56,6 +56,7 @@ export const build = async (listener: BuildListener): Promise<Builder> => {
 
   await Promise.all(lockedData.activeSteps.map((step) => builder.buildStep(step)))
   await builder.buildApiSteps(lockedData.activeSteps.filter(isApiStep))
+  await builder.finalize()
 
   const streams = lockedData.listStreams()
 
@@ -71,6 +72,7 @@ export const build = async (listener: BuildListener): Promise<Builder> => {
     steps: builder.stepsConfig,
     streams: builder.streamsConfig,
     routers: builder.routersConfig,
+    layers: builder.getLayersConfig(),
   }
   fs.writeFileSync(stepsConfigPath, JSON.stringify(stepsFile, null, 2))
 
@@ -1,5 +1,5 @@
 import axios from 'axios'
-import type { BuildRoutersConfig, BuildStepsConfig, BuildStreamsConfig } from '../../build/builder'
+import type { BuildLayersConfig, BuildRoutersConfig, BuildStepsConfig, BuildStreamsConfig } from '../../build/builder'
 import { cloudEndpoints } from './endpoints'
 
 type StartDeploymentRequest = {
@@ -8,6 +8,7 @@ type StartDeploymentRequest = {
   steps: BuildStepsConfig
   streams: BuildStreamsConfig
   routers: BuildRoutersConfig
+  layers?: BuildLayersConfig
 }
 
 type StartDeploymentResult = {
@@ -25,6 +25,7 @@ export const deploy = async (input: DeployInput): Promise<void> => {
     steps: builder.stepsConfig,
     streams: builder.streamsConfig,
     routers: builder.routersConfig,
+    layers: builder.getLayersConfig(),
   })
 
   context.log('starting-deployment', (message: Message) => message.tag('success').append('Deployment started'))
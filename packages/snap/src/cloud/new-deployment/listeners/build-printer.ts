@@ -3,6 +3,7 @@ import { Printer } from '@motiadev/core'
 import pc from 'picocolors'
 import { CLIOutputManager } from '../../cli-output-manager'
 import { prettyBytes } from '../utils/pretty-bytes'
+import type { BuildStats } from './listener.types'
 
 const building = pc.yellow('➜ [BUILDING]')
 const built = pc.green('✓ [BUILT]')
@@ -95,6 +96,18 @@ export class BuildPrinter {
     )
   }
 
+  printBuildStats(id: string, stats: BuildStats) {
+    this.output.log(`build-stats-${id}`, (message) =>
+      message
+        .tag('info')
+        .append(id, 'gray')
+        .table(
+          ['Stat', 'Value'],
+          Object.entries(stats).map(([key, value]) => [key, value]),
+        ),
+    )
+  }
+
   printStepFailed(step: Step, error: Error) {
     const stepLanguage = this.getStepLanguage(step)
     const stepType = this.printer.getStepType(step)
@@ -3,7 +3,13 @@ import pc from 'picocolors'
 import type { BuildStepConfig } from '../../build/builder'
 import type { CliContext } from '../../config-utils'
 import { BuildPrinter } from './build-printer'
-import type { DeployData, DeploymentListener, DeploymentOutput, ValidationError } from './listener.types'
+import type {
+  BuildStats,
+  DeployData,
+  DeploymentListener,
+  DeploymentOutput,
+  ValidationError,
+} from './listener.types'
 import { printDeploymentStatus } from './print-deployment-status'
 import { DeployPrinter } from './printer'
 
@@ -41,6 +47,10 @@ export class CliListener implements DeploymentListener {
     this.printer.printApiRouterBuilt(language, size)
   }
 
+  onBuildStats(id: string, stats: BuildStats) {
+    this.printer.printBuildStats(id, stats)
+  }
+
   onWarning(id: string, warning: string) {
     this.context.log(id, (message) => message.tag('warning').append(warning))
   }
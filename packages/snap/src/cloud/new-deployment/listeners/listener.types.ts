@@ -7,6 +7,11 @@ export type ValidationError = {
   step: BuildStepConfig
 }
 
+/**
+ * Label -> formatted value, e.g. { 'Cache hit rate': '87.5%' }
+ */
+export type BuildStats = Record<string, string>
+
 export type BuildListener = {
   onBuildStart: (step: Step) => void
   onBuildProgress: (step: Step, message: string) => void
@@ -17,6 +22,8 @@ export type BuildListener = {
   onApiRouterBuilding: (language: string) => void
   onApiRouterBuilt: (language: string, size: number) => void
 
+  onBuildStats: (id: string, stats: BuildStats) => void
+
   onStreamCreated: (stream: Stream) => void
 
   onWarning: (id: string, message: string) => void
@@ -6,7 +6,7 @@ import {
   DeploymentStreamManager,
   type UploadOutput,
 } from '../streams/deployment-stream'
-import type { DeployData, DeploymentListener, ValidationError } from './listener.types'
+import type { BuildStats, DeployData, DeploymentListener, ValidationError } from './listener.types'
 
 export class StreamingDeploymentListener implements DeploymentListener {
   private errors: ValidationError[] = []
@@ -129,6 +129,13 @@ export class StreamingDeploymentListener implements DeploymentListener {
     await this.updateStream({ message })
   }
 
+  async onBuildStats(id: string, stats: BuildStats) {
+    const summary = Object.entries(stats)
+      .map(([key, value]) => `${key}: ${value}`)
+      .join(', ')
+    await this.updateStream({ message: `${id} build stats (${summary})` })
+  }
+
   async onWarning(id: string, warning: string) {
     this.warnings.push({
       relativePath: id,
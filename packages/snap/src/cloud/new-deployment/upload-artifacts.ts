@@ -9,6 +9,7 @@ export const uploadArtifacts = async (
 ): Promise<void> => {
   const stepEntries = Object.entries(builder.stepsConfig)
   const routerEntries = Object.entries(builder.routersConfig)
+  const layerPaths = Object.keys(builder.layersConfig)
 
   await Promise.all([
     ...stepEntries.map(async ([stepPath, stepConfig]) => {
@@ -25,5 +26,7 @@ export const uploadArtifacts = async (
       })
       listener.routeUploadEnd(routerPath, language)
     }),
+    // layers are shared by many bundles, their progress is not reported individually
+    ...layerPaths.map((layerPath) => upload(deploymentToken, layerPath, () => {})),
   ])
 }
@@ -0,0 +1,44 @@
+import { Logger, readRpcRecording, replayRpcRecording } from '@motiadev/core'
+import pc from 'picocolors'
+import { activatePythonVenv } from './utils/activate-python-env'
+
+type ReplayOptions = {
+  baseDir: string
+  realTiming: boolean
+}
+
+const formatMs = (ms?: number) => (ms === undefined ? '-' : `${ms.toFixed(1)}ms`)
+
+export const replay = async (file: string, { baseDir, realTiming }: ReplayOptions): Promise<boolean> => {
+  const recording = await readRpcRecording(file)
+
+  activatePythonVenv({ baseDir })
+
+  const report = await replayRpcRecording(recording, { baseDir, logger: new Logger(), realTiming })
+  const { recorded, replayed } = report
+  const change = recorded.duration ? ((replayed.duration - recorded.duration) / recorded.duration) * 100 : 0
+  const changeLabel = pc.gray(`(${change >= 0 ? '+' : ''}${change.toFixed(1)}%)`)
+
+  console.log(`\n${pc.bold(report.step)} ${pc.gray(recording.filePath)}`)
+  console.log(`  recorded ${formatMs(recorded.duration)}, ${recorded.requests} requests`)
+  console.log(`  replayed ${formatMs(replayed.duration)}, ${replayed.requests} requests ${changeLabel}`)
+
+  console.log(`\n${pc.bold('Outputs')}`)
+  report.timeline.forEach(({ method, recorded, replayed }) => {
+    console.log(`  ${method.padEnd(32)} ${formatMs(recorded).padStart(12)} ${formatMs(replayed).padStart(12)}`)
+  })
+
+  if (report.differences.length === 0) {
+    console.log(`\n${pc.green('✓ [SUCCESS]')} Outputs match the recording`)
+    return true
+  }
+
+  console.log(`\n${pc.red('✘ [ERROR]')} ${report.differences.length} outputs differ from the recording`)
+  report.differences.forEach(({ index, recorded, replayed }) => {
+    console.log(`  #${index}`)
+    console.log(`    ${pc.gray('recorded')} ${recorded ? `${recorded.method} ${JSON.stringify(recorded.args)}` : '-'}`)
+    console.log(`    ${pc.gray('replayed')} ${replayed ? `${replayed.method} ${JSON.stringify(replayed.args)}` : '-'}`)
+  })
+
+  return false
+}
@@ -23,6 +23,11 @@ export const getSitePackagesPath = ({ baseDir, pythonVersion = '3.13' }: VenvCon
   return path.join(venvPath, 'lib', actualPythonVersionPath, 'site-packages')
 }
 
+export const getVenvPythonPath = ({ baseDir }: VenvConfig): string => {
+  const venvBinPath = path.join(baseDir, 'python_modules', process.platform === 'win32' ? 'Scripts' : 'bin')
+  return path.join(venvBinPath, process.platform === 'win32' ? 'python.exe' : 'python')
+}
+
 export const activatePythonVenv = ({ baseDir, isVerbose = false, pythonVersion = '3.13' }: VenvConfig): void => {
   internalLogger.info('Activating Python environment')
 
@@ -44,8 +49,7 @@ export const activatePythonVenv = ({ baseDir, isVerbose = false, pythonVersion =
 
   // Log Python environment information if verbose mode is enabled
   if (isVerbose) {
-    const pythonPath =
-      process.platform === 'win32' ? path.join(venvBinPath, 'python.exe') : path.join(venvBinPath, 'python')
+    const pythonPath = getVenvPythonPath({ baseDir })
 
     const relativePath = (path: string) => path.replace(baseDir, '<projectDir>')
 
@@ -0,0 +1,31 @@
+export type ConcurrencyLimit = <T>(task: () => Promise<T>) => Promise<T>
+
+/**
+ * Returns a function that runs the given tasks with at most `concurrency` of them in flight,
+ * tasks are started in the order they were submitted
+ */
+export const limitConcurrency = (concurrency: number): ConcurrencyLimit => {
+  const queue: Array<() => void> = []
+  let active = 0
+
+  const next = () => {
+    if (active < concurrency && queue.length > 0) {
+      active++
+      queue.shift()!()
+    }
+  }
+
+  return <T>(task: () => Promise<T>) =>
+    new Promise<T>((resolve, reject) => {
+      queue.push(() => {
+        Promise.resolve()
+          .then(task)
+          .then(resolve, reject)
+          .finally(() => {
+            active--
+            next()
+          })
+      })
+      next()
+    })
+}
@@ -60,6 +60,8 @@ export default defineConfig({
     index: './src/index.ts',
     workbench: './src/workbench.ts',
     cli: './src/cli.ts',
+    'cloud/build/builders/python/python-data/analysis-worker':
+      './src/cloud/build/builders/python/python-data/analysis-worker.ts',
   },
   format: 'esm',
   platform: 'node',
@@ -110,6 +112,7 @@ export default defineConfig({
     'node:path',
     'fs/promises',
     'readline',
+    'worker_threads',
   ],
   dts: {
     build: true,
@@ -141,6 +144,14 @@ export default defineConfig({
       join(__dirname, 'src/cloud/build/builders/python/router_template.py'),
       join(__dirname, 'dist/cloud/build/builders/python/router_template.py'),
     )
+    copyFile(
+      join(__dirname, 'src/cloud/build/builders/python/python-data/dependency_index.py'),
+      join(__dirname, 'dist/cloud/build/builders/python/python-data/dependency_index.py'),
+    )
+    copyFile(
+      join(__dirname, 'src/cloud/build/builders/python/python-data/extract_imports.py'),
+      join(__dirname, 'dist/cloud/build/builders/python/python-data/extract_imports.py'),
+    )
 
     // Copy core requirements.txt
     copyFile(join(__dirname, '../core/requirements.txt'), join(__dirname, 'dist/requirements-core.txt'))
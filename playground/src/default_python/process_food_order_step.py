@@ -1,6 +1,7 @@
+import httpx
 from pydantic import BaseModel
 from datetime import datetime
-from .services.pet_store import pet_store_service
+from .services.pet_store import PetStoreService
 
 class InputSchema(BaseModel):
     email: str
@@ -14,16 +15,23 @@ config = {
     "flows": ["python-tutorial"],
     "subscribes": ["python-process-food-order"],
     "emits": ["python-notification"],
-    "input": InputSchema.model_json_schema(),
+    "input": InputSchema,
+    "typedInput": True,
 }
 
-async def handler(input_data, context):
+async def setup(ctx):
+    return {"pet_store": PetStoreService(httpx.AsyncClient())}
+
+async def teardown(ctx):
+    await ctx.resources.pet_store.client.aclose()
+
+async def handler(input_data: InputSchema, context):
     context.logger.info("Step 02 - Process food order", {"input": input_data, "traceId": context.trace_id})
 
-    order = await pet_store_service.create_order({
-        "quantity": input_data.get("quantity"),
-        "pet_id": input_data.get("pet_id"),
-        "email": input_data.get("email"),
+    order = await context.resources.pet_store.create_order({
+        "quantity": input_data.quantity,
+        "pet_id": input_data.pet_id,
+        "email": input_data.email,
         "ship_date": datetime.now().isoformat(),
         "status": "placed",
     })
@@ -35,7 +43,7 @@ async def handler(input_data, context):
     await context.emit({
         "topic": "python-notification",
         "data": {
-            "email": input_data["email"],
+            "email": input_data.email,
             "template_id": "new-order",
             "template_data": {
                 "status": order.get("status"),
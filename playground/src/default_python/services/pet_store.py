@@ -1,11 +1,24 @@
 import os
 import httpx
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from .types import Order, Pet
 
 api_url = os.environ.get("API_URL", "https://xnigaj-xtnawg.motiahub.com")
 
 class PetStoreService:
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        # a shared client keeps its connections open between invocations
+        self.client = client
+
+    async def _post(self, path: str, data: Dict[str, Any]) -> Any:
+        if self.client is not None:
+            response = await self.client.post(f"{api_url}{path}", json=data, headers={'Content-Type': 'application/json'})
+            return response.json()
+
+        async with httpx.AsyncClient() as client:
+            response = await client.post(f"{api_url}{path}", json=data, headers={'Content-Type': 'application/json'})
+            return response.json()
+
     async def create_pet(self, pet: Dict[str, Any]) -> Pet:
         pet_data = {
             "name": pet.get("name", ""),
@@ -13,28 +26,16 @@ class PetStoreService:
             "status": "available"
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{api_url}/pet",
-                json=pet_data,
-                headers={'Content-Type': 'application/json'}
-            )
-            return response.json()
+        return await self._post("/pet", pet_data)
     
     async def create_order(self, order: Dict[str, Any]) -> Order:
-        async with httpx.AsyncClient() as client:
-            order_data = {
-                "quantity": order.get("quantity", 1),
-                "petId": order.get("pet_id", '1'),
-                "shipDate": order.get("ship_date", "2025-08-22T22:07:04.730Z"),
-                "status": order.get("status", "placed"),
-            }
-            
-            response = await client.post(
-                f"{api_url}/store/order",
-                json=order_data,
-                headers={'Content-Type': 'application/json'}
-            )
-            return response.json()
+        order_data = {
+            "quantity": order.get("quantity", 1),
+            "petId": order.get("pet_id", '1'),
+            "shipDate": order.get("ship_date", "2025-08-22T22:07:04.730Z"),
+            "status": order.get("status", "placed"),
+        }
+        
+        return await self._post("/store/order", order_data)
 
-pet_store_service = PetStoreService()
\ No newline at end of file
+pet_store_service = PetStoreService()
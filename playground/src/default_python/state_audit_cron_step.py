@@ -12,6 +12,7 @@ config = {
 
 async def handler(context):
     state_value = await context.state.get_group("orders_python")
+    notifications = []
 
     for item in state_value:
         # check if current date is after item.ship_date
@@ -25,7 +26,7 @@ async def handler(context):
                 "complete": item.get("complete", False),
             })
 
-            await context.emit({
+            notifications.append({
                 "topic": "python-notification",
                 "data": {
                     "email": os.environ.get("SAMPLE_EMAIL", "test@test.com"),
@@ -38,3 +39,5 @@ async def handler(context):
                     },
                 },
             })
+
+    await context.emit_many(notifications)
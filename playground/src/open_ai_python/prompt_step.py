@@ -19,12 +19,19 @@ config = {
   "flows": ["open-ai"]
 }
 
+async def setup(ctx):
+    # the client and its connections are reused by the invocations of the worker
+    return {"openai": OpenAI(api_key=os.getenv("OPENAI_API_KEY_"))}
+
+async def teardown(ctx):
+    ctx.resources.openai.close()
+
 async def handler(input, context):
     logger = context.logger
     message = input["message"]
     assistant_message_id = input["assistantMessageId"]
     thread_id = input["threadId"]
-    openai = OpenAI(api_key=os.getenv("OPENAI_API_KEY_"))
+    openai = context.resources.openai
 
     logger.info("Starting OpenAI response")
 
@@ -1,4 +1,4 @@
-import { MessageCircle, Package, Radio, ScrollText } from 'lucide-react'
+import { Cpu, MessageCircle, Package, Radio, ScrollText, Timer } from 'lucide-react'
 import type React from 'react'
 import type { TraceEvent as TraceEventType } from '../../types/observability'
 
@@ -15,5 +15,9 @@ export const EventIcon: React.FC<Props> = ({ event }) => {
     return <Package className="w-4 h-4 text-muted-foreground" />
   } else if (event.type === 'stream') {
     return <Radio className="w-4 h-4 text-muted-foreground" />
+  } else if (event.type === 'cpu') {
+    return <Cpu className="w-4 h-4 text-muted-foreground" />
+  } else if (event.type === 'span') {
+    return <Timer className="w-4 h-4 text-muted-foreground" />
   }
 }
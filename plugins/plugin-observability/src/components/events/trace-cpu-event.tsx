@@ -0,0 +1,19 @@
+import type React from 'react'
+import { memo, useMemo } from 'react'
+import type { CpuEvent } from '../../types/observability'
+import { FunctionCall } from './code/function-call'
+
+export const TraceCpuEvent: React.FC<{ event: CpuEvent }> = memo(({ event }) => {
+  const args = useMemo(
+    () => [event.function, event.operation === 'map' ? { tasks: event.tasks, chunksize: event.chunksize } : undefined],
+    [event],
+  )
+
+  return (
+    <div className="flex items-center gap-2 min-w-0">
+      <FunctionCall functionName={event.operation === 'map' ? 'map_cpu' : 'run_cpu'} args={args} />
+      <span className="text-muted-foreground shrink-0">{event.duration.toFixed(1)}ms</span>
+    </div>
+  )
+})
+TraceCpuEvent.displayName = 'TraceCpuEvent'
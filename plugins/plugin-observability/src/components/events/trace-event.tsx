@@ -1,8 +1,10 @@
 import type React from 'react'
 import { memo } from 'react'
 import type { TraceEvent as TraceEventType } from '../../types/observability'
+import { TraceCpuEvent } from './trace-cpu-event'
 import { TraceEmitEvent } from './trace-emit-event'
 import { TraceLogEvent } from './trace-log-event'
+import { TraceSpanEvent } from './trace-span-event'
 import { TraceStateEvent } from './trace-state-event'
 import { TraceStreamEvent } from './trace-stream-event'
 
@@ -15,6 +17,10 @@ export const TraceEvent: React.FC<{ event: TraceEventType }> = memo(({ event })
     return <TraceStateEvent event={event} />
   } else if (event.type === 'stream') {
     return <TraceStreamEvent event={event} />
+  } else if (event.type === 'cpu') {
+    return <TraceCpuEvent event={event} />
+  } else if (event.type === 'span') {
+    return <TraceSpanEvent event={event} />
   }
 })
 TraceEvent.displayName = 'TraceEvent'
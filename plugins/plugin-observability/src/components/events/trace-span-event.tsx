@@ -0,0 +1,19 @@
+import type React from 'react'
+import { memo, useMemo } from 'react'
+import type { SpanEvent } from '../../types/observability'
+import { FunctionCall } from './code/function-call'
+
+export const TraceSpanEvent: React.FC<{ event: SpanEvent }> = memo(({ event }) => {
+  const args = useMemo(() => [event.name, event.attributes], [event])
+  // nested spans are indented under their parent
+  const style = useMemo(() => ({ paddingLeft: `${event.depth * 12}px` }), [event.depth])
+
+  return (
+    <div className="flex items-center gap-2 min-w-0" style={style}>
+      <FunctionCall objectName="tracer" functionName="span" args={args} />
+      <span className="text-muted-foreground shrink-0">{event.duration.toFixed(1)}ms</span>
+      {event.error && <span className="text-red-800 dark:text-red-400 truncate">{event.error}</span>}
+    </div>
+  )
+})
+TraceSpanEvent.displayName = 'TraceSpanEvent'
@@ -0,0 +1,149 @@
+import type { MetricSeries, MetricSnapshot, RuntimeMetricName } from '@motiadev/core'
+import { Button, Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from '@motiadev/ui'
+import { RefreshCw } from 'lucide-react'
+import { memo, useMemo } from 'react'
+import { useRuntimeMetrics } from '../hooks/use-runtime-metrics'
+
+const getSeries = (metrics: MetricSnapshot[], name: RuntimeMetricName): MetricSeries[] =>
+  metrics.find((metric) => metric.name === name)?.series ?? []
+
+const sumValues = (series: MetricSeries[], filter: (labels: Record<string, string>) => boolean = () => true) =>
+  series.filter(({ labels }) => filter(labels)).reduce((total, { value = 0 }) => total + value, 0)
+
+// upper bound of the bucket holding the quantile, the buckets only give the range of each observation
+const estimateQuantile = ({ buckets = [], count = 0 }: MetricSeries, quantile: number): number | undefined => {
+  if (!count) {
+    return undefined
+  }
+
+  return buckets.find((bucket) => bucket.count >= count * quantile)?.le ?? Number.POSITIVE_INFINITY
+}
+
+const formatSeconds = (seconds?: number): string => {
+  if (seconds === undefined) {
+    return '-'
+  }
+  if (seconds === Number.POSITIVE_INFINITY) {
+    return 'slower'
+  }
+  return seconds < 1 ? `${Math.round(seconds * 1000 * 10) / 10}ms` : `${Math.round(seconds * 100) / 100}s`
+}
+
+const formatAverage = ({ sum = 0, count = 0 }: MetricSeries) => formatSeconds(count ? sum / count : undefined)
+
+const SummaryCard: React.FC<{ label: string; value: string | number }> = memo(({ label, value }) => (
+  <div className="flex flex-col gap-1 rounded-lg border px-4 py-3 min-w-[140px]">
+    <span className="text-xs text-muted-foreground">{label}</span>
+    <span className="text-lg font-semibold font-mono">{value}</span>
+  </div>
+))
+SummaryCard.displayName = 'SummaryCard'
+
+type HistogramTableProps = {
+  title: string
+  label: string
+  series: MetricSeries[]
+  describe?: (labels: Record<string, string>) => string
+}
+
+const HistogramTable: React.FC<HistogramTableProps> = memo(({ title, label, series, describe }) => (
+  <div className="flex flex-col gap-2">
+    <span className="text-sm font-semibold px-2">{title}</span>
+    <Table>
+      <TableHeader className="sticky top-0 bg-background/20 backdrop-blur-sm">
+        <TableRow>
+          <TableHead>{label}</TableHead>
+          <TableHead>Count</TableHead>
+          <TableHead>Avg</TableHead>
+          <TableHead>p50</TableHead>
+          <TableHead>p95</TableHead>
+        </TableRow>
+      </TableHeader>
+      <TableBody>
+        {series.length === 0 && (
+          <TableRow className="border-0">
+            <TableCell colSpan={5} className="text-muted-foreground text-center">
+              Nothing recorded yet
+            </TableCell>
+          </TableRow>
+        )}
+        {series.map((item) => (
+          <TableRow key={JSON.stringify(item.labels)} className="font-mono border-0">
+            <TableCell>{describe ? describe(item.labels) : Object.values(item.labels).join(' ')}</TableCell>
+            <TableCell>{item.count}</TableCell>
+            <TableCell>{formatAverage(item)}</TableCell>
+            <TableCell>{formatSeconds(estimateQuantile(item, 0.5))}</TableCell>
+            <TableCell>{formatSeconds(estimateQuantile(item, 0.95))}</TableCell>
+          </TableRow>
+        ))}
+      </TableBody>
+    </Table>
+  </div>
+))
+HistogramTable.displayName = 'HistogramTable'
+
+const bySlowest = (series: MetricSeries[]) => [...series].sort((a, b) => (b.sum ?? 0) - (a.sum ?? 0))
+
+export const RuntimeMetricsPage: React.FC = memo(() => {
+  const { metrics, refetch } = useRuntimeMetrics()
+
+  const summary = useMemo(() => {
+    const starts = getSeries(metrics, 'motia_python_starts_total')
+    const workers = getSeries(metrics, 'motia_python_workers')
+    const busyWorkers = sumValues(workers, (labels) => labels.state === 'busy')
+
+    return {
+      spawns: sumValues(getSeries(metrics, 'motia_process_spawns_total')),
+      processes: sumValues(getSeries(metrics, 'motia_processes')),
+      coldStarts: sumValues(starts, (labels) => labels.start === 'cold'),
+      warmStarts: sumValues(starts, (labels) => labels.start === 'warm'),
+      workers: workers.length ? `${busyWorkers}/${sumValues(workers)}` : '-',
+    }
+  }, [metrics])
+
+  return (
+    <div className="flex flex-col h-full overflow-auto">
+      <div className="flex items-center p-2 border-b gap-2">
+        <div className="flex-1 text-sm text-muted-foreground px-2">
+          Also available in the Prometheus format at <span className="font-mono">/__motia/metrics</span>
+        </div>
+        <Button variant="default" className="h-[34px]" onClick={refetch}>
+          <RefreshCw className="w-4 h-4 text-muted-foreground" />
+        </Button>
+      </div>
+
+      <div className="flex flex-wrap gap-2 p-4">
+        <SummaryCard label="Processes spawned" value={summary.spawns} />
+        <SummaryCard label="Processes running" value={summary.processes} />
+        <SummaryCard label="Python cold starts" value={summary.coldStarts} />
+        <SummaryCard label="Python warm starts" value={summary.warmStarts} />
+        <SummaryCard label="Busy workers" value={summary.workers} />
+      </div>
+
+      <div className="flex flex-col gap-6 p-2">
+        <HistogramTable
+          title="Step duration"
+          label="Step"
+          series={bySlowest(getSeries(metrics, 'motia_step_duration_seconds'))}
+          describe={({ step, language, status }) => `${step} (${language}, ${status})`}
+        />
+        <HistogramTable
+          title="Admission queue wait"
+          label="Step"
+          series={bySlowest(getSeries(metrics, 'motia_step_queue_wait_seconds'))}
+        />
+        <HistogramTable
+          title="Python runner startup"
+          label="Context"
+          series={getSeries(metrics, 'motia_process_spawn_seconds')}
+        />
+        <HistogramTable
+          title="RPC handling"
+          label="Method"
+          series={bySlowest(getSeries(metrics, 'motia_rpc_duration_seconds'))}
+        />
+      </div>
+    </div>
+  )
+})
+RuntimeMetricsPage.displayName = 'RuntimeMetricsPage'
@@ -13,6 +13,8 @@ type Props = {
 
 export const TraceItemDetail: React.FC<Props> = memo(({ trace, onClose }) => {
   const actions = useMemo(() => [{ icon: <X />, onClick: onClose, label: 'Close' }], [onClose])
+  // spans are received after they ended, they are listed where they started
+  const events = useMemo(() => [...trace.events].sort((a, b) => a.timestamp - b.timestamp), [trace.events])
   return (
     <Sidebar
       onClose={onClose}
@@ -24,13 +26,14 @@ export const TraceItemDetail: React.FC<Props> = memo(({ trace, onClose }) => {
       <div className="px-2 overflow-auto">
         <div className="flex items-center gap-4 text-sm text-muted-foreground mb-4">
           {trace.endTime && <span>Duration: {formatDuration(trace.endTime - trace.startTime)}</span>}
+          {trace.queueWait !== undefined && <span>Queued: {formatDuration(Math.round(trace.queueWait))}</span>}
           <div className="bg-blue-500 font-bold text-xs px-[4px] py-[2px] rounded-sm text-blue-100">
             {trace.entryPoint.type}
           </div>
           {trace.correlationId && <Badge variant="outline">Correlated: {trace.correlationId}</Badge>}
         </div>
         <div className="grid grid-cols-[auto_auto_auto_1fr] gap-x-2 gap-y-3 font-mono text-xs border-l-1 border-gray-500/40 pl-6">
-          {trace.events.map((event, index) => (
+          {events.map((event, index) => (
             <TraceEventItem key={index} event={event} traceStartTime={trace.startTime} />
           ))}
         </div>
@@ -0,0 +1,42 @@
+import { cn } from '@motiadev/ui'
+import type React from 'react'
+import { memo, useMemo } from 'react'
+import type { SpanEvent } from '../../types/observability'
+
+type Props = {
+  span: SpanEvent
+  groupStartTime: number
+  groupEndTime: number
+}
+
+export const TraceSpanItem: React.FC<Props> = memo(({ span, groupStartTime, groupEndTime }) => {
+  const nameStyle = useMemo(() => ({ paddingLeft: `${16 + span.depth * 12}px` }), [span.depth])
+
+  const barStyle = useMemo(
+    () => ({
+      marginLeft: `${((span.timestamp - groupStartTime) / (groupEndTime - groupStartTime)) * 100}%`,
+      // spans shorter than a pixel are still visible
+      width: `max(2px, ${(span.duration / (groupEndTime - groupStartTime)) * 100}%)`,
+    }),
+    [span.timestamp, span.duration, groupStartTime, groupEndTime],
+  )
+
+  return (
+    <div className="flex hover:bg-muted-foreground/10 relative" data-testid="trace-timeline-span">
+      <div
+        className="flex items-center min-w-[200px] max-w-[200px] h-[24px] max-h-[24px] px-2 text-xs text-muted-foreground sticky left-0 bg-card z-9"
+        style={nameStyle}
+      >
+        <span className="truncate min-w-0">{span.name}</span>
+      </div>
+      <div className="relative w-full h-[24px] flex items-center">
+        <div
+          className={cn('h-[12px] rounded-[3px]', span.error ? 'bg-[#EA2069]/70' : 'bg-[#2862FE]/50')}
+          style={barStyle}
+          title={`${span.name} ${span.duration.toFixed(1)}ms`}
+        />
+      </div>
+    </div>
+  )
+})
+TraceSpanItem.displayName = 'TraceSpanItem'
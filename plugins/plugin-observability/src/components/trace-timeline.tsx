@@ -1,7 +1,7 @@
 import { Button } from '@motiadev/ui'
 import { Minus, Plus } from 'lucide-react'
 import type React from 'react'
-import { memo, useMemo, useState } from 'react'
+import { Fragment, memo, useMemo, useState } from 'react'
 import { deriveTraceGroup } from '../hooks/use-derive-trace-group'
 import { useGetEndTime } from '../hooks/use-get-endtime'
 import { useTracesStream } from '../hooks/use-traces-stream'
@@ -9,6 +9,7 @@ import { formatDuration } from '../lib/utils'
 import { useObservabilityStore } from '../stores/use-observability-store'
 import { TraceItem } from './trace-item/trace-item'
 import { TraceItemDetail } from './trace-item/trace-item-detail'
+import { TraceSpanItem } from './trace-item/trace-span-item'
 
 export const TraceTimeline: React.FC = memo(() => {
   const groupId = useObservabilityStore((state) => state.selectedTraceGroupId)
@@ -80,17 +81,24 @@ const TraceTimelineComponent: React.FC<TraceTimelineComponentProps> = memo(({ gr
 
           <div className="flex flex-col h-full" style={{ width: `${zoom}%` }}>
             {traces.map((trace) => (
-              <TraceItem
-                key={trace.id}
-                traceId={trace.id}
-                traceName={trace.name}
-                traceStatus={trace.status}
-                traceStartTime={trace.startTime}
-                traceEndTime={trace.endTime}
-                groupStartTime={group.startTime}
-                groupEndTime={endTime}
-                onExpand={selectTraceId}
-              />
+              <Fragment key={trace.id}>
+                <TraceItem
+                  traceId={trace.id}
+                  traceName={trace.name}
+                  traceStatus={trace.status}
+                  traceStartTime={trace.startTime}
+                  traceEndTime={trace.endTime}
+                  groupStartTime={group.startTime}
+                  groupEndTime={endTime}
+                  onExpand={selectTraceId}
+                />
+                {trace.events.map(
+                  (event, index) =>
+                    event.type === 'span' && (
+                      <TraceSpanItem key={index} span={event} groupStartTime={group.startTime} groupEndTime={endTime} />
+                    ),
+                )}
+              </Fragment>
             ))}
           </div>
         </div>
@@ -0,0 +1,34 @@
+import type { MetricSnapshot } from '@motiadev/core'
+import { useCallback, useEffect, useState } from 'react'
+
+const REFRESH_INTERVAL = 2000
+
+type Output = {
+  metrics: MetricSnapshot[]
+  refetch: () => void
+}
+
+export const useRuntimeMetrics = (): Output => {
+  const [metrics, setMetrics] = useState<MetricSnapshot[]>([])
+
+  const refetch = useCallback(() => {
+    fetch('/__motia/metrics/json')
+      .then(async (res) => {
+        if (res.ok) {
+          return res.json()
+        } else {
+          throw await res.json()
+        }
+      })
+      .then(setMetrics)
+      .catch((err) => console.error(err))
+  }, [])
+
+  useEffect(() => {
+    refetch()
+    const interval = setInterval(refetch, REFRESH_INTERVAL)
+    return () => clearInterval(interval)
+  }, [refetch])
+
+  return { metrics, refetch }
+}
@@ -1,5 +1,6 @@
 export { ObservabilityPage } from './components/observability-page'
 export { ObservabilityTabLabel } from './components/observability-tab-label'
+export { RuntimeMetricsPage } from './components/runtime-metrics-page'
 export type {
   EmitEvent,
   LogEntry,
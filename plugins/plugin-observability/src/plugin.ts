@@ -14,6 +14,14 @@ export default function plugin(motia: MotiaPluginContext): MotiaPlugin {
         componentName: 'ObservabilityPage',
         labelIcon: 'gantt-chart',
       },
+      {
+        packageName: '@motiadev/plugin-observability',
+        cssImports: ['@motiadev/plugin-observability/dist/styles.css'],
+        label: 'Runtime',
+        position: 'bottom',
+        componentName: 'RuntimeMetricsPage',
+        labelIcon: 'activity',
+      },
     ],
   }
 }
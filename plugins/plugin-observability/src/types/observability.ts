@@ -26,6 +26,7 @@ export interface Trace {
   entryPoint: { type: 'api' | 'event' | 'cron'; stepName: string }
   events: TraceEvent[]
   error?: TraceError
+  queueWait?: number
 }
 
 export type TraceError = {
@@ -34,10 +35,11 @@ export type TraceError = {
   stack?: string
 }
 
-export type TraceEvent = StateEvent | EmitEvent | StreamEvent | LogEntry
+export type TraceEvent = StateEvent | EmitEvent | StreamEvent | CpuEvent | SpanEvent | LogEntry
 
 export type StateOperation = 'get' | 'getGroup' | 'set' | 'delete' | 'clear'
 export type StreamOperation = 'get' | 'getGroup' | 'set' | 'delete' | 'clear' | 'send'
+export type CpuOperation = 'run' | 'map'
 
 export interface StateEvent {
   type: 'state'
@@ -66,6 +68,28 @@ export interface StreamEvent {
   calls: number
 }
 
+export interface CpuEvent {
+  type: 'cpu'
+  timestamp: number
+  operation: CpuOperation
+  function: string
+  duration: number
+  tasks: number
+  chunksize?: number
+}
+
+export interface SpanEvent {
+  type: 'span'
+  timestamp: number
+  spanId: number
+  parentSpanId?: number
+  depth: number
+  name: string
+  duration: number
+  attributes?: Record<string, unknown>
+  error?: string
+}
+
 export interface LogEntry {
   type: 'log'
   timestamp: number